@@ -3,26 +3,48 @@
 Main entry point for LOB microstructure pipeline.
 
 Modes:
-- replay: Replay historical CSV data
-- live:   Stream live Binance L2 deltas
+- replay:  Replay historical CSV data
+- live:    Stream live Binance L2 deltas
+- live-mp: Live, with ingestion in a separate process (shared-memory ring)
+- offline: Build replay features from a CSV in one vectorised pass
+- backfill: Replay a CSV / Parquet file synchronously at full speed
+- backfill-parallel: Backfill many files (or time ranges) on a process pool
 
 Usage:
-    python main.py replay data/file.csv
-    python main.py live btcusdt
+    python main.py replay data/file.csv [snapshot]
+    python main.py live btcusdt [snapshot]
+    python main.py live-mp btcusdt [snapshot]
+    python main.py offline data/file.csv
+    python main.py backfill data/file.parquet [snapshot]
+    python main.py backfill-parallel "data/raw/*.parquet" [workers] [shard]
+
+snapshot: '1000ms' (default), any '<n>ms' bucket such as '100ms', or
+'message' for one feature row per depth message.
+
+shard: 'file' (default: one worker per file) or a time range per worker
+such as '30m' or '6h' (replay data only).
 """
 
 import asyncio
+import glob
+import multiprocessing
+import platform
 import sys
 import signal
 from pathlib import Path
 from datetime import datetime
 import structlog
 
+from lob_microstructure_analysis.core.backfill import ParallelBackfill
 from lob_microstructure_analysis.core.orderbook import OrderBook
 from lob_microstructure_analysis.core.processor import OrderBookProcessor
-from lob_microstructure_analysis.ingestion.loader import LOBDataLoader
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader, iter_batches, read_updates
 from lob_microstructure_analysis.ingestion.binance_client import BinanceWebSocketClient
-from lob_microstructure_analysis.ingestion.types import L2Update
+from lob_microstructure_analysis.ingestion.depth_sync import DepthSynchronizer
+from lob_microstructure_analysis.ingestion.shm_ring import ORDERED_STORES, SharedUpdateRing, ingest_live, pump
+from lob_microstructure_analysis.ingestion.types import UpdateBatch
+from lob_microstructure_analysis.ml.offline_features import OfflineFeatureBuilder
 
 # ---------------------------------------------------------------------
 # Logging
@@ -44,11 +66,11 @@ async def replay_producer(
     file_path: str,
     replay_speed: float = 0.0,
 ):
-    """Replay CSV data into queue."""
+    """Replay CSV data into queue, one batch per snapshot timestamp."""
     loader = LOBDataLoader(file_path, replay_speed=replay_speed)
 
-    async for update in loader.stream():
-        await queue.put(update)
+    async for batch in loader.stream_batches():
+        await queue.put(batch)
 
     await queue.put(None)
 
@@ -57,38 +79,205 @@ async def live_producer(
     queue: asyncio.Queue,
     symbol: str,
 ):
-    """Stream live Binance L2 deltas into queue."""
+    """Stream live Binance L2 deltas into queue, sequence-checked."""
     client = BinanceWebSocketClient(symbol=symbol)
 
     try:
-        async for batch in client.stream_updates():
-            for update in batch:           # ✅ flatten batches
-                await queue.put(update)
+        # One queue item per depth message; a full book after each gap
+        async for batch in DepthSynchronizer.for_client(client).stream():
+            await queue.put(batch)
     finally:
         await client.close()
         await queue.put(None)
 
 
+async def live_mp_producer(
+    queue: asyncio.Queue,
+    symbol: str,
+):
+    """
+    Live deltas received and parsed in a child process, handed over through
+    a shared-memory ring, so socket reads never wait on this process.
+    """
+    ring = SharedUpdateRing()
+    ingestion = multiprocessing.get_context("spawn").Process(
+        target=ingest_live, args=(ring.name, symbol), daemon=True
+    )
+    ingestion.start()
+
+    try:
+        await pump(ring, queue, producer_alive=ingestion.is_alive)
+    finally:
+        ring.request_stop()
+        ingestion.join(timeout=5)
+        if ingestion.is_alive():
+            ingestion.terminate()
+        ring.release()
+        ring.unlink()
+        await queue.put(None)
+
+
+def snapshot_options(spec: str | None) -> dict:
+    """Processor snapshot settings from a '<n>ms' / 'message' CLI argument."""
+    if spec is None:
+        return {"snapshot_interval_ms": 1000}
+    spec = spec.lower()
+    if spec == "message":
+        return {"snapshot_mode": "message"}
+    if spec.endswith("ms") and spec[:-2].isdigit():
+        return {"snapshot_interval_ms": int(spec[:-2])}
+    raise ValueError(f"Invalid snapshot setting: {spec!r} (use '<n>ms' or 'message')")
+
+
+# ---------------------------------------------------------------------
+# Offline features
+# ---------------------------------------------------------------------
+def run_offline(file_path: str) -> None:
+    """Same records as replay mode, without the asyncio pipeline."""
+    log.info("starting_offline_mode", file=file_path)
+
+    builder = OfflineFeatureBuilder(
+        snapshot_interval_ms=1000,
+        label_horizon_ms=1000,
+    )
+    df = builder.build_csv(file_path)
+
+    output_dir = Path("data/features")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    output_path = output_dir / f"offline_{ts}.parquet"
+    df.write_parquet(output_path)
+
+    log.info(
+        "pipeline_complete",
+        mode="offline",
+        snapshots=df.height,
+        labeled=df["label"].is_not_null().sum() if df.height else 0,
+        output=str(output_path),
+    )
+
+
+# ---------------------------------------------------------------------
+# Backfill
+# ---------------------------------------------------------------------
+def run_backfill(file_path: str, snapshot: str | None = None) -> None:
+    """Replay mode records, driven synchronously (no event loop or queue)."""
+    log.info("starting_backfill_mode", file=file_path)
+
+    processor = OrderBookProcessor(
+        orderbook=OrderBook(max_depth=50),
+        mode="replay",
+        label_horizon_ms=1000,
+        **snapshot_options(snapshot),
+    )
+    engine = ReplayEngine(processor)
+    engine.run(iter_batches(read_updates(file_path)))
+
+    output_dir = Path("data/features")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    output_path = output_dir / f"backfill_{ts}.parquet"
+    processor.feature_store.save(output_path)
+
+    log.info(
+        "pipeline_complete",
+        mode="backfill",
+        updates=processor.updates_processed,
+        snapshots=processor.snapshots_emitted,
+        elapsed_s=round(engine.elapsed_s, 3),
+        updates_per_second=round(engine.updates_per_second or 0.0),
+        output=str(output_path),
+    )
+
+
+def shard_ms(spec: str | None) -> int | None:
+    """Time-range shard length from 'file' / '<n>s' / '<n>m' / '<n>h'."""
+    if spec is None or spec.lower() == "file":
+        return None
+    units = {"s": 1_000, "m": 60_000, "h": 3_600_000}
+    value, unit = spec[:-1], spec[-1:].lower()
+    if unit not in units or not value.isdigit():
+        raise ValueError(f"Invalid shard setting: {spec!r} (use 'file', '<n>s', '<n>m' or '<n>h')")
+    return int(value) * units[unit]
+
+
+def run_backfill_parallel(pattern: str, workers: str | None = None, shard: str | None = None) -> None:
+    """Replay mode records for every matching file, one dataset per run."""
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"No files match {pattern}")
+    log.info("starting_parallel_backfill", files=len(paths))
+
+    ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    output_dir = Path("data/features") / f"backfill_{ts}"
+    backfill = ParallelBackfill(
+        output_dir,
+        workers=int(workers) if workers else None,
+        shard_ms=shard_ms(shard),
+        label_horizon_ms=1000,
+    )
+    parts = backfill.run(paths)
+
+    log.info(
+        "pipeline_complete",
+        mode="backfill-parallel",
+        files=len(paths),
+        parts=len(parts),
+        output=str(output_dir),
+    )
+
+
 # ---------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------
 async def main() -> None:
     if len(sys.argv) < 2:
         print("Usage:")
-        print("  python main.py replay <csv_path>")
-        print("  python main.py live [symbol]")
+        print("  python main.py replay <csv_path> [1000ms|100ms|message]")
+        print("  python main.py live [symbol] [1000ms|100ms|message]")
+        print("  python main.py live-mp [symbol] [1000ms|100ms|message]")
+        print("  python main.py offline <csv_path>")
+        print("  python main.py backfill <csv_or_parquet_path> [1000ms|100ms|message]")
+        print("  python main.py backfill-parallel <glob> [workers] [file|30m|6h]")
         sys.exit(1)
 
     mode = sys.argv[1].lower()
 
-    queue: asyncio.Queue[L2Update | None] = asyncio.Queue(maxsize=100_000)
+    if mode == "offline":
+        if len(sys.argv) < 3:
+            print("Offline mode requires CSV path")
+            sys.exit(1)
+        run_offline(sys.argv[2])
+        return
+
+    if mode == "backfill":
+        if len(sys.argv) < 3:
+            print("Backfill mode requires a CSV or Parquet path")
+            sys.exit(1)
+        run_backfill(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        return
+
+    if mode == "backfill-parallel":
+        if len(sys.argv) < 3:
+            print("Parallel backfill requires a file glob")
+            sys.exit(1)
+        run_backfill_parallel(*sys.argv[2:5])
+        return
+
+    if mode == "live-mp" and not ORDERED_STORES:
+        print(f"live-mp needs an x86 CPU (shared-memory ring); use 'live' on {platform.machine()}")
+        sys.exit(1)
+
+    queue: asyncio.Queue[UpdateBatch | None] = asyncio.Queue(maxsize=10_000)
 
     orderbook = OrderBook(max_depth=50)
     processor = OrderBookProcessor(
         orderbook=orderbook,
         mode="replay" if mode == "replay" else "live",
-        snapshot_interval_ms=1000,
         label_horizon_ms=1000,
+        **snapshot_options(sys.argv[3] if len(sys.argv) > 3 else None),
     )
 
     # -----------------------------
@@ -106,16 +295,17 @@ async def main() -> None:
             replay_producer(queue, file_path)
         )
 
-    elif mode == "live":
+    elif mode in ("live", "live-mp"):
         symbol = sys.argv[2] if len(sys.argv) > 2 else "btcusdt"
-        log.info("starting_live_mode", symbol=symbol)
+        log.info("starting_live_mode", symbol=symbol, ingestion_process=mode == "live-mp")
 
+        producer = live_producer if mode == "live" else live_mp_producer
         producer_task = asyncio.create_task(
-            live_producer(queue, symbol)
+            producer(queue, symbol)
         )
 
     else:
-        raise ValueError("Mode must be 'replay' or 'live'")
+        raise ValueError("Mode must be 'replay', 'live' or 'live-mp'")
 
     consumer_task = asyncio.create_task(processor.run(queue))
 
@@ -158,6 +348,9 @@ async def main() -> None:
 
     stats = processor.feature_store.get_stats()
 
+    if processor.latency.histograms:
+        log.info("pipeline_latency", **processor.latency.summary())
+
     log.info(
         "pipeline_complete",
         mode=mode,
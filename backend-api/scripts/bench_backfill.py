@@ -0,0 +1,103 @@
+"""
+Backfill throughput: async replay (LOBDataLoader -> asyncio queue ->
+OrderBookProcessor.run) vs the synchronous ReplayEngine on the same file.
+
+Two workloads: a replay-format snapshot file (full 2 x 50 level books, one
+per timestamp) and a live-mode depth-diff stream (1 s buckets).
+
+Usage:
+    PYTHONPATH=src python scripts/bench_backfill.py [snapshots.csv] [--snapshots N] [-n 1000000]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import tempfile
+import time
+from itertools import groupby
+from pathlib import Path
+
+import structlog
+from polars.testing import assert_frame_equal
+
+from bench_common import synthetic_updates
+from bench_offline_features import write_snapshots
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader, iter_batches, read_updates
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+
+async def run_async(path: Path) -> OrderBookProcessor:
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="replay")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+
+    async def produce():
+        async for batch in LOBDataLoader(str(path), replay_speed=0.0).stream_batches():
+            await queue.put(batch)
+        await queue.put(None)
+
+    await asyncio.gather(produce(), processor.run(queue))
+    return processor
+
+
+def run_engine(batches, mode: str) -> ReplayEngine:
+    engine = ReplayEngine(OrderBookProcessor(OrderBook(max_depth=50), mode=mode))
+    engine.run(batches)
+    return engine
+
+
+def delta_batches(n: int):
+    """Synthetic 100 ms depth diffs, one UpdateBatch per message."""
+    return [
+        UpdateBatch.from_updates([
+            L2Update(ts, side, price, qty, level, ts)
+            for level, (ts, side, price, qty) in enumerate(rows)
+        ])
+        for _, rows in groupby(synthetic_updates(n), key=lambda u: u[0])
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--snapshots", type=int, default=3600)
+    parser.add_argument("-n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.path) if args.path else Path(tmp) / "snapshots.csv"
+        if not args.path:
+            write_snapshots(path, args.snapshots)
+
+        t0 = time.perf_counter()
+        expected = asyncio.run(run_async(path))
+        t_async = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        engine = run_engine(iter_batches(read_updates(path)), "replay")
+        t_engine = time.perf_counter() - t0
+
+    assert_frame_equal(
+        engine.processor.feature_store.to_dataframe(),
+        expected.feature_store.to_dataframe(),
+    )
+    n = expected.updates_processed
+    print(f"replay file: {n:,} updates, {expected.snapshots_emitted:,} snapshots (outputs match)")
+    print(f"  async replay   {t_async:7.2f} s  {n / t_async:>12,.0f} updates/s")
+    print(f"  ReplayEngine   {t_engine:7.2f} s  {n / t_engine:>12,.0f} updates/s"
+          f"   {t_async / t_engine:5.1f}x  (processing only: {engine.updates_per_second:,.0f}/s)")
+
+    batches = delta_batches(args.n)
+    engine = run_engine(batches, "live")
+    print(f"depth diffs: {engine.processor.updates_processed:,} updates, "
+          f"{engine.processor.snapshots_emitted:,} snapshots")
+    print(f"  ReplayEngine   {engine.elapsed_s:7.2f} s  {engine.updates_per_second:>12,.0f} updates/s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Live processing with and without per-bucket level coalescing.
+
+Depth messages (100 ms) are fed to OrderBookProcessor (live mode, 1 s
+snapshots) with ``coalesce`` off and on, for a shallow and a deep book.
+Reports throughput, the share of rows actually written to the book, and
+the rows held per bucket (all of them vs. one).
+
+Usage:
+    PYTHONPATH=src:scripts python scripts/bench_coalesce.py [recorded_day.csv] [-n 1000000]
+"""
+
+import argparse
+import logging
+import time
+
+import structlog
+
+from bench_common import get_updates
+from bench_queue_transport import messages_of
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.types import UpdateBatch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("-n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    messages = [UpdateBatch.from_updates(m) for m in messages_of(get_updates(args.path, args.n))]
+    rows = sum(len(m) for m in messages)
+    print(f"{rows:,} rows, {len(messages):,} messages\n")
+    print(f"{'max_depth':>9}  {'coalesce':<9}{'time':>8}{'updates/s':>14}{'written':>9}{'held/bucket':>13}")
+
+    for max_depth in (50, 1000):
+        books = []
+        for coalesce in (False, True):
+            processor = OrderBookProcessor(
+                OrderBook(max_depth=max_depth), mode="live",
+                stages=["book", "events", "order_flow", "features"], coalesce=coalesce,
+            )
+            held = 0
+            original = processor.drain
+
+            def drain():
+                nonlocal held
+                held = max(held, len(processor.pending))
+                return original()
+
+            processor.drain = drain
+            start = time.perf_counter()
+            ReplayEngine(processor).run(messages)
+            elapsed = time.perf_counter() - start
+
+            coalescer = processor.coalescer
+            written = coalescer.applied / coalescer.rows if coalescer is not None else 1.0
+            print(f"{max_depth:>9}  {str(coalesce):<9}{elapsed:7.2f}s{rows / elapsed:>14,.0f}"
+                  f"{written:>9.1%}{held:>13,}")
+            books.append((list(processor.orderbook.bids.items()), list(processor.orderbook.asks.items())))
+
+        assert books[0] == books[1]
+
+
+if __name__ == "__main__":
+    main()
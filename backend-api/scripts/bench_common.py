@@ -0,0 +1,98 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run on a recorded L2 file in the replay schema
+(timestamp, side, price, quantity, level, update_id) when a path is given,
+and fall back to a synthetic BTCUSDT-like stream otherwise.
+
+Run from backend-api/ with PYTHONPATH=src.
+"""
+
+import random
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+import polars as pl
+
+Update = Tuple[int, str, float, float]  # (timestamp_ms, side, price, quantity)
+
+
+def load_updates(path: str | Path) -> List[Update]:
+    """Load a recorded CSV/Parquet L2 file as (ts, side, price, qty) tuples."""
+    path = Path(path)
+    df = pl.read_parquet(path) if path.suffix == ".parquet" else pl.read_csv(path)
+    df = df.sort("timestamp")
+    return list(
+        zip(
+            df["timestamp"].to_list(),
+            df["side"].to_list(),
+            df["price"].cast(pl.Float64).to_list(),
+            df["quantity"].cast(pl.Float64).to_list(),
+        )
+    )
+
+
+def synthetic_updates(
+    n: int = 1_000_000,
+    seed: int = 7,
+    tick_size: float = 0.01,
+    spread_ticks: int = 300,
+    msg_levels: int = 100,
+    msg_interval_ms: int = 100,
+) -> List[Update]:
+    """
+    Depth-diff-like stream: messages every ``msg_interval_ms`` carrying
+    ``msg_levels`` level updates clustered within ``spread_ticks`` of mid.
+    """
+    rng = random.Random(seed)
+    mid_ticks = 5_000_000  # 50,000.00
+    ts = 1_700_000_000_000
+    live = {"bid": set(), "ask": set()}
+    out: List[Update] = []
+
+    while len(out) < n:
+        mid_ticks += rng.choice((-2, -1, 0, 0, 1, 2))
+
+        # Like a real diff stream, levels the touch moved through are removed.
+        for tick in [t for t in live["bid"] if t >= mid_ticks]:
+            live["bid"].discard(tick)
+            out.append((ts, "bid", round(tick * tick_size, 2), 0.0))
+        for tick in [t for t in live["ask"] if t <= mid_ticks]:
+            live["ask"].discard(tick)
+            out.append((ts, "ask", round(tick * tick_size, 2), 0.0))
+
+        for _ in range(msg_levels):
+            side = "bid" if rng.random() < 0.5 else "ask"
+            offset = int(rng.expovariate(1 / 40)) % spread_ticks
+            tick = mid_ticks - 1 - offset if side == "bid" else mid_ticks + 1 + offset
+            if rng.random() < 0.35:
+                qty = 0.0
+                live[side].discard(tick)
+            else:
+                qty = round(rng.uniform(0.001, 2.0), 5)
+                live[side].add(tick)
+            out.append((ts, side, round(tick * tick_size, 2), qty))
+        ts += msg_interval_ms
+
+    return out[:n]
+
+
+def get_updates(path: Optional[str], n: int = 1_000_000) -> List[Update]:
+    if path:
+        updates = load_updates(path)
+        print(f"Loaded {len(updates):,} updates from {path}")
+    else:
+        updates = synthetic_updates(n)
+        print(f"Generated {len(updates):,} synthetic updates")
+    return updates
+
+
+def timeit(fn: Callable[[], object], repeat: int = 3) -> float:
+    """Best wall time of ``repeat`` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
@@ -0,0 +1,90 @@
+"""
+Binance depth message parsing: per-level objects vs arrays.
+
+Each raw ``depthUpdate`` is parsed
+
+- per level:  json.loads, one L2Update per level, UpdateBatch.from_updates
+              (the client's previous parse path, kept here as reference)
+- arrays:     parse_depth_message (orjson when installed, and with the
+              stdlib decoder), alone and + DepthMessage.to_batch
+
+Messages come from a capture file (one raw message per line, as received
+from the socket) or are synthesized from the L2 updates.
+
+Usage:
+    PYTHONPATH=src:scripts python scripts/bench_depth_parse.py [--messages capture.jsonl] [recorded_day.csv] [-n 1000000]
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+
+import structlog
+
+import lob_microstructure_analysis.ingestion.binance_client as binance_client
+from bench_common import get_updates
+from bench_queue_transport import messages_of
+from bench_shm_ring import raw_messages
+from lob_microstructure_analysis.ingestion.binance_client import parse_depth_message
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+
+def per_level(message: dict) -> list:
+    """One L2Update per level (the previous parse path)."""
+    updates = []
+    for side, key in (("bid", "b"), ("ask", "a")):
+        for level, (price, quantity) in enumerate(message.get(key, [])):
+            updates.append(L2Update(message["E"], side, float(price), float(quantity), level, message["u"]))
+    return updates
+
+
+def timed(name, parse, raws, levels) -> None:
+    start = time.perf_counter()
+    for raw in raws:
+        parse(raw)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<34}{elapsed:7.3f} s{len(raws) / elapsed:>12,.0f} msg/s{levels / elapsed:>14,.0f} levels/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("-n", type=int, default=1_000_000)
+    parser.add_argument("--messages", help="captured raw messages, one per line")
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    if args.messages:
+        raws = Path(args.messages).read_text().splitlines()
+    else:
+        raws = raw_messages(messages_of(get_updates(args.path, args.n)))
+    encoded = [raw.encode() for raw in raws]  # websockets hands over str; orjson also takes bytes
+    levels = sum(len(parse_depth_message(raw)) for raw in raws)
+    print(f"{len(raws):,} messages, {levels:,} levels, "
+          f"decoder: {binance_client._loads.__module__}\n")
+
+    timed("json + L2Update", lambda raw: per_level(json.loads(raw)), raws, levels)
+    timed("json + L2Update + UpdateBatch",
+          lambda raw: UpdateBatch.from_updates(per_level(json.loads(raw))), raws, levels)
+    timed("parse_depth_message", parse_depth_message, raws, levels)
+    timed("parse_depth_message (bytes)", parse_depth_message, encoded, levels)
+    timed("parse_depth_message + to_batch", lambda raw: parse_depth_message(raw).to_batch(), raws, levels)
+
+    fast = binance_client._loads
+    binance_client._loads = json.loads
+    try:
+        timed("parse_depth_message (json)", parse_depth_message, raws, levels)
+    finally:
+        binance_client._loads = fast
+
+    # Same rows either way
+    for raw in raws[:100]:
+        expected = UpdateBatch.from_updates(per_level(json.loads(raw)))
+        assert parse_depth_message(raw).to_batch() == expected
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Replay-mode snapshot diff on 50-level books:
+dict infer() vs merge-walk infer_views() vs vectorised infer_batch(),
+per snapshot pair as the processor runs them.
+
+Snapshots are taken once per 1 s bucket; only the diff is timed.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_event_inference.py [recorded_day.csv] [--buckets N]
+"""
+
+import argparse
+
+from bench_common import load_updates, synthetic_updates, timeit
+from bench_snapshots import buckets_of
+from lob_microstructure_analysis.core.event_inference import EventInferenceEngine
+from lob_microstructure_analysis.core.orderbook import OrderBook
+
+
+def snapshots(buckets, depth=50):
+    book = OrderBook(max_depth=depth)
+    views, dicts = [], []
+    for batch in buckets:
+        book.apply_batch(*batch)
+        views.append(book.view())
+        dicts.append(book.snapshot())
+    return views, dicts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--buckets", type=int, default=3600)
+    args = parser.parse_args()
+
+    if args.path:
+        updates = load_updates(args.path)
+    else:
+        updates = synthetic_updates(args.buckets * 1000)
+    views, dicts = snapshots(buckets_of(updates))
+    pairs = len(views) - 1
+    engine = EventInferenceEngine()
+
+    def run_dicts():
+        return [e for ts in range(1, len(dicts)) for e in engine.infer(dicts[ts - 1], dicts[ts], ts)]
+
+    def run_walk():
+        for ts in range(1, len(views)):
+            engine.infer_views(views[ts - 1], views[ts], ts)
+
+    def run_pairs():
+        return [engine.infer_batch(views[ts - 1], views[ts], ts) for ts in range(1, len(views))]
+
+    expected = run_dicts()
+    per_pair = run_pairs()
+
+    t_dict = timeit(run_dicts)
+    t_walk = timeit(run_walk)
+    t_pair = timeit(run_pairs)
+
+    same = expected == [e for b in per_pair for e in b.to_events()]
+    print(f"{pairs:,} snapshot pairs, {len(expected):,} events, identical: {same}")
+    for name, t in (
+        ("infer() dicts", t_dict),
+        ("infer_views() walk", t_walk),
+        ("infer_batch() per pair", t_pair),
+    ):
+        print(f"{name:26s} {t / pairs * 1e6:8.1f} us/pair   {t_dict / t:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-snapshot feature -> prediction cost: feature dict + Predictor.predict
+vs FeatureVector filled in place + Predictor.predict_vector.
+
+Replays the stream bucket by bucket through one book, then times only the
+feature / inference step per bucket (the book update is shared). Reports
+mean latency and traced bytes allocated per snapshot, for the feature step
+alone and with the booster call.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_feature_vector.py [recorded_day.csv] [--model models/lgbm_model_X.txt]
+"""
+
+import argparse
+import time
+import tracemalloc
+from itertools import groupby
+
+from bench_common import get_updates
+from lob_microstructure_analysis.core.features import FeatureComputer
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.ml.predictor import Predictor, load_latest_model
+
+
+def books_of(updates, interval_ms=1000):
+    """Yields the book after each bucket (the same book object, mutated)."""
+    book = OrderBook(max_depth=50)
+    for _, rows in groupby(updates, key=lambda u: u[0] // interval_ms):
+        _, sides, prices, qtys = zip(*rows)
+        book.apply_batch(list(sides), list(prices), list(qtys))
+        yield book
+
+
+def run(updates, predictor, step, trace=False):
+    """
+    step(computer, vector, book) per bucket; returns mean microseconds, or
+    traced bytes allocated, per snapshot.
+    """
+    computer = FeatureComputer(features=predictor.feature_names)
+    vector = predictor.new_vector()
+    total = 0.0
+    n = 0
+    if trace:
+        tracemalloc.start()
+    for book in books_of(updates):
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            step(computer, vector, book)
+            total += tracemalloc.get_traced_memory()[1] - base
+        else:
+            t0 = time.perf_counter()
+            step(computer, vector, book)
+            total += (time.perf_counter() - t0) * 1e6
+        n += 1
+    if trace:
+        tracemalloc.stop()
+    return total / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--model")
+    parser.add_argument("-n", type=int, default=300_000)
+    args = parser.parse_args()
+
+    predictor = Predictor(args.model) if args.model else load_latest_model("models")
+    updates = get_updates(args.path, args.n)
+
+    def dict_features(computer, vector, book):
+        return computer.compute(book)
+
+    def vector_features(computer, vector, book):
+        return computer.compute_into(book, vector)
+
+    def dict_predict(computer, vector, book):
+        features = computer.compute(book)
+        if features:
+            predictor.predict(features)
+
+    def vector_predict(computer, vector, book):
+        if computer.compute_into(book, vector):
+            predictor.predict_vector(vector)
+
+    print(f"\n{'path':<28}{'us/snapshot':>14}{'bytes/snapshot':>16}")
+    for name, step in (
+        ("features: dict", dict_features),
+        ("features: vector", vector_features),
+        ("predict: dict", dict_predict),
+        ("predict: vector", vector_predict),
+    ):
+        # tracemalloc slows everything down, so latency is a separate run
+        latency = min(run(updates, predictor, step) for _ in range(3))
+        allocated = run(updates, predictor, step, trace=True)
+        print(f"{name:<28}{latency:>14.1f}{allocated:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
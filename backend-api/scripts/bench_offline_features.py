@@ -0,0 +1,89 @@
+"""
+Replay features: online pipeline (LOBDataLoader -> asyncio queue ->
+OrderBookProcessor) vs OfflineFeatureBuilder on the same snapshot CSV.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_offline_features.py [snapshots.csv] [--snapshots N]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import structlog
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader
+from lob_microstructure_analysis.ml.offline_features import OfflineFeatureBuilder
+
+
+def write_snapshots(path: Path, n: int, levels: int = 50, seed: int = 7) -> None:
+    """Full 2 x ``levels`` books, one snapshot per second-like timestamp."""
+    rng = np.random.default_rng(seed)
+    mid = 5_000_000 + np.cumsum(rng.integers(-3, 4, n))
+    ts = np.repeat(1_700_000_000_000 + np.arange(n), 2 * levels)
+    offsets = np.tile(np.arange(1, levels + 1), n)
+    bid = (np.repeat(mid, levels) - offsets) / 100
+    ask = (np.repeat(mid, levels) + offsets) / 100
+    price = np.stack((bid.reshape(n, levels), ask.reshape(n, levels)), axis=1).ravel()
+    side = np.tile(np.repeat(np.array(["bid", "ask"]), levels), n)
+    pl.DataFrame({
+        "timestamp": ts,
+        "side": side,
+        "price": price,
+        "quantity": np.round(rng.uniform(0.001, 5.0, len(ts)), 3),
+        "level": np.tile(np.arange(2 * levels) % levels, n),
+        "update_id": np.repeat(np.arange(n), 2 * levels),
+    }).write_csv(path)
+
+
+async def run_online(path: Path) -> pl.DataFrame:
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="replay")
+    queue: asyncio.Queue = asyncio.Queue()
+    async for batch in LOBDataLoader(str(path), replay_speed=0.0).stream_batches():
+        queue.put_nowait(batch)
+    queue.put_nowait(None)
+    await processor.run(queue)
+    return processor.feature_store.to_dataframe()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--snapshots", type=int, default=3600)
+    args = parser.parse_args()
+
+    import logging
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(args.path) if args.path else Path(tmp) / "snapshots.csv"
+        if not args.path:
+            write_snapshots(path, args.snapshots)
+
+        t0 = time.perf_counter()
+        online = asyncio.run(run_online(path))
+        t_online = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        offline = OfflineFeatureBuilder().build_csv(path)
+        t_offline = time.perf_counter() - t0
+
+    same = offline.columns == online.columns and all(
+        np.allclose(offline[c].to_numpy(), online[c].to_numpy(), rtol=1e-9, atol=1e-9)
+        for c in online.columns if c != "label"
+    ) and offline["label"].to_list() == online["label"].to_list()
+    print(f"{online.height:,} snapshots, columns and values match: {same}")
+    print(f"online replay  {t_online:8.2f} s")
+    print(f"offline batch  {t_offline:8.2f} s   {t_online / t_offline:6.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
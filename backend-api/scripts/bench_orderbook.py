@@ -0,0 +1,70 @@
+"""
+Update-rate benchmark: SortedDict OrderBook vs array-backed TickOrderBook,
+per-level update_level vs per-message apply_batch.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_orderbook.py [recorded_day.csv|.parquet]
+"""
+
+import sys
+from itertools import groupby
+
+from bench_common import get_updates, timeit
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.tick_orderbook import TickOrderBook
+
+
+def replay(book, updates) -> None:
+    update_level = book.update_level
+    for _, side, price, qty in updates:
+        update_level(side, price, qty)
+
+
+def replay_batches(book, messages) -> None:
+    apply_batch = book.apply_batch
+    for sides, prices, qtys in messages:
+        apply_batch(sides, prices, qtys)
+
+
+def to_messages(updates):
+    """Group updates sharing an event timestamp into (sides, prices, qtys)."""
+    messages = []
+    for _, rows in groupby(updates, key=lambda u: u[0]):
+        _, sides, prices, qtys = zip(*rows)
+        messages.append((list(sides), list(prices), list(qtys)))
+    return messages
+
+
+def main() -> None:
+    updates = get_updates(sys.argv[1] if len(sys.argv) > 1 else None)
+    n = len(updates)
+
+    messages = to_messages(updates)
+
+    results = {}
+    runs = {
+        "OrderBook.update_level": (lambda: OrderBook(max_depth=50), replay, updates),
+        "OrderBook.apply_batch": (lambda: OrderBook(max_depth=50), replay_batches, messages),
+        "TickOrderBook.update_level": (lambda: TickOrderBook(max_depth=50), replay, updates),
+        "TickOrderBook.apply_batch": (lambda: TickOrderBook(max_depth=50), replay_batches, messages),
+    }
+    final = {}
+
+    for name, (factory, driver, stream) in runs.items():
+        def run():
+            book = factory()
+            driver(book, stream)
+            final[name] = book.snapshot()
+
+        elapsed = timeit(run)
+        results[name] = n / elapsed
+        print(f"{name:28s} {n / elapsed:>12,.0f} updates/s  ({elapsed:.2f}s)")
+
+    base = results["OrderBook.update_level"]
+    reference = final["OrderBook.update_level"]
+    for name, rate in results.items():
+        print(f"{name:28s} {rate / base:>6.2f}x   identical book: {final[name] == reference}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Many-file backfill: serial ReplayEngine runs (one file after another) vs
+ParallelBackfill with one shard per file and with time-range shards.
+
+Synthetic replay files (full 2 x 50 level books, one per second) stand in
+for recorded days. Speed-up is bounded by the number of cores; time-range
+shards also pay their warm-up (up to 2 x FeatureComputer.history snapshots).
+
+Usage:
+    PYTHONPATH=src:scripts python scripts/bench_parallel_backfill.py [--files 4] [--snapshots 3600] [--workers N] [--shard-ms 900000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import polars as pl
+import structlog
+from polars.testing import assert_frame_equal
+
+from bench_offline_features import write_snapshots
+from lob_microstructure_analysis.core.backfill import ParallelBackfill
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import iter_batches, read_updates
+
+
+def serial(paths) -> list:
+    frames = []
+    for path in paths:
+        processor = OrderBookProcessor(OrderBook(max_depth=50), mode="replay", label_horizon_ms=1000)
+        ReplayEngine(processor).run(iter_batches(read_updates(path)))
+        frames.append(processor.feature_store.to_dataframe().with_columns(pl.col("label").cast(pl.Int64)))
+    return frames
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--snapshots", type=int, default=3600)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--shard-ms", type=int, default=900_000)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"day{i}.csv" for i in range(args.files)]
+        for i, path in enumerate(paths):
+            write_snapshots(path, args.snapshots, seed=i)
+        updates = args.files * args.snapshots * 100
+
+        t0 = time.perf_counter()
+        expected = serial(paths)
+        t_serial = time.perf_counter() - t0
+        print(f"{args.files} files, {updates:,} updates, {args.workers} workers")
+        print(f"  serial             {t_serial:7.2f} s  {updates / t_serial:>10,.0f} updates/s")
+
+        for label, shard_ms in (("file shards", None), (f"{args.shard_ms // 1000} s shards", args.shard_ms)):
+            out = Path(tmp) / label.replace(" ", "_")
+            t0 = time.perf_counter()
+            parts = ParallelBackfill(out, workers=args.workers, shard_ms=shard_ms).run(paths)
+            elapsed = time.perf_counter() - t0
+
+            for path, frame in zip(paths, expected):
+                got = pl.concat([pl.read_parquet(p) for p in parts if p.parent.name == path.stem])
+                assert_frame_equal(got, frame)
+            print(f"  {label:<18} {elapsed:7.2f} s  {updates / elapsed:>10,.0f} updates/s"
+                  f"   {t_serial / elapsed:4.1f}x  ({len(parts)} parts, match serial)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Producer -> OrderBookProcessor throughput: one L2Update per queue item vs
+one UpdateBatch per depth message.
+
+A producer task puts a synthetic 100 ms depth-diff stream into a bounded
+asyncio.Queue while the processor consumes it (1 s snapshots, live mode).
+Reports end-to-end updates per second.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_queue_transport.py [recorded_day.csv] [-n 1000000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from itertools import groupby
+
+import structlog
+
+from bench_common import get_updates
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+
+def messages_of(updates):
+    """Rows grouped into depth messages (shared timestamp = update_id)."""
+    return [
+        [L2Update(ts, side, price, qty, level, ts) for level, (ts, side, price, qty) in enumerate(rows)]
+        for _, rows in groupby(updates, key=lambda u: u[0])
+    ]
+
+
+async def per_item(queue, messages):
+    for message in messages:
+        for update in message:
+            await queue.put(update)
+    await queue.put(None)
+
+
+async def batched(queue, messages):
+    for message in messages:
+        await queue.put(UpdateBatch.from_updates(message))
+    await queue.put(None)
+
+
+async def run(producer, messages, maxsize=10_000):
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="live")
+    queue = asyncio.Queue(maxsize=maxsize)
+    start = time.perf_counter()
+    await asyncio.gather(producer(queue, messages), processor.run(queue))
+    return time.perf_counter() - start, processor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("-n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    messages = messages_of(get_updates(args.path, args.n))
+    n = sum(len(m) for m in messages)
+    print(f"{len(messages):,} messages, {n / len(messages):.0f} levels/message\n")
+
+    results = {}
+    for name, producer in (("per-item queue", per_item), ("batched queue", batched)):
+        elapsed, processor = min(
+            (asyncio.run(run(producer, messages)) for _ in range(3)), key=lambda r: r[0]
+        )
+        results[name] = (elapsed, processor.snapshots_emitted)
+        print(f"{name:<16}{elapsed:8.2f} s{n / elapsed:>14,.0f} updates/s"
+              f"{processor.snapshots_emitted:>10,} snapshots")
+
+    base = results["per-item queue"][0]
+    print(f"\nspeedup: {base / results['batched queue'][0]:.1f}x")
+    assert results["per-item queue"][1] == results["batched queue"][1]
+
+
+if __name__ == "__main__":
+    main()
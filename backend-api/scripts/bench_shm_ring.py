@@ -0,0 +1,136 @@
+"""
+Live pipeline on one event loop vs split across processes.
+
+Synthetic Binance depth messages (raw JSON) are parsed and fed to
+OrderBookProcessor (live mode, 1 s snapshots):
+
+- single process: parse + process on one asyncio loop (``main.py live``)
+- split:          a spawned ingestion process parses and writes a
+                  SharedUpdateRing; this process pumps it into the
+                  processor (``main.py live-mp``)
+
+Timed from the first message to the last processed update; the split run
+excludes the ingestion process's start-up. The split pays off only with a
+second free core: parsing then overlaps with book / feature work.
+
+Usage:
+    PYTHONPATH=src:scripts python scripts/bench_shm_ring.py [recorded_day.csv] [-n 1000000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import structlog
+
+from bench_common import get_updates
+from bench_queue_transport import messages_of
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.binance_client import parse_depth_message
+from lob_microstructure_analysis.ingestion.shm_ring import SharedUpdateRing, pump
+
+
+def raw_messages(messages) -> list:
+    """Depth messages as the JSON text Binance sends."""
+    out = []
+    for message in messages:
+        ts = message[0].timestamp
+        out.append(json.dumps({
+            "e": "depthUpdate", "E": ts, "s": "BTCUSDT", "U": ts, "u": ts,
+            "b": [[str(u.price), str(u.quantity)] for u in message if u.side == "bid"],
+            "a": [[str(u.price), str(u.quantity)] for u in message if u.side == "ask"],
+        }))
+    return out
+
+
+def parsed(raw):
+    batch = parse_depth_message(raw).to_batch()
+    batch.trace = {"exchange": 1, "receive": time.time_ns(), "parse": time.time_ns()}
+    return batch
+
+
+def ingest(ring_name, path) -> None:
+    """Ingestion process: parse every message into the ring."""
+    ring = SharedUpdateRing(ring_name)
+    try:
+        for raw in Path(path).read_text().splitlines():
+            batch = parsed(raw)
+            while not ring.put(batch):
+                time.sleep(0.0005)
+    finally:
+        ring.close()
+        ring.release()
+
+
+async def single(raws) -> tuple:
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="live")
+    queue = asyncio.Queue(maxsize=10_000)
+
+    async def produce():
+        for raw in raws:
+            await queue.put(parsed(raw))
+        await queue.put(None)
+
+    start = time.perf_counter()
+    await asyncio.gather(produce(), processor.run(queue))
+    return time.perf_counter() - start, processor
+
+
+async def split(path) -> tuple:
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="live")
+    ring = SharedUpdateRing()
+    ingestion = multiprocessing.get_context("spawn").Process(target=ingest, args=(ring.name, path))
+    ingestion.start()
+
+    queue = asyncio.Queue(maxsize=10_000)
+    consumer = asyncio.create_task(processor.run(queue))
+    try:
+        while not len(ring):
+            await asyncio.sleep(0.0005)
+        start = time.perf_counter()
+        await pump(ring, queue, producer_alive=ingestion.is_alive)
+        await queue.put(None)
+        await consumer
+        elapsed = time.perf_counter() - start
+        ingestion.join()
+    finally:
+        ring.release()
+        ring.unlink()
+    return elapsed, processor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("-n", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    raws = raw_messages(messages_of(get_updates(args.path, args.n)))
+    print(f"{len(raws):,} messages, {os.cpu_count()} cores\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "messages.jsonl"
+        path.write_text("\n".join(raws))
+
+        results = {}
+        for name, run in (("single process", lambda: single(raws)), ("split (shm ring)", lambda: split(path))):
+            elapsed, processor = asyncio.run(run())
+            n = processor.updates_processed
+            results[name] = processor.snapshots_emitted
+            print(f"{name:<18}{elapsed:8.2f} s{n / elapsed:>14,.0f} updates/s"
+                  f"{processor.snapshots_emitted:>10,} snapshots")
+
+    assert len(set(results.values())) == 1
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Sustained processor throughput per snapshot mode, for several symbols.
+
+Each symbol gets its own OrderBookProcessor fed a depth-diff stream at the
+Binance fast rate (one message every 100 ms). Runs 1000 ms buckets, 100 ms
+buckets and per-message snapshots, and reports how many seconds of market
+data (summed over symbols) are processed per wall-clock second. Anything
+above 1.0x keeps up in real time.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_snapshot_modes.py [--symbols 10] [--seconds 60] [--levels 100]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import structlog
+
+from bench_common import synthetic_updates
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.types import L2Update
+
+MODES = (
+    ("1000 ms buckets", dict(snapshot_interval_ms=1000)),
+    ("100 ms buckets", dict(snapshot_interval_ms=100)),
+    ("per message", dict(snapshot_mode="message")),
+    ("per message, stream events", dict(snapshot_mode="message", event_mode="stream")),
+)
+
+
+def symbol_stream(seed: int, seconds: int, levels: int):
+    """One symbol's messages; the message timestamp doubles as update_id."""
+    n = seconds * 10 * levels
+    rows = synthetic_updates(n, seed=seed, msg_levels=levels, msg_interval_ms=100)
+    return [L2Update(ts, side, price, qty, 0, ts) for ts, side, price, qty in rows]
+
+
+async def run_mode(streams, options):
+    processors = [
+        OrderBookProcessor(OrderBook(max_depth=50), mode="live", **options)
+        for _ in streams
+    ]
+    queues = []
+    for stream in streams:
+        queue = asyncio.Queue()
+        for update in stream:
+            queue.put_nowait(update)
+        queue.put_nowait(None)
+        queues.append(queue)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(p.run(q) for p, q in zip(processors, queues)))
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(p.snapshots_emitted for p in processors)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--levels", type=int, default=100, help="levels per message")
+    args = parser.parse_args()
+
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    streams = [symbol_stream(seed, args.seconds, args.levels) for seed in range(args.symbols)]
+    updates = sum(len(s) for s in streams)
+    market_seconds = args.symbols * args.seconds
+    print(
+        f"{args.symbols} symbols x {args.seconds} s at 100 ms, "
+        f"{args.levels} levels/message: {updates:,} updates\n"
+    )
+    print(f"{'mode':<30}{'snapshots':>11}{'us/snapshot':>13}{'updates/s':>12}{'realtime':>10}")
+    for name, options in MODES:
+        elapsed, snapshots = asyncio.run(run_mode(streams, options))
+        print(
+            f"{name:<30}{snapshots:>11,}{elapsed / snapshots * 1e6:>13.0f}"
+            f"{updates / elapsed:>12,.0f}{market_seconds / elapsed:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Per-bucket snapshot cost over a long simulated live run:
+dict snapshot() + infer() vs versioned view() + infer_views().
+
+Each bucket applies one second of depth diffs, takes the bucket snapshot,
+diffs it against the previous one and lets a second reader (the API) read
+the book again. Reports time per bucket and traced memory allocated.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_snapshots.py [recorded_day.csv] [--buckets N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from itertools import groupby
+
+from bench_common import load_updates, synthetic_updates
+from lob_microstructure_analysis.core.event_inference import EventInferenceEngine
+from lob_microstructure_analysis.core.orderbook import OrderBook
+
+
+def buckets_of(updates, interval_ms=1000):
+    out = []
+    for _, rows in groupby(updates, key=lambda u: u[0] // interval_ms):
+        _, sides, prices, qtys = zip(*rows)
+        out.append((list(sides), list(prices), list(qtys)))
+    return out
+
+
+def run_dicts(buckets):
+    """Returns (snapshot seconds, diff seconds)."""
+    book = OrderBook(max_depth=50)
+    engine = EventInferenceEngine()
+    prev = None
+    snap_s = diff_s = 0.0
+    for ts, batch in enumerate(buckets):
+        book.apply_batch(*batch)
+        t0 = time.perf_counter()
+        snapshot = book.snapshot()
+        book.snapshot()  # second reader (API) copies again
+        t1 = time.perf_counter()
+        if prev is not None:
+            engine.infer(prev, snapshot, ts)
+        prev = snapshot
+        snap_s += t1 - t0
+        diff_s += time.perf_counter() - t1
+    return snap_s, diff_s
+
+
+def run_views(buckets):
+    """Returns (snapshot seconds, diff seconds)."""
+    book = OrderBook(max_depth=50)
+    engine = EventInferenceEngine()
+    prev = None
+    snap_s = diff_s = 0.0
+    for ts, batch in enumerate(buckets):
+        book.apply_batch(*batch)
+        t0 = time.perf_counter()
+        view = book.view()
+        book.view()  # second reader shares the cached view
+        t1 = time.perf_counter()
+        if prev is not None:
+            engine.infer_views(prev, view, ts)
+        prev = view
+        snap_s += t1 - t0
+        diff_s += time.perf_counter() - t1
+    return snap_s, diff_s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--buckets", type=int, default=3600)
+    args = parser.parse_args()
+
+    if args.path:
+        updates = load_updates(args.path)
+    else:
+        # 10 messages of 100 levels per 1 s bucket
+        updates = synthetic_updates(args.buckets * 1000)
+    buckets = buckets_of(updates)
+    print(f"{len(buckets):,} buckets, {len(updates):,} updates")
+
+    for name, fn in (("snapshot() dicts", run_dicts), ("view() arrays", run_views)):
+        tracemalloc.start()
+        fn(buckets)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snap_s, diff_s = fn(buckets)  # untraced timing
+        n = len(buckets)
+        print(
+            f"{name:18s} snapshot {snap_s / n * 1e6:7.1f} us/bucket   "
+            f"diff {diff_s / n * 1e6:7.1f} us/bucket   "
+            f"traced peak {peak / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
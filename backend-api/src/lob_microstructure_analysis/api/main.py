@@ -364,7 +364,7 @@ from datetime import datetime
 from pathlib import Path
 
 from lob_microstructure_analysis.ingestion.data_source import create_data_source
-from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.processor import DEFAULT_STAGES, OrderBookProcessor
 from lob_microstructure_analysis.ml.model_loader import load_latest_model
 from lob_microstructure_analysis.api.websocket import WebSocketManager
 from lob_microstructure_analysis.api.models import (
@@ -375,8 +375,11 @@ from lob_microstructure_analysis.api.models import (
     SystemMetrics,
     PriceLevel,
 )
+from lob_microstructure_analysis.core.order_flow import OrderFlowFeatures
 from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.snapshot_bus import SnapshotResult
 from lob_microstructure_analysis.ml.signal_aggregator import aggregate_signals
+from lob_microstructure_analysis.utils.latency import stamp
 
 
 
@@ -427,11 +430,29 @@ async def lifespan(app: FastAPI):
     # Initialize order book + processor
     orderbook = OrderBook()
 
+    # Compute only what the model and the FeatureSnapshot endpoint read;
+    # the model's inputs are written in place into one preallocated vector
+    required = set(FeatureSnapshot.__fields__) - {"timestamp"}
+    feature_vector = None
+    if app_state.predictor:
+        feature_vector = app_state.predictor.new_vector()
+
+    # Nothing here reads the labeled feature store, which would only grow,
+    # or the bucket's events unless the model takes order-flow features
+    skipped = {"labels", "store"}
+    model_inputs = set(feature_vector.names) if feature_vector is not None else set()
+    if not model_inputs.intersection(OrderFlowFeatures(depth=10).names):
+        skipped.add("events")
+
     app_state.processor = OrderBookProcessor(
         orderbook=orderbook,
         mode="live",
         snapshot_interval_ms=1000,
         label_horizon_ms=1000,
+        features=required,
+        feature_vector=feature_vector,
+        stages=[s for s in DEFAULT_STAGES if s not in skipped],
+        stage_timing=True,
     )
 
     # Init runtime
@@ -439,6 +460,10 @@ async def lifespan(app: FastAPI):
     app_state.start_time = datetime.now()
     app_state.is_running = True
 
+    # Consumers of each bucket's result (after features and price context)
+    app_state.processor.bus.subscribe(process_snapshot)
+    app_state.processor.bus.subscribe(broadcast_updates)
+
     # Start processor loop
     asyncio.create_task(app_state.processor.run(app_state.processor_queue))
 
@@ -499,20 +524,13 @@ async def run_pipeline():
     print("📡 Live data pipeline started")
 
     try:
-        async for update in app_state.data_source.stream_updates():
+        # One queue item per depth message (columnar UpdateBatch)
+        async for batch in app_state.data_source.stream_batches():
             if not app_state.is_running:
                 break
 
-            await app_state.processor_queue.put(update)
-            app_state.updates_processed += 1
-
-            # Detect new snapshot
-            if app_state.processor.snapshots_emitted > app_state.predictions_made:
-                await process_snapshot()
-
-            # Throttle WS broadcast (~10 FPS)
-            if app_state.updates_processed % 10 == 0:
-                await broadcast_updates()
+            await app_state.processor_queue.put(batch)
+            app_state.updates_processed += len(batch)
 
     except asyncio.CancelledError:
         pass
@@ -520,38 +538,30 @@ async def run_pipeline():
         print(f"Pipeline error: {e}")
 
 
-async def process_snapshot():
-    book = app_state.processor.orderbook
+async def process_snapshot(result: SnapshotResult):
+    """Snapshot bus subscriber: cache the bucket's book, features, prediction."""
+    view = result.view
 
     # Cache order book snapshot
     app_state.latest_orderbook = OrderBookSnapshot(
         timestamp=int(datetime.now().timestamp() * 1000),
-        bids=[
-            PriceLevel(price=p, quantity=q)
-            for p, q in list(book.bids.items())[:10]
-        ],
-        asks=[
-            PriceLevel(price=p, quantity=q)
-            for p, q in list(book.asks.items())[:10]
-        ],
-        mid_price=book.mid_price(),
-        spread=book.spread(),
+        bids=[PriceLevel(price=p, quantity=q) for p, q in result.bids],
+        asks=[PriceLevel(price=p, quantity=q) for p, q in result.asks],
+        mid_price=view.mid_price(),
+        spread=view.spread(),
     )
 
-    # Compute features
-    features = app_state.processor.feature_computer.compute(book.snapshot())
-    if not features:
-        return
-
+    # Features were computed once by the processor for this bucket
     app_state.latest_features = FeatureSnapshot(
         timestamp=int(datetime.now().timestamp() * 1000),
-        **features,
+        **result.features,
     )
 
     # Microstructure ML prediction
-    if app_state.predictor:
+    if app_state.predictor and result.vector is not None:
         try:
-            pred = app_state.predictor.predict(features)
+            pred = app_state.predictor.predict_vector(result.vector)
+            stamp(result.trace, "prediction")
             app_state.latest_prediction = PredictionResponse(
                 timestamp=int(datetime.now().timestamp() * 1000),
                 prediction=pred["prediction"],
@@ -564,7 +574,8 @@ async def process_snapshot():
             print(f"Prediction error: {e}")
 
 
-async def broadcast_updates():
+async def broadcast_updates(result: SnapshotResult):
+    """Snapshot bus subscriber: push the cached state to WebSocket clients."""
     if not app_state.ws_manager.active_connections:
         return
 
@@ -580,6 +591,7 @@ async def broadcast_updates():
             if app_state.latest_prediction else None,
         }
     )
+    stamp(result.trace, "broadcast")
 
 
 # ============================================================
@@ -657,6 +669,14 @@ async def get_metrics():
         active_websocket_connections=len(
             app_state.ws_manager.active_connections
         ),
+        latency=(
+            app_state.processor.latency.summary()
+            if app_state.processor else {}
+        ),
+        stages=(
+            app_state.processor.pipeline.summary()
+            if app_state.processor else {}
+        ),
     )
 
 
@@ -58,6 +58,26 @@ class PredictionResponse(BaseModel):
         """Human-readable prediction label."""
         return {-1: "DOWN", 0: "FLAT", 1: "UP"}.get(self.prediction, "UNKNOWN")
 
+class LatencySummary(BaseModel):
+    """Latency distribution of one pipeline hop (or end to end)."""
+    count: int = Field(..., description="Samples recorded")
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    p999_ms: float
+    max_ms: float
+
+
+class StageSummary(BaseModel):
+    """Call count and run time of one processor stage."""
+    calls: int = Field(..., description="Buckets that reached the stage")
+    total_ms: float
+    mean_us: float
+    p50_us: float
+    p99_us: float
+
+
 class SystemMetrics(BaseModel):
     """System performance metrics."""
     timestamp: int = Field(..., description="Unix timestamp (ms)")
@@ -66,4 +86,12 @@ class SystemMetrics(BaseModel):
     predictions_made: int = Field(..., description="Total predictions made")
     uptime_seconds: int = Field(..., description="System uptime")
     updates_per_second: int = Field(..., description="Current processing rate")
-    active_websocket_connections: int = Field(..., description="Active WebSocket clients")
\ No newline at end of file
+    active_websocket_connections: int = Field(..., description="Active WebSocket clients")
+    latency: dict[str, LatencySummary] = Field(
+        default_factory=dict,
+        description="Per-stage and end-to-end latency, e.g. exchange_to_prediction",
+    )
+    stages: dict[str, StageSummary] = Field(
+        default_factory=dict,
+        description="Per processor stage cost, in pipeline order",
+    )
\ No newline at end of file
@@ -0,0 +1,272 @@
+# src/lob_microstructure_analysis/core/backfill.py
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import polars as pl
+import structlog
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import SNAPSHOT_INTERVAL_MS, OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import iter_batches, read_updates, timestamps_ms
+
+log = structlog.get_logger()
+
+
+class Shard(NamedTuple):
+    """
+    One worker's share of a source file: rows ``[first_row, stop_row)`` of
+    the sorted file are replayed and the records stamped in
+    ``[start_ms, end_ms)`` are kept (None: unbounded).
+    """
+
+    source: Path
+    index: int
+    first_row: int
+    stop_row: Optional[int]
+    start_ms: Optional[int]
+    end_ms: Optional[int]
+
+
+class ParallelBackfill:
+    """
+    Replay many recorded files, or time ranges of them, across a process pool.
+
+    Every shard runs in a worker with its own OrderBook, OrderBookProcessor
+    and FeatureStore (driven by ReplayEngine) and writes
+    ``<output_dir>/<file stem>/part-<shard>.parquet``. A source's
+    parts, in order, hold exactly the records a serial replay of that file
+    produces, so the output directory is one dataset partitioned by source.
+
+    Files are independent replays. With ``shard_ms`` (replay mode only) each
+    file is also cut into time ranges. A range's worker starts early
+    (warm-up) so that, by the range's first bucket, its rolling windows hold
+    the same snapshots and re-anchor on the same cycle as the serial run
+    (see ``FeatureComputer.history``), and the order-flow windows and event
+    diffs have seen the same buckets. It also replays past the range until
+    every kept record is labelled. Records outside the range are dropped.
+    """
+
+    def __init__(
+        self,
+        output_dir: str | Path,
+        workers: Optional[int] = None,
+        shard_ms: Optional[int] = None,
+        mode: str = "replay",
+        snapshot_interval_ms: int = SNAPSHOT_INTERVAL_MS,
+        label_horizon_ms: int = 1000,
+        max_depth: int = 50,
+    ) -> None:
+        if shard_ms is not None:
+            if mode != "replay":
+                # Live books carry state from the start of the file
+                raise ValueError("time-range shards require mode 'replay'")
+            if shard_ms <= 0 or shard_ms % snapshot_interval_ms:
+                raise ValueError("shard_ms must be a positive multiple of snapshot_interval_ms")
+
+        self.output_dir = Path(output_dir)
+        self.workers = workers
+        self.shard_ms = shard_ms
+        self.max_depth = max_depth
+        self.options = {
+            "mode": mode,
+            "snapshot_interval_ms": snapshot_interval_ms,
+            "label_horizon_ms": label_horizon_ms,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def plan(self, paths: Iterable[str | Path]) -> List[Shard]:
+        """Shards for every file, in file then time order."""
+        shards: List[Shard] = []
+        for path in map(Path, paths):
+            if self.shard_ms is None:
+                shards.append(Shard(path, 0, 0, None, None, None))
+            else:
+                shards.extend(self._time_shards(path))
+        return shards
+
+    def run(self, paths: Iterable[str | Path]) -> List[Path]:
+        """
+        Replay every shard and write its part.
+
+        Returns:
+            Written part files, in source and time order
+        """
+        shards = self.plan(paths)
+        log.info("backfill_planned", shards=len(shards), workers=self.workers)
+
+        jobs = [(shard, self.output_dir, self.max_depth, self.options) for shard in shards]
+        if self.workers == 1:
+            parts = [_run_shard(*job) for job in jobs]
+        else:
+            # Polars' thread pool does not survive fork(): spawn workers
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+                parts = list(pool.map(_run_shard, *zip(*jobs)))
+        return [part for part in parts if part is not None]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _time_shards(self, path: Path) -> List[Shard]:
+        df = read_updates(path)
+        if not df.height:
+            return []
+        interval = self.options["snapshot_interval_ms"]
+        horizon = self.options["label_horizon_ms"]
+
+        processor = OrderBookProcessor(OrderBook(self.max_depth), **self.options)
+        history = processor.feature_computer.history
+        flow_buckets = max(processor.order_flow.windows + (1,))
+
+        bucket = _bucket_ids(df, interval)
+        rows = np.r_[0, np.flatnonzero(bucket[1:] != bucket[:-1]) + 1, df.height]
+        ids = bucket[rows[:-1]]
+        ts = ids * interval
+        emitted = _emitted(df, bucket, ids, rows, self.max_depth)
+        emitted_at = np.flatnonzero(emitted)
+        # Snapshots emitted before each bucket
+        before = np.cumsum(emitted) - emitted
+
+        keys = ids // (self.shard_ms // interval)
+        bounds = np.r_[0, np.flatnonzero(keys[1:] != keys[:-1]) + 1, len(ids)].tolist()
+
+        shards = []
+        for index, (i0, i1) in enumerate(zip(bounds, bounds[1:])):
+            # Warm-up: latest bucket where the serial run's snapshot count
+            # is a multiple of ``history``, far enough back for every window
+            warm = np.flatnonzero(
+                (before[: i0 + 1] % history == 0)
+                & (before[: i0 + 1] <= before[i0] - (history - 1))
+                & (np.arange(i0 + 1) <= i0 - flow_buckets)
+            )
+            first = int(warm[-1]) if len(warm) else 0
+
+            # Lookahead: up to the snapshot that labels the last kept one
+            stop = i1
+            kept = emitted_at[(emitted_at >= i0) & (emitted_at < i1)]
+            if len(kept):
+                later = emitted_at[emitted_at >= i1]
+                j = np.searchsorted(ts[later], ts[kept[-1]] + horizon)
+                stop = int(later[j]) + 1 if j < len(later) else len(ids)
+
+            shards.append(Shard(
+                source=path,
+                index=index,
+                first_row=int(rows[first]),
+                stop_row=int(rows[stop]),
+                start_ms=int(ts[i0]),
+                end_ms=int(ts[i1]) if i1 < len(ids) else None,
+            ))
+        return shards
+
+
+def _run_shard(shard: Shard, output_dir: Path, max_depth: int, options: dict) -> Optional[Path]:
+    """Worker: replay one shard and write its records."""
+    df = read_updates(shard.source)
+    stop = df.height if shard.stop_row is None else shard.stop_row
+    df = df.slice(shard.first_row, stop - shard.first_row)
+
+    processor = OrderBookProcessor(OrderBook(max_depth=max_depth), **options)
+    engine = ReplayEngine(processor)
+    engine.run(iter_batches(df))
+
+    records = processor.feature_store.to_dataframe()
+    if records.height and shard.start_ms is not None:
+        kept = pl.col("timestamp") >= shard.start_ms
+        if shard.end_ms is not None:
+            kept &= pl.col("timestamp") < shard.end_ms
+        records = records.filter(kept)
+    if not records.height:
+        return None
+
+    # A part with no resolved label would otherwise get a Null column
+    records = records.with_columns(pl.col("label").cast(pl.Int64))
+    path = output_dir / shard.source.stem / f"part-{shard.index:05d}.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records.write_parquet(path)
+
+    log.info(
+        "backfill_shard_complete",
+        source=str(shard.source),
+        shard=shard.index,
+        updates=processor.updates_processed,
+        records=records.height,
+        updates_per_second=round(engine.updates_per_second or 0.0),
+    )
+    return path
+
+
+def _bucket_ids(df: pl.DataFrame, interval_ms: int) -> np.ndarray:
+    """Per-row time bucket, as the processor derives it from loader rows."""
+    return timestamps_ms(df) // interval_ms
+
+
+def _emitted(
+    df: pl.DataFrame,
+    bucket: np.ndarray,
+    ids: np.ndarray,
+    rows: np.ndarray,
+    max_depth: int,
+) -> np.ndarray:
+    """
+    Whether each replay bucket emits a snapshot (a two-sided book).
+
+    Vectorised for buckets that ``OrderBook.load`` would take (no depth
+    trim or crossed levels): two-sided iff each side's last write to some
+    level is positive. Other buckets are applied to a scratch book.
+    """
+    levels = pl.DataFrame({
+        "bucket": bucket,
+        "side": df["side"],
+        "price": df["price"].cast(pl.Float64),
+        "qty": df["quantity"].cast(pl.Float64),
+    }).group_by(["bucket", "side", "price"], maintain_order=True).agg(pl.col("qty").last())
+    per_side = levels.group_by(["bucket", "side"]).agg(
+        pl.len().alias("levels"),
+        pl.col("price").max().alias("high"),
+        pl.col("price").min().alias("low"),
+        (pl.col("qty") > 0).any().alias("live"),
+    )
+
+    table = pl.DataFrame({"bucket": ids})
+    for side in ("bid", "ask"):
+        table = table.join(
+            per_side.filter(pl.col("side") == side).select(
+                "bucket",
+                pl.col("levels").alias(f"{side}_levels"),
+                pl.col("high").alias(f"{side}_high"),
+                pl.col("low").alias(f"{side}_low"),
+                pl.col("live").alias(f"{side}_live"),
+            ),
+            on="bucket",
+            how="left",
+            coalesce=True,
+        )
+
+    emitted = np.array(
+        table["bid_live"].fill_null(False) & table["ask_live"].fill_null(False), dtype=bool
+    )
+    trimmed = (table["bid_levels"].fill_null(0) > max_depth) | (table["ask_levels"].fill_null(0) > max_depth)
+    crossed = (table["bid_high"] >= table["ask_low"]).fill_null(False)
+
+    book = OrderBook(max_depth=max_depth)
+    sides, prices, quantities = df["side"], df["price"].cast(pl.Float64), df["quantity"].cast(pl.Float64)
+    for i in np.flatnonzero((trimmed | crossed).to_numpy()).tolist():
+        start, stop = rows[i], rows[i + 1]
+        book.reset()
+        book.apply_batch(
+            sides[start:stop].to_list(),
+            prices[start:stop].to_list(),
+            quantities[start:stop].to_list(),
+        )
+        emitted[i] = book.best_bid() is not None and book.best_ask() is not None
+    return emitted
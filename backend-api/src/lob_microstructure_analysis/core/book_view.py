@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def _frozen(values: Iterable[float], count: int) -> np.ndarray:
+    arr = np.fromiter(values, dtype=np.float64, count=count)
+    arr.flags.writeable = False
+    return arr
+
+
+@dataclass(frozen=True)
+class BookView:
+    """
+    Immutable, versioned view of an order book.
+
+    Levels are read-only float64 arrays, best first. A book hands out one
+    view per ``version`` (its mutation counter), so every reader of the
+    same bucket shares one compact copy instead of building dicts.
+    """
+
+    version: int
+    bid_prices: np.ndarray
+    bid_qty: np.ndarray
+    ask_prices: np.ndarray
+    ask_qty: np.ndarray
+
+    @classmethod
+    def from_levels(
+        cls,
+        version: int,
+        bids: Tuple[Iterable[float], Iterable[float], int],
+        asks: Tuple[Iterable[float], Iterable[float], int],
+    ) -> "BookView":
+        """Build from (prices, quantities, count) iterables per side, best first."""
+        bid_prices, bid_qty, n_bids = bids
+        ask_prices, ask_qty, n_asks = asks
+        return cls(
+            version=version,
+            bid_prices=_frozen(bid_prices, n_bids),
+            bid_qty=_frozen(bid_qty, n_bids),
+            ask_prices=_frozen(ask_prices, n_asks),
+            ask_qty=_frozen(ask_qty, n_asks),
+        )
+
+    @classmethod
+    def from_arrays(
+        cls,
+        version: int,
+        bid_prices: np.ndarray,
+        bid_qty: np.ndarray,
+        ask_prices: np.ndarray,
+        ask_qty: np.ndarray,
+    ) -> "BookView":
+        """Wrap freshly built arrays (not shared with the book), best first."""
+        for arr in (bid_prices, bid_qty, ask_prices, ask_qty):
+            arr.flags.writeable = False
+        return cls(version, bid_prices, bid_qty, ask_prices, ask_qty)
+
+    def side(self, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        if side == "bid":
+            return self.bid_prices, self.bid_qty
+        if side == "ask":
+            return self.ask_prices, self.ask_qty
+        raise ValueError(f"Invalid side: {side}")
+
+    def best_bid(self) -> Optional[float]:
+        return float(self.bid_prices[0]) if len(self.bid_prices) else None
+
+    def best_ask(self) -> Optional[float]:
+        return float(self.ask_prices[0]) if len(self.ask_prices) else None
+
+    def mid_price(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2.0
+
+    def spread(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def top(self, side: str, n: int) -> List[Tuple[float, float]]:
+        prices, qty = self.side(side)
+        return list(zip(prices[:n].tolist(), qty[:n].tolist()))
+
+    def as_dict(self) -> Dict[str, Dict[float, float]]:
+        """Legacy ``OrderBook.snapshot()`` layout (builds new dicts)."""
+        return {
+            "bid": dict(zip(self.bid_prices.tolist(), self.bid_qty.tolist())),
+            "ask": dict(zip(self.ask_prices.tolist(), self.ask_qty.tolist())),
+        }
@@ -0,0 +1,108 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# fetch(side, start, stop) -> [(price, qty), ...] for ranks start..stop-1
+LevelFetch = Callable[[str, int, int], List[Tuple[float, float]]]
+
+
+class DepthAggregates:
+    """
+    Cumulative top-N depth per side, maintained alongside an order book.
+
+    The book calls ``touch(side, rank)`` for every level change at ``rank``
+    (0 = best). Only ranks from the lowest touched one onwards are re-read,
+    lazily on the next query, so volume, depth-weighted price and imbalance
+    at any depth k <= n are O(1) reads between changes.
+    """
+
+    def __init__(self, n: int, fetch: LevelFetch) -> None:
+        self.n = n
+        self._fetch = fetch
+
+        self._prices = {s: np.zeros(n) for s in ("bid", "ask")}
+        self._qty = {s: np.zeros(n) for s in ("bid", "ask")}
+        self._cum_qty = {s: np.zeros(n) for s in ("bid", "ask")}
+        self._cum_notional = {s: np.zeros(n) for s in ("bid", "ask")}
+        self._count = {"bid": 0, "ask": 0}
+
+        # Lowest stale rank per side; n means clean
+        self.dirty: Dict[str, int] = {"bid": 0, "ask": 0}
+
+    def touch(self, side: str, rank: int) -> None:
+        if rank < self.dirty[side]:
+            self.dirty[side] = rank
+
+    def invalidate(self) -> None:
+        self.dirty["bid"] = 0
+        self.dirty["ask"] = 0
+
+    def _refresh(self, side: str) -> None:
+        start = self.dirty[side]
+        if start >= self.n:
+            return
+
+        levels = self._fetch(side, start, self.n)
+        count = start + len(levels)
+
+        if levels:
+            block = np.asarray(levels, dtype=np.float64)
+            prices = block[:, 0]
+            qty = block[:, 1]
+
+            self._prices[side][start:count] = prices
+            self._qty[side][start:count] = qty
+            # Continue the running sums from the last clean rank; cumsum is a
+            # left fold, so results match summing the levels in order.
+            self._cum_qty[side][start:count] = _running_sum(
+                self._cum_qty[side], start, qty
+            )
+            self._cum_notional[side][start:count] = _running_sum(
+                self._cum_notional[side], start, prices * qty
+            )
+
+        self._count[side] = count
+        self.dirty[side] = self.n
+
+    def level_count(self, side: str) -> int:
+        self._refresh(side)
+        return self._count[side]
+
+    def levels(self, side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-N (prices, quantities), best first. Read-only views."""
+        self._refresh(side)
+        count = self._count[side]
+        return self._prices[side][:count], self._qty[side][:count]
+
+    def volume(self, side: str, k: int) -> float:
+        """Total quantity over the best ``k`` levels (k <= n)."""
+        self._check_depth(k)
+        self._refresh(side)
+        m = min(k, self._count[side])
+        return float(self._cum_qty[side][m - 1]) if m else 0.0
+
+    def weighted_price(self, side: str, k: int) -> Optional[float]:
+        """Quantity-weighted average price over the best ``k`` levels."""
+        self._check_depth(k)
+        self._refresh(side)
+        m = min(k, self._count[side])
+        if not m:
+            return None
+        return float(self._cum_notional[side][m - 1] / self._cum_qty[side][m - 1])
+
+    def imbalance(self, k: int) -> float:
+        """(bid_vol - ask_vol) / (bid_vol + ask_vol) over the best ``k`` levels."""
+        bid_vol = self.volume("bid", k)
+        ask_vol = self.volume("ask", k)
+        total = bid_vol + ask_vol
+        return (bid_vol - ask_vol) / total if total > 0 else 0.0
+
+    def _check_depth(self, k: int) -> None:
+        if not 0 < k <= self.n:
+            raise ValueError(f"depth must be in 1..{self.n}, got {k}")
+
+
+def _running_sum(cum: np.ndarray, start: int, values: np.ndarray) -> np.ndarray:
+    if not start:
+        return np.cumsum(values)
+    return np.cumsum(np.concatenate(([cum[start - 1]], values)))[1:]
@@ -0,0 +1,70 @@
+import numpy as np
+
+from lob_microstructure_analysis.core.events import EVENT_DTYPES, EventBatch, _EventColumns
+
+
+class EventRingBuffer(_EventColumns):
+    """
+    Bounded ring of book events emitted by an order book as levels change.
+
+    Events are written column-wise into preallocated arrays (no per-event
+    objects). Downstream stages drain it once per bucket as an EventBatch.
+    When full, the oldest events are overwritten and counted in ``dropped``.
+    """
+
+    def __init__(self, capacity: int = 100_000) -> None:
+        self._alloc(capacity)
+        self._head = 0
+        self._size = 0
+        self.dropped = 0
+
+    def append(
+        self,
+        timestamp: int,
+        side: int,
+        price: float,
+        prev_qty: float,
+        new_qty: float,
+        event_type: int,
+    ) -> None:
+        capacity = self.capacity
+        if self._size == capacity:
+            i = self._head
+            self._head = (i + 1) % capacity
+            self.dropped += 1
+        else:
+            i = (self._head + self._size) % capacity
+            self._size += 1
+        ts, sd, px, pq, nq, et = self._views
+        ts[i] = timestamp
+        sd[i] = side
+        px[i] = price
+        pq[i] = prev_qty
+        nq[i] = new_qty
+        et[i] = event_type
+
+    def drain(self) -> EventBatch:
+        """Return all buffered events (oldest first) and empty the buffer."""
+        batch = EventBatch(self._size)
+        start = self._head
+        stop = start + self._size
+        if stop <= self.capacity:
+            batch.extend_columns(
+                {name: getattr(self, name)[start:stop] for name in EVENT_DTYPES}
+            )
+        else:
+            wrap = stop - self.capacity
+            batch.extend_columns(
+                {
+                    name: np.concatenate(
+                        (getattr(self, name)[start:], getattr(self, name)[:wrap])
+                    )
+                    for name in EVENT_DTYPES
+                }
+            )
+        self._head = 0
+        self._size = 0
+        return batch
+
+    def __len__(self) -> int:
+        return self._size
@@ -1,6 +1,17 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
-from lob_microstructure_analysis.core.events import BookEvent, EventType
+import numpy as np
+
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.events import (
+    ADD,
+    CANCEL,
+    MODIFY,
+    SIDES,
+    BookEvent,
+    EventBatch,
+    EventType,
+)
 
 
 class EventInferenceEngine:
@@ -43,3 +54,152 @@ class EventInferenceEngine:
                     )
 
         return events
+
+    def infer_views(
+        self,
+        prev_view: BookView,
+        curr_view: BookView,
+        timestamp: int,
+    ) -> List[BookEvent]:
+        """
+        Same events (and order) as infer(), read straight from two views.
+        Each side is a single merge walk over the sorted level arrays, so no
+        dicts are built.
+        """
+        events: List[BookEvent] = []
+
+        if prev_view.version == curr_view.version:
+            return events
+
+        for side in ("bid", "ask"):
+            prev_prices, prev_qty = prev_view.side(side)
+            curr_prices, curr_qty = curr_view.side(side)
+            prev_prices = prev_prices.tolist()
+            prev_qty = prev_qty.tolist()
+            curr_prices = curr_prices.tolist()
+            curr_qty = curr_qty.tolist()
+
+            # Walk both sides best-first; bids descend, asks ascend
+            descending = side == "bid"
+            n_prev = len(prev_prices)
+            n_curr = len(curr_prices)
+            i = j = 0
+            cancels: List[BookEvent] = []
+
+            while i < n_curr or j < n_prev:
+                if j == n_prev:
+                    curr_first = True
+                elif i == n_curr:
+                    curr_first = False
+                elif curr_prices[i] == prev_prices[j]:
+                    if curr_qty[i] != prev_qty[j]:
+                        events.append(
+                            BookEvent(
+                                timestamp, side, curr_prices[i],
+                                prev_qty[j], curr_qty[i], EventType.MODIFY,
+                            )
+                        )
+                    i += 1
+                    j += 1
+                    continue
+                else:
+                    curr_first = (curr_prices[i] > prev_prices[j]) == descending
+
+                if curr_first:
+                    events.append(
+                        BookEvent(
+                            timestamp, side, curr_prices[i], 0.0, curr_qty[i], EventType.ADD
+                        )
+                    )
+                    i += 1
+                else:
+                    cancels.append(
+                        BookEvent(
+                            timestamp, side, prev_prices[j], prev_qty[j], 0.0, EventType.CANCEL
+                        )
+                    )
+                    j += 1
+
+            events.extend(cancels)
+
+        return events
+
+    def infer_batch(
+        self,
+        prev_view: BookView,
+        curr_view: BookView,
+        timestamp: int,
+    ) -> EventBatch:
+        """
+        Vectorised infer_views(): same events and order, as one EventBatch.
+        Levels are joined on price with searchsorted over the sorted arrays.
+        """
+        if prev_view.version == curr_view.version:
+            return EventBatch(capacity=0)
+
+        sides, prices, prev_qtys, new_qtys, types = [], [], [], [], []
+
+        for code, side in enumerate(SIDES):
+            prev_prices, prev_qty = prev_view.side(side)
+            curr_prices, curr_qty = curr_view.side(side)
+            # Bids are stored descending; negate so both sides sort ascending
+            sign = -1.0 if side == "bid" else 1.0
+
+            # Adds & modifies, in current level order
+            pos, hit = _join(sign * prev_prices, sign * curr_prices)
+            old_qty = np.where(hit, prev_qty[pos], 0.0) if len(prev_qty) else np.zeros(len(curr_qty))
+            emit = ~hit | (old_qty != curr_qty)
+            prices.append(curr_prices[emit])
+            prev_qtys.append(old_qty[emit])
+            new_qtys.append(curr_qty[emit])
+            types.append(np.where(hit[emit], MODIFY, ADD))
+
+            # Cancels, in previous level order
+            _, kept = _join(sign * curr_prices, sign * prev_prices)
+            gone = ~kept
+            prices.append(prev_prices[gone])
+            prev_qtys.append(prev_qty[gone])
+            new_qtys.append(np.zeros(len(prices[-1])))
+            types.append(np.full(len(prices[-1]), CANCEL))
+
+            sides.extend((code, code))
+
+        counts = [len(p) for p in prices]
+        return EventBatch.from_columns({
+            "timestamp": np.full(sum(counts), timestamp),
+            "side": np.repeat(sides, counts),
+            "price": np.concatenate(prices),
+            "prev_qty": np.concatenate(prev_qtys),
+            "new_qty": np.concatenate(new_qtys),
+            "event_type": np.concatenate(types),
+        })
+
+
+def link_levels(snap: np.ndarray, price: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Link stacked levels of one side across consecutive snapshots.
+
+    ``snap`` (non-decreasing snapshot index) and ``price`` describe one row
+    per level. Returns, per row, the row index of the same price in
+    snapshot ``snap - 1`` (-1 if absent) and whether the price is still
+    present in snapshot ``snap + 1``.
+    """
+    # Rows are in snapshot order, so a stable sort by price puts each
+    # level right after the same price in the previous snapshot
+    order = np.argsort(price, kind="stable")
+    link = (price[order[1:]] == price[order[:-1]]) & (
+        snap[order[1:]] == snap[order[:-1]] + 1
+    )
+    prev_row = np.full(len(price), -1)
+    prev_row[order[1:][link]] = order[:-1][link]
+    has_next = np.zeros(len(price), dtype=bool)
+    has_next[order[:-1][link]] = True
+    return prev_row, has_next
+
+
+def _join(ref_keys: np.ndarray, keys: np.ndarray):
+    """Positions of ``keys`` in ascending ``ref_keys`` and whether they match."""
+    pos = np.searchsorted(ref_keys, keys)
+    pos = np.minimum(pos, max(len(ref_keys) - 1, 0))
+    hit = ref_keys[pos] == keys if len(ref_keys) else np.zeros(len(keys), dtype=bool)
+    return pos, hit
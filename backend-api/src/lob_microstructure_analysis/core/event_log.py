@@ -0,0 +1,139 @@
+# src/lob_microstructure_analysis/core/event_log.py
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import polars as pl
+
+from lob_microstructure_analysis.core.events import EVENT_DTYPES, EventBatch
+
+PathLike = Union[str, Path]
+
+FORMATS = {
+    ".parquet": "parquet",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+    ".feather": "ipc",
+}
+
+
+def _format_of(path: Path, fmt: Optional[str]) -> str:
+    if fmt is not None:
+        if fmt not in {"parquet", "ipc"}:
+            raise ValueError("format must be 'parquet' or 'ipc'")
+        return fmt
+    try:
+        return FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Cannot infer event log format from {path.name}")
+
+
+class EventLogWriter:
+    """
+    Append-only columnar log of book events (Parquet or Arrow IPC).
+
+    Events are copied into an EventBatch and written as one Parquet row
+    group / IPC record batch every ``row_group_size`` rows, so memory stays
+    bounded and readers can skip row groups by timestamp statistics.
+
+    Requires pyarrow (imported lazily).
+    """
+
+    def __init__(
+        self,
+        path: PathLike,
+        format: Optional[str] = None,
+        row_group_size: int = 1_000_000,
+        compression: str = "zstd",
+    ) -> None:
+        try:
+            import pyarrow as pa
+        except ImportError as exc:
+            raise ImportError("EventLogWriter requires pyarrow") from exc
+
+        self.path = Path(path)
+        self.format = _format_of(self.path, format)
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+
+        self._pa = pa
+        self._schema = pa.schema(
+            [(name, pa.from_numpy_dtype(dtype)) for name, dtype in EVENT_DTYPES.items()]
+        )
+        self._pending = EventBatch(capacity=min(row_group_size, 65_536))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer = pq.ParquetWriter(
+                str(self.path), self._schema, compression=compression
+            )
+        else:
+            import pyarrow.ipc as ipc
+
+            self._writer = ipc.new_file(
+                str(self.path),
+                self._schema,
+                options=ipc.IpcWriteOptions(compression=compression),
+            )
+
+    def write(self, batch: EventBatch) -> None:
+        """Append a batch; flushes whenever a full row group is pending."""
+        if self._writer is None:
+            raise RuntimeError("EventLogWriter is closed")
+        self._pending.extend(batch)
+        if len(self._pending) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending events as one row group (no-op if empty)."""
+        if not len(self._pending):
+            return
+        pa = self._pa
+        table = pa.Table.from_arrays(
+            [pa.array(col) for col in self._pending.columns().values()],
+            schema=self._schema,
+        )
+        if self.format == "parquet":
+            self._writer.write_table(table, row_group_size=len(table))
+        else:
+            self._writer.write_table(table, max_chunksize=len(table))
+        self.rows_written += len(table)
+        self._pending.clear()
+
+    def close(self) -> None:
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def scan_events(paths: Union[PathLike, Iterable[PathLike]]) -> pl.LazyFrame:
+    """
+    Lazily scan one or more event logs (format from file suffix).
+
+    Side / event type columns hold the integer codes from ``events``
+    (BID/ASK, ADD/CANCEL/MODIFY); filters and aggregations run vectorised
+    inside polars.
+    """
+    if isinstance(paths, (str, Path)):
+        paths = [paths]
+
+    frames = []
+    for path in map(Path, paths):
+        if _format_of(path, None) == "parquet":
+            frames.append(pl.scan_parquet(path))
+        else:
+            frames.append(pl.scan_ipc(path))
+
+    if not frames:
+        raise ValueError("No event log paths given")
+    return frames[0] if len(frames) == 1 else pl.concat(frames)
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from enum import Enum
-from typing import Literal
+from typing import Dict, Iterable, List, Literal
+
+import numpy as np
 
 
 class EventType(str, Enum):
@@ -17,3 +19,149 @@ class BookEvent:
     prev_qty: float
     new_qty: float
     event_type: EventType
+
+
+# Integer codes used by the columnar representation
+SIDES = ("bid", "ask")
+SIDE_CODES = {side: code for code, side in enumerate(SIDES)}
+BID, ASK = 0, 1
+
+EVENT_TYPES = (EventType.ADD, EventType.CANCEL, EventType.MODIFY)
+EVENT_CODES = {etype: code for code, etype in enumerate(EVENT_TYPES)}
+ADD, CANCEL, MODIFY = 0, 1, 2
+
+EVENT_DTYPES = {
+    "timestamp": np.int64,
+    "side": np.int8,
+    "price": np.float64,
+    "prev_qty": np.float64,
+    "new_qty": np.float64,
+    "event_type": np.int8,
+}
+
+
+class _EventColumns:
+    """Preallocated NumPy columns plus memoryviews for fast scalar writes."""
+
+    def _alloc(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.price = np.empty(capacity, dtype=np.float64)
+        self.prev_qty = np.empty(capacity, dtype=np.float64)
+        self.new_qty = np.empty(capacity, dtype=np.float64)
+        self.event_type = np.empty(capacity, dtype=np.int8)
+        self._views = tuple(
+            memoryview(col)
+            for col in (
+                self.timestamp, self.side, self.price,
+                self.prev_qty, self.new_qty, self.event_type,
+            )
+        )
+
+
+class EventBatch(_EventColumns):
+    """
+    Struct-of-arrays batch of book events.
+
+    Columns: timestamp (ms, int64), side (BID/ASK, int8), price, prev_qty,
+    new_qty (float64) and event_type (ADD/CANCEL/MODIFY, int8). Appends
+    write straight into preallocated columns (doubling when full); use
+    ``columns()`` for vectorised analysis.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self._alloc(max(capacity, 1))
+        self.size = 0
+
+    def append(
+        self,
+        timestamp: int,
+        side: int,
+        price: float,
+        prev_qty: float,
+        new_qty: float,
+        event_type: int,
+    ) -> None:
+        i = self.size
+        if i == self.capacity:
+            self._grow(i + 1)
+        ts, sd, px, pq, nq, et = self._views
+        ts[i] = timestamp
+        sd[i] = side
+        px[i] = price
+        pq[i] = prev_qty
+        nq[i] = new_qty
+        et[i] = event_type
+        self.size = i + 1
+
+    def extend_columns(self, columns: Dict[str, np.ndarray]) -> None:
+        """Append whole columns (same keys as ``columns()``)."""
+        n = len(columns["timestamp"])
+        if not n:
+            return
+        if self.size + n > self.capacity:
+            self._grow(self.size + n)
+        for name in EVENT_DTYPES:
+            getattr(self, name)[self.size:self.size + n] = columns[name]
+        self.size += n
+
+    def extend(self, other: "EventBatch") -> None:
+        self.extend_columns(other.columns())
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """Column name -> array view over the filled rows."""
+        return {name: getattr(self, name)[:self.size] for name in EVENT_DTYPES}
+
+    def clear(self) -> None:
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(self.capacity, 1)  # from_columns adopts empty columns as-is
+        while capacity < needed:
+            capacity *= 2
+        old = self.columns()
+        self._alloc(capacity)
+        for name, values in old.items():
+            getattr(self, name)[:len(values)] = values
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> "EventBatch":
+        """Adopt whole columns (cast to the event dtypes, copied only if needed)."""
+        batch = cls.__new__(cls)
+        batch.capacity = len(columns["timestamp"])
+        for name, dtype in EVENT_DTYPES.items():
+            setattr(batch, name, np.ascontiguousarray(columns[name], dtype=dtype))
+        batch._views = tuple(memoryview(getattr(batch, name)) for name in EVENT_DTYPES)
+        batch.size = batch.capacity
+        return batch
+
+    @classmethod
+    def from_events(cls, events: Iterable[BookEvent]) -> "EventBatch":
+        events = list(events)
+        batch = cls(len(events))
+        for e in events:
+            batch.append(
+                e.timestamp, SIDE_CODES[e.side], e.price,
+                e.prev_qty, e.new_qty, EVENT_CODES[e.event_type],
+            )
+        return batch
+
+    def to_events(self) -> List[BookEvent]:
+        """Materialise BookEvent objects (slow path, for small batches)."""
+        cols = {name: col.tolist() for name, col in self.columns().items()}
+        return [
+            BookEvent(ts, SIDES[sd], px, pq, nq, EVENT_TYPES[et])
+            for ts, sd, px, pq, nq, et in zip(
+                cols["timestamp"], cols["side"], cols["price"],
+                cols["prev_qty"], cols["new_qty"], cols["event_type"],
+            )
+        ]
+
+    def to_polars(self):
+        import polars as pl
+
+        return pl.DataFrame(self.columns())
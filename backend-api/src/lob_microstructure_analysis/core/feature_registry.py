@@ -0,0 +1,70 @@
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# fn(book, values) -> value; ``values`` holds every dependency already computed
+FeatureFn = Callable[[Any, Dict[str, Any]], Any]
+
+
+class Feature(NamedTuple):
+    """One registered feature (or internal intermediate) and what it reads."""
+
+    name: str
+    fn: FeatureFn
+    deps: Tuple[str, ...]
+    public: bool
+
+
+class FeatureRegistry:
+    """
+    Named features with declared dependencies.
+
+    Features must be registered after their dependencies, so registration
+    order is a valid evaluation order. ``resolve`` returns the dependency
+    closure of the requested names in that order; only those functions run
+    per snapshot. Non-public entries are intermediates (e.g. pushing a
+    sample into a rolling window) that are never returned as columns.
+    """
+
+    def __init__(self) -> None:
+        self._features: Dict[str, Feature] = {}
+
+    def register(
+        self,
+        name: str,
+        fn: FeatureFn,
+        deps: Iterable[str] = (),
+        public: bool = True,
+    ) -> None:
+        if name in self._features:
+            raise ValueError(f"Feature already registered: {name}")
+        deps = tuple(deps)
+        unknown = [d for d in deps if d not in self._features]
+        if unknown:
+            raise ValueError(f"{name} depends on unregistered features: {unknown}")
+        self._features[name] = Feature(name, fn, deps, public)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._features
+
+    @property
+    def names(self) -> List[str]:
+        """Public feature names, in registration order."""
+        return [f.name for f in self._features.values() if f.public]
+
+    def closure(self, required: Iterable[str]) -> set:
+        """``required`` plus everything it transitively depends on."""
+        needed = set()
+        stack = list(required)
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            if name not in self._features:
+                raise KeyError(f"Unknown feature: {name}")
+            needed.add(name)
+            stack.extend(self._features[name].deps)
+        return needed
+
+    def resolve(self, required: Optional[Iterable[str]] = None) -> List[Feature]:
+        """Evaluation plan for ``required`` (default: every public feature)."""
+        needed = self.closure(self.names if required is None else required)
+        return [f for f in self._features.values() if f.name in needed]
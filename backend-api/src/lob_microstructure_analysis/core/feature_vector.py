@@ -0,0 +1,55 @@
+from typing import Dict, Iterable, Mapping, Sequence
+
+import numpy as np
+
+
+class FeatureVector:
+    """
+    Fixed-layout feature row backed by one preallocated float64 buffer.
+
+    The schema (column names and order) is fixed at construction, normally
+    from the loaded model's ``feature_names``. Producers write values in
+    place each snapshot; ``array`` is a (1, n) C-contiguous view that the
+    booster reads as is. ``as_dict`` builds a dict only for serialization.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.names = tuple(names)
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("FeatureVector names must be unique")
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        self._values = np.zeros((1, len(self.names)), dtype=np.float64)
+        # Writable flat view of the buffer (fast scalar stores)
+        self.cells = memoryview(self._values.reshape(-1))
+        # The buffer is never reallocated, so its address is stable
+        self.address: int = self._values.ctypes.data
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @property
+    def array(self) -> np.ndarray:
+        """The (1, n) buffer itself, not a copy."""
+        return self._values
+
+    def __getitem__(self, name: str) -> float:
+        return self.cells[self.index[name]]
+
+    def __setitem__(self, name: str, value: float) -> None:
+        self.cells[self.index[name]] = value
+
+    def slots(self, names: Iterable[str]) -> list:
+        """(position, name) for each of ``names`` in this schema."""
+        return [(self.index[name], name) for name in names if name in self.index]
+
+    def update(self, values: Mapping[str, float]) -> None:
+        """Write every value whose name is in the schema; others are ignored."""
+        cells, index = self.cells, self.index
+        for name, value in values.items():
+            i = index.get(name)
+            if i is not None:
+                cells[i] = value
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(zip(self.names, self._values[0].tolist()))
@@ -1,81 +1,158 @@
-from collections import deque
-from typing import Dict
-import math
-import heapq
+from typing import Dict, Iterable, Optional, Sequence
+
+from lob_microstructure_analysis.core.feature_registry import FeatureRegistry
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.rolling import MultiWindowStats
+
+# Trailing windows in snapshots (5 s, 30 s, 5 min at 1 s snapshots)
+DEFAULT_WINDOWS = (5, 30, 300)
+
+# Read before anything else; a one-sided book yields no features
+_INPUTS = ("best_bid", "best_ask")
 
 class FeatureComputer:
-    def __init__(self, depth: int = 10, window: int = 50) -> None:
+    """
+    Static book features plus rolling statistics over several windows.
+
+    ``window`` keeps the legacy unsuffixed columns (rolling_volatility,
+    rolling_imbalance_mean); every size in ``windows`` adds
+    ``rolling_volatility_{w}``, ``rolling_imbalance_mean_{w}`` and
+    ``rolling_mid_return_{w}`` (mid change across the window). All windows
+    share one ring per series.
+
+    Features live in a FeatureRegistry with their dependencies. If
+    ``features`` is given, only their dependency closure is evaluated per
+    snapshot (rolling series are only pushed when something reads them)
+    and only those columns are returned; by default every feature is.
+    """
+
+    def __init__(
+        self,
+        depth: int = 10,
+        window: int = 50,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        features: Optional[Iterable[str]] = None,
+    ) -> None:
         self.depth = depth
         self.window = window
+        self.windows = tuple(sorted(set(windows)))
+
+        # shared rolling windows (prefix sums, O(1) per snapshot)
+        self.mid_prices = MultiWindowStats(self.windows + (window,))
+        self.imbalances = MultiWindowStats(self.windows + (window,))
+
+        self.registry = self._build_registry()
+        if features is None:
+            self.names = self.registry.names
+        else:
+            features = set(features)
+            self.registry.closure(features)  # rejects unknown names
+            self.names = [name for name in self.registry.names if name in features]
+        self._plan = [
+            f for f in self.registry.resolve(self.names) if f.name not in _INPUTS
+        ]
+
+        # Scratch values reused every snapshot; vector slots per schema
+        self._values: Dict[str, float] = {}
+        self._slots: Dict[tuple, list] = {}
+
+    def _build_registry(self) -> FeatureRegistry:
+        reg = FeatureRegistry()
+        add = reg.register
+        mids, imbs = self.mid_prices, self.imbalances
+
+        add("best_bid", lambda book, v: book.best_bid())
+        add("best_ask", lambda book, v: book.best_ask())
+        add("spread", lambda book, v: v["best_ask"] - v["best_bid"], ("best_bid", "best_ask"))
+        add("mid_price", lambda book, v: (v["best_bid"] + v["best_ask"]) / 2, ("best_bid", "best_ask"))
+        # Top-N volumes come from the book's running depth aggregates
+        add("bid_volume_top_n", lambda book, v: book.top_depth.volume("bid", self.depth))
+        add("ask_volume_top_n", lambda book, v: book.top_depth.volume("ask", self.depth))
+        add("orderbook_imbalance", _imbalance, ("bid_volume_top_n", "ask_volume_top_n"))
+
+        # Rolling series: one push per snapshot, before any read
+        add("_mid_history", lambda book, v: mids.push(v["mid_price"]), ("mid_price",), public=False)
+        add("_imbalance_history", lambda book, v: imbs.push(v["orderbook_imbalance"]),
+            ("orderbook_imbalance",), public=False)
+
+        add("rolling_volatility", lambda book, v: mids.std(self.window), ("_mid_history",))
+        add("rolling_mid_return", _mid_return(mids, lambda: 1), ("mid_price", "_mid_history"))
+        add("rolling_imbalance_mean", lambda book, v: imbs.mean(self.window), ("_imbalance_history",))
+
+        for w in self.windows:
+            add(f"rolling_volatility_{w}", lambda book, v, w=w: mids.std(w), ("_mid_history",))
+            add(f"rolling_imbalance_mean_{w}", lambda book, v, w=w: imbs.mean(w), ("_imbalance_history",))
+            # oldest mid still inside the window
+            add(f"rolling_mid_return_{w}",
+                _mid_return(mids, lambda w=w: min(w, mids.count) - 1),
+                ("mid_price", "_mid_history"))
+        return reg
+
+    @property
+    def history(self) -> int:
+        """
+        Snapshots of rolling state. Both series re-anchor every ``history``
+        pushes, so a replay started a multiple of ``history`` snapshots into
+        a stream computes the same values as the full replay from its
+        ``history``-th snapshot on.
+        """
+        return self.mid_prices.size
+
+    def evaluate(self, book: OrderBook) -> bool:
+        """
+        Evaluate the selected features from the book's current state into
+        reusable scratch storage; False (nothing evaluated) if one-sided.
+        """
+        values = self._values
+        values["best_bid"] = book.best_bid()
+        values["best_ask"] = book.best_ask()
+        if values["best_bid"] is None or values["best_ask"] is None:
+            return False
+
+        for feature in self._plan:
+            values[feature.name] = feature.fn(book, values)
+        return True
+
+    def fill(self, vector: FeatureVector) -> None:
+        """Write the last evaluated values into ``vector`` (schema columns only)."""
+        slots = self._slots.get(vector.names)
+        if slots is None:
+            slots = self._slots[vector.names] = vector.slots(self.names)
+        values, cells = self._values, vector.cells
+        for i, name in slots:
+            cells[i] = values[name]
+
+    def compute(self, book: OrderBook) -> Dict[str, float]:
+        """
+        Compute the selected features from the book's current state.
+        """
+        if not self.evaluate(book):
+            return {}
+        return self.as_dict()
 
-        # rolling buffers
-        self.mid_prices = deque(maxlen=window)
-        self.imbalances = deque(maxlen=window)
+    def compute_into(self, book: OrderBook, vector: FeatureVector) -> bool:
+        """``evaluate`` then ``fill``, without building a dict."""
+        if not self.evaluate(book):
+            return False
+        self.fill(vector)
+        return True
 
-        # rolling volatility (Welford)
-        self._count = 0
-        self._mean = 0.0
-        self._m2 = 0.0
+    def as_dict(self) -> Dict[str, float]:
+        """The last evaluated values of the selected features."""
+        values = self._values
+        return {name: values[name] for name in self.names}
 
-    def compute(self, snapshot: Dict[str, Dict[float, float]]) -> Dict[str, float]:
-        bids = snapshot["bid"]
-        asks = snapshot["ask"]
 
-        if not bids or not asks:
-            return {}
+def _imbalance(book: OrderBook, v: Dict[str, float]) -> float:
+    bid_vol, ask_vol = v["bid_volume_top_n"], v["ask_volume_top_n"]
+    total = bid_vol + ask_vol
+    return (bid_vol - ask_vol) / total if total > 0 else 0.0
+
 
-        best_bid = next(iter(bids))
-        best_ask = next(iter(asks))
-
-
-        mid = (best_bid + best_ask) / 2
-        spread = best_ask - best_bid
-
-
-        top_bids = heapq.nlargest(self.depth, bids.items(), key=lambda x: x[0])
-        top_asks = heapq.nsmallest(self.depth, asks.items(), key=lambda x: x[0])
-
-        bid_vol = sum(q for _, q in top_bids)
-        ask_vol = sum(q for _, q in top_asks)
-
-        imbalance = (
-            (bid_vol - ask_vol) / (bid_vol + ask_vol)
-            if (bid_vol + ask_vol) > 0
-            else 0.0
-        )
-
-        # update rolling buffers
-        self.mid_prices.append(mid)
-        self.imbalances.append(imbalance)
-
-        # rolling volatility (incremental)
-        self._count += 1
-        if self._count > self.window:
-            self._count = self.window
-        delta = mid - self._mean
-        self._mean += delta / self._count
-        delta2 = mid - self._mean
-        self._m2 += delta * delta2
-
-        volatility = (
-            math.sqrt(self._m2 / (self._count - 1))
-            if self._count > 1
-            else 0.0
-        )
-
-        return {
-            "best_bid": best_bid,
-            "best_ask": best_ask,
-            "spread": spread,
-            "mid_price": mid,
-            "bid_volume_top_n": bid_vol,
-            "ask_volume_top_n": ask_vol,
-            "orderbook_imbalance": imbalance,
-            "rolling_volatility": volatility,
-            "rolling_mid_return": (
-                self.mid_prices[-1] - self.mid_prices[-2]
-                if len(self.mid_prices) > 1
-                else 0.0
-            ),
-            "rolling_imbalance_mean": sum(self.imbalances) / len(self.imbalances),
-        }
+def _mid_return(mids: MultiWindowStats, lag):
+    """Mid change since ``lag()`` snapshots ago (0.0 before there is one)."""
+    def fn(book: OrderBook, v: Dict[str, float]) -> float:
+        start = mids.lag(lag())
+        return v["mid_price"] - start if start is not None else 0.0
+    return fn
@@ -0,0 +1,106 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.events import BID, EVENT_TYPES, SIDES, EventBatch
+
+# Column order of the per-bucket count / volume vectors: side * 3 + event_type
+_KEYS = [(side, etype.value) for side in SIDES for etype in EVENT_TYPES]
+
+# (bid add, bid cancel, ask add, ask cancel) positions in those vectors
+_RATIO_COLUMNS = [0, 1, 3, 4]
+
+
+class _WindowSum:
+    """Sum of the last ``size`` pushed rows, kept in a ring (O(1) per push)."""
+
+    def __init__(self, size: int, width: int) -> None:
+        self._rows = np.zeros((size, width), dtype=np.int64)
+        self._pos = 0
+        self.total = np.zeros(width, dtype=np.int64)
+
+    def push(self, row: np.ndarray) -> None:
+        self.total += row - self._rows[self._pos]
+        self._rows[self._pos] = row
+        self._pos = (self._pos + 1) % len(self._rows)
+
+
+class OrderFlowFeatures:
+    """
+    Event-conditioned features, updated once per bucket from its events.
+
+    - ofi_best / ofi_top_n: order-flow imbalance. Signed quantity change
+      (bid +, ask -) of events at or inside the previous bucket's best
+      level / ``depth``-th level, i.e. the event form of Cont et al. OFI.
+    - {side}_{add,cancel,modify}_{count,volume}: per-bucket event counts and
+      absolute quantity changes.
+    - cancel_add_ratio_{side}_{w}: cancels / adds over the last ``w``
+      buckets, from ring-buffered window sums.
+
+    Each event is touched once (vectorised over the batch); window updates
+    are O(1) per bucket.
+    """
+
+    def __init__(self, depth: int = 10, windows: Sequence[int] = (10, 60)) -> None:
+        self.depth = depth
+        self.windows = tuple(windows)
+        self._sums = {w: _WindowSum(w, len(_RATIO_COLUMNS)) for w in self.windows}
+
+        # (best bid, best ask, depth-th bid, depth-th ask) of the last view
+        self._bounds: Optional[Tuple[float, float, float, float]] = None
+
+    @property
+    def names(self) -> List[str]:
+        """Feature columns ``update`` returns, in order."""
+        names = ["ofi_best", "ofi_top_n"]
+        for side, etype in _KEYS:
+            names += [f"{side}_{etype}_count", f"{side}_{etype}_volume"]
+        for w in self.windows:
+            names += [f"cancel_add_ratio_bid_{w}", f"cancel_add_ratio_ask_{w}"]
+        return names
+
+    def update(self, events: EventBatch, view: BookView) -> Dict[str, float]:
+        """Fold in one bucket of events; ``view`` is the book after them."""
+        cols = events.columns()
+        side = cols["side"]
+        price = cols["price"]
+        delta = cols["new_qty"] - cols["prev_qty"]
+
+        key = side.astype(np.intp) * len(EVENT_TYPES) + cols["event_type"]
+        counts = np.bincount(key, minlength=len(_KEYS))
+        volumes = np.bincount(key, weights=np.abs(delta), minlength=len(_KEYS))
+
+        ofi_best = ofi_top = 0.0
+        if self._bounds is not None and len(events):
+            best_bid, best_ask, nth_bid, nth_ask = self._bounds
+            is_bid = side == BID
+            signed = np.where(is_bid, delta, -delta)
+            at_best = np.where(is_bid, price >= best_bid, price <= best_ask)
+            in_top = np.where(is_bid, price >= nth_bid, price <= nth_ask)
+            ofi_best = float(signed[at_best].sum())
+            ofi_top = float(signed[in_top].sum())
+        self._bounds = self._boundaries(view)
+
+        features = {"ofi_best": ofi_best, "ofi_top_n": ofi_top}
+        for (side_name, etype), count, volume in zip(_KEYS, counts.tolist(), volumes.tolist()):
+            features[f"{side_name}_{etype}_count"] = float(count)
+            features[f"{side_name}_{etype}_volume"] = volume
+
+        row = counts[_RATIO_COLUMNS]
+        for w, window in self._sums.items():
+            window.push(row)
+            bid_add, bid_cancel, ask_add, ask_cancel = window.total.tolist()
+            features[f"cancel_add_ratio_bid_{w}"] = bid_cancel / bid_add if bid_add else 0.0
+            features[f"cancel_add_ratio_ask_{w}"] = ask_cancel / ask_add if ask_add else 0.0
+
+        return features
+
+    def _boundaries(self, view: BookView) -> Tuple[float, float, float, float]:
+        # An empty side admits every event; a short side uses its last level
+        bids, asks = view.bid_prices, view.ask_prices
+        best_bid = float(bids[0]) if len(bids) else -np.inf
+        best_ask = float(asks[0]) if len(asks) else np.inf
+        nth_bid = float(bids[: self.depth][-1]) if len(bids) else -np.inf
+        nth_ask = float(asks[: self.depth][-1]) if len(asks) else np.inf
+        return best_bid, best_ask, nth_bid, nth_ask
@@ -1,7 +1,13 @@
 from sortedcontainers import SortedDict
-from typing import Dict, List, Optional, Tuple
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
 import heapq
 
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.depth import DepthAggregates
+from lob_microstructure_analysis.core.event_buffer import EventRingBuffer
+from lob_microstructure_analysis.core.events import ADD, ASK, BID, CANCEL, MODIFY, SIDE_CODES
+
 Price = float
 Quantity = float
 Side = str  # "bid" | "ask"
@@ -10,10 +16,16 @@ Side = str  # "bid" | "ask"
 class OrderBook:
     """
     In-memory Level-2 order book.
-    Maintains aggregated quantities per price level.
+    Maintains aggregated quantities per price level, plus running
+    top-``top_n`` depth aggregates (``top_depth``). ``version`` increases
+    on every mutation; ``view()`` hands out one immutable BookView per
+    version.
+
+    If ``event_buffer`` is set, every level change (including depth trims
+    and crossed-book cleanup) is written into it as one event row.
     """
 
-    def __init__(self, max_depth: int = 50) -> None:
+    def __init__(self, max_depth: int = 50, top_n: int = 10) -> None:
         self.max_depth = max_depth
 
         # Bids sorted descending
@@ -22,6 +34,13 @@ class OrderBook:
         # Asks sorted ascending
         self.asks: SortedDict[Price, Quantity] = SortedDict()
 
+        self.top_depth = DepthAggregates(top_n, self._levels_slice)
+
+        self.version = 0
+        self._view: Optional[BookView] = None
+
+        self.event_buffer: Optional[EventRingBuffer] = None
+
     def _book(self, side: Side) -> SortedDict:
         if side == "bid":
             return self.bids
@@ -29,32 +48,180 @@ class OrderBook:
             return self.asks
         raise ValueError(f"Invalid side: {side}")
 
-    def update_level(self, side: Side, price: Price, quantity: Quantity) -> None:
+    def update_level(
+        self,
+        side: Side,
+        price: Price,
+        quantity: Quantity,
+        timestamp: int = 0,
+    ) -> None:
         """
         Add, update, or remove a price level.
         quantity <= 0 implies removal.
+        ``timestamp`` (ms) only stamps emitted events.
         """
         book = self._book(side)
+        self.version += 1
+        events = self.event_buffer
 
         if quantity <= 0:
-            book.pop(price, None)
+            prev = book.pop(price, None)
+            changed = prev is not None
+            if changed and events is not None:
+                events.append(
+                    timestamp, SIDE_CODES[side], price, prev, 0.0, CANCEL
+                )
         else:
+            if events is not None:
+                prev = book.get(price)
+                if prev is None:
+                    events.append(
+                        timestamp, SIDE_CODES[side], price, 0.0, quantity, ADD
+                    )
+                elif prev != quantity:
+                    events.append(
+                        timestamp, SIDE_CODES[side], price, prev, quantity, MODIFY
+                    )
             book[price] = quantity
+            changed = True
+
+        if changed and self.top_depth.dirty[side]:
+            self.top_depth.touch(side, book.bisect_left(price))
+
+        self._enforce_depth(book, side, timestamp)
+        self._sanitize_crossed_book(timestamp)
+
+    def apply_batch(
+        self,
+        sides: Sequence[Side],
+        prices: Sequence[Price],
+        quantities: Sequence[Quantity],
+        timestamps: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Apply a whole message (or bucket) of level updates in order.
+
+        Produces the same book (and events) as calling update_level once per
+        level, but the depth and crossed-book rules run against best prices
+        cached for the batch instead of re-reading both sides after every
+        level.
+        """
+        sides, prices, quantities = _as_lists(sides, prices, quantities)
+        if timestamps is None:
+            timestamps = repeat(0)
+        else:
+            timestamps = _as_lists(timestamps)[0]
+        self.version += 1
+
+        emit = self.event_buffer.append if self.event_buffer is not None else None
+
+        bids = self.bids
+        asks = self.asks
+        max_depth = self.max_depth
+
+        best_bid = bids.keys()[0] if bids else None
+        best_ask = asks.keys()[0] if asks else None
 
-        self._enforce_depth(book)
-        self._sanitize_crossed_book()
+        # Lowest top-N rank touched per side (see DepthAggregates)
+        dirty = self.top_depth.dirty
+        dirty_bid = dirty["bid"]
+        dirty_ask = dirty["ask"]
 
-    def _enforce_depth(self, book: SortedDict) -> None:
+        try:
+            for side, price, quantity, ts in zip(sides, prices, quantities, timestamps):
+                if side == "bid":
+                    if quantity <= 0:
+                        prev = bids.pop(price, None)
+                        if prev is not None:
+                            if emit is not None:
+                                emit(ts, BID, price, prev, 0.0, CANCEL)
+                            if dirty_bid:
+                                dirty_bid = min(dirty_bid, bids.bisect_left(price))
+                            if price == best_bid:
+                                best_bid = bids.keys()[0] if bids else None
+                    else:
+                        if emit is not None:
+                            prev = bids.get(price)
+                            if prev is None:
+                                emit(ts, BID, price, 0.0, quantity, ADD)
+                            elif prev != quantity:
+                                emit(ts, BID, price, prev, quantity, MODIFY)
+                        bids[price] = quantity
+                        if dirty_bid:
+                            dirty_bid = min(dirty_bid, bids.bisect_left(price))
+                        if best_bid is None or price > best_bid:
+                            best_bid = price
+                        while len(bids) > max_depth:
+                            trimmed, prev = bids.popitem(index=-1)
+                            if emit is not None:
+                                emit(ts, BID, trimmed, prev, 0.0, CANCEL)
+                            dirty_bid = min(dirty_bid, len(bids))
+                            if not bids:
+                                best_bid = None
+                elif side == "ask":
+                    if quantity <= 0:
+                        prev = asks.pop(price, None)
+                        if prev is not None:
+                            if emit is not None:
+                                emit(ts, ASK, price, prev, 0.0, CANCEL)
+                            if dirty_ask:
+                                dirty_ask = min(dirty_ask, asks.bisect_left(price))
+                            if price == best_ask:
+                                best_ask = asks.keys()[0] if asks else None
+                    else:
+                        if emit is not None:
+                            prev = asks.get(price)
+                            if prev is None:
+                                emit(ts, ASK, price, 0.0, quantity, ADD)
+                            elif prev != quantity:
+                                emit(ts, ASK, price, prev, quantity, MODIFY)
+                        asks[price] = quantity
+                        if dirty_ask:
+                            dirty_ask = min(dirty_ask, asks.bisect_left(price))
+                        if best_ask is None or price < best_ask:
+                            best_ask = price
+                        while len(asks) > max_depth:
+                            trimmed, prev = asks.popitem(index=-1)
+                            if emit is not None:
+                                emit(ts, ASK, trimmed, prev, 0.0, CANCEL)
+                            dirty_ask = min(dirty_ask, len(asks))
+                            if not asks:
+                                best_ask = None
+                else:
+                    raise ValueError(f"Invalid side: {side}")
+
+                if best_bid is not None and best_ask is not None and best_bid >= best_ask:
+                    # Same safeguard as _sanitize_crossed_book
+                    crossed, prev = asks.popitem(index=0)
+                    if emit is not None:
+                        emit(ts, ASK, crossed, prev, 0.0, CANCEL)
+                    dirty_ask = 0
+                    best_ask = asks.keys()[0] if asks else None
+        finally:
+            dirty["bid"] = dirty_bid
+            dirty["ask"] = dirty_ask
+
+    def _enforce_depth(self, book: SortedDict, side: Side, timestamp: int = 0) -> None:
         while len(book) > self.max_depth:
-            book.popitem(index=-1)
+            price, prev = book.popitem(index=-1)
+            self.top_depth.touch(side, len(book))
+            if self.event_buffer is not None:
+                self.event_buffer.append(
+                    timestamp, SIDE_CODES[side], price, prev, 0.0, CANCEL
+                )
 
-    def _sanitize_crossed_book(self) -> None:
+    def _sanitize_crossed_book(self, timestamp: int = 0) -> None:
         if not self.bids or not self.asks:
             return
 
         if self.best_bid() >= self.best_ask():
             # Data corruption safeguard: drop weakest ask
-            self.asks.popitem(index=0)
+            price, prev = self.asks.popitem(index=0)
+            self.top_depth.touch("ask", 0)
+            if self.event_buffer is not None:
+                self.event_buffer.append(
+                    timestamp, ASK, price, prev, 0.0, CANCEL
+                )
 
     def best_bid(self) -> Optional[Price]:
         return next(iter(self.bids), None)
@@ -87,6 +254,23 @@ class OrderBook:
         "bid": dict(self.bids),
         "ask": dict(self.asks),
     }
+    def view(self) -> BookView:
+        """
+        Immutable view of the current book, cached per version.
+        Cheaper than snapshot(): compact arrays, built at most once per change.
+        """
+        view = self._view
+        if view is None or view.version != self.version:
+            bids = self.bids
+            asks = self.asks
+            view = BookView.from_levels(
+                self.version,
+                (bids.keys(), bids.values(), len(bids)),
+                (asks.keys(), asks.values(), len(asks)),
+            )
+            self._view = view
+        return view
+
     def midprice(self) -> Optional[float]:
         bid = self.best_bid()
         ask = self.best_ask()
@@ -95,6 +279,56 @@ class OrderBook:
         return (bid + ask) / 2
 
 
+    def _levels_slice(self, side: Side, start: int, stop: int) -> List[Tuple[Price, Quantity]]:
+        return self._book(side).items()[start:stop]
+
     def reset(self) -> None:
         self.bids.clear()
         self.asks.clear()
+        self.top_depth.invalidate()
+        self.version += 1
+
+    def load(
+        self,
+        sides: Sequence[Side],
+        prices: Sequence[Price],
+        quantities: Sequence[Quantity],
+    ) -> bool:
+        """
+        Replace the book with ``reset()`` + ``apply_batch(rows)``, in bulk.
+
+        Only the last write per level matters when no row could trigger a
+        depth trim or crossed-book cleanup: each side has at most
+        ``max_depth`` distinct prices and every bid price is below every
+        ask price. Otherwise (or with an event buffer attached) returns
+        False and leaves the book untouched.
+        """
+        if self.event_buffer is not None:
+            return False
+
+        bid_levels: Dict[Price, Quantity] = {}
+        ask_levels: Dict[Price, Quantity] = {}
+        for side, price, quantity in zip(*_as_lists(sides, prices, quantities)):
+            if side == "bid":
+                bid_levels[price] = quantity
+            elif side == "ask":
+                ask_levels[price] = quantity
+            else:
+                raise ValueError(f"Invalid side: {side}")
+
+        if len(bid_levels) > self.max_depth or len(ask_levels) > self.max_depth:
+            return False
+        if bid_levels and ask_levels and max(bid_levels) >= min(ask_levels):
+            return False
+
+        self.reset()
+        self.bids.update((p, q) for p, q in bid_levels.items() if q > 0)
+        self.asks.update((p, q) for p, q in ask_levels.items() if q > 0)
+        return True
+
+
+def _as_lists(*columns: Sequence) -> Tuple[Sequence, ...]:
+    """NumPy columns iterate as boxed scalars; convert them to plain lists."""
+    return tuple(
+        col.tolist() if hasattr(col, "tolist") else col for col in columns
+    )
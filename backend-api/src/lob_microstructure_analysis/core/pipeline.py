@@ -0,0 +1,144 @@
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from lob_microstructure_analysis.utils.latency import LatencyHistogram
+
+# fn(ctx) -> None, or False to end the bucket without a snapshot
+StageFn = Callable[["BucketContext"], Optional[bool]]
+
+# hook(stage name, elapsed ns), called after every timed stage run
+StageHook = Callable[[str, int], None]
+
+
+class Stage(NamedTuple):
+    """One per-bucket step and the BucketContext fields it reads / writes."""
+
+    name: str
+    fn: StageFn
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+class BucketContext:
+    """
+    Working state of one bucket as it moves through the stages.
+
+    ``rows`` and ``timestamp`` are set before the first stage; every other
+    field is None until a stage outputs it.
+    """
+
+    __slots__ = (
+        "rows", "timestamp", "view", "events", "flow_features",
+        "features", "labels",
+    )
+
+    INITIAL = ("rows", "timestamp")
+
+    def __init__(self, rows: Any, timestamp: int) -> None:
+        self.rows = rows
+        self.timestamp = timestamp
+        self.view = None
+        self.events = None
+        self.flow_features = None
+        self.features = None
+        self.labels = None
+
+
+class StageStats:
+    """Call count and, with timing on, run time of one stage."""
+
+    __slots__ = ("calls", "total_ns", "histogram")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total_ns = 0
+        self.histogram = LatencyHistogram(max_us=10_000_000)  # µs
+
+    def record(self, elapsed_ns: int) -> None:
+        self.calls += 1
+        self.total_ns += elapsed_ns
+        self.histogram.record(elapsed_ns // 1000)
+
+    def summary(self) -> Dict[str, float]:
+        p50, p99 = self.histogram.percentiles((50, 99))
+        timed = self.histogram.count
+        return {
+            "calls": self.calls,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us": self.total_ns / timed / 1000 if timed else 0.0,
+            "p50_us": float(p50),
+            "p99_us": float(p99),
+        }
+
+
+class StagePipeline:
+    """
+    Ordered per-bucket stages with declared inputs and outputs.
+
+    Construction checks that every input is produced by an earlier stage
+    (or is a BucketContext initial field) and that ``required`` outputs
+    are produced, so stages can be dropped or reordered only when nothing
+    downstream depends on them. ``run`` stops at the first stage that
+    returns False.
+
+    Calls are always counted. With ``timing`` on, each run is also timed
+    into a histogram and passed to ``hooks`` (e.g. a metrics exporter).
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        required: Sequence[str] = (),
+        timing: bool = False,
+    ) -> None:
+        self.stages: List[Stage] = list(stages)
+        self.timing = timing
+        self.hooks: List[StageHook] = []
+
+        available = set(BucketContext.INITIAL)
+        for stage in self.stages:
+            missing = [name for name in stage.inputs if name not in available]
+            if missing:
+                raise ValueError(
+                    f"Stage {stage.name} needs {missing}, which no earlier stage produces"
+                )
+            available.update(stage.outputs)
+        missing = [name for name in required if name not in available]
+        if missing:
+            raise ValueError(f"No stage produces {missing}")
+
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names: {names}")
+
+        self.stats: Dict[str, StageStats] = {name: StageStats() for name in names}
+        self._plan = [(stage.name, stage.fn, self.stats[stage.name]) for stage in self.stages]
+
+    @property
+    def names(self) -> List[str]:
+        return [stage.name for stage in self.stages]
+
+    def run(self, ctx: BucketContext) -> bool:
+        """Run every stage on ``ctx``; False if one ended the bucket."""
+        if not self.timing:
+            for _, fn, stats in self._plan:
+                stats.calls += 1
+                if fn(ctx) is False:
+                    return False
+            return True
+
+        hooks = self.hooks
+        for name, fn, stats in self._plan:
+            start = perf_counter_ns()
+            done = fn(ctx)
+            elapsed = perf_counter_ns() - start
+            stats.record(elapsed)
+            for hook in hooks:
+                hook(name, elapsed)
+            if done is False:
+                return False
+        return True
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-stage call counts and timings, in pipeline order."""
+        return {name: stats.summary() for name, stats in self.stats.items()}
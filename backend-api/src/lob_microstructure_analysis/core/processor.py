@@ -1,22 +1,47 @@
 # src/lob_microstructure_analysis/core/processor.py
 
 import asyncio
-from typing import Optional, List
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import structlog
 
 from lob_microstructure_analysis.core.orderbook import OrderBook
-from lob_microstructure_analysis.ingestion.types import L2Update
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.coalesce import LevelCoalescer
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch, to_ms
 from lob_microstructure_analysis.core.event_inference import EventInferenceEngine
+from lob_microstructure_analysis.core.event_buffer import EventRingBuffer
+from lob_microstructure_analysis.core.event_log import EventLogWriter
+from lob_microstructure_analysis.core.events import EventBatch
 from lob_microstructure_analysis.core.features import FeatureComputer
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+from lob_microstructure_analysis.core.order_flow import OrderFlowFeatures
+from lob_microstructure_analysis.core.pipeline import BucketContext, Stage, StagePipeline
+from lob_microstructure_analysis.core.snapshot_bus import SnapshotBus, SnapshotResult
 from lob_microstructure_analysis.ml.labeling import LabelGenerator
 from lob_microstructure_analysis.ml.feature_store import FeatureStore
 from lob_microstructure_analysis.context.price_context import PriceContextEngine
+from lob_microstructure_analysis.utils.latency import LatencyRecorder, stamp
 from pathlib import Path
 
 log = structlog.get_logger()
 
 SNAPSHOT_INTERVAL_MS = 1000  # 1 second snapshots
 
+# 'interval': fixed time buckets of snapshot_interval_ms (e.g. 1000, 100)
+# 'message':  one snapshot per depth message (rows sharing an update_id)
+SNAPSHOT_MODES = {"interval", "message"}
+
+# Per-bucket stages, in order (see OrderBookProcessor._builtin_stages)
+DEFAULT_STAGES = (
+    "book",           # apply the rows, take a BookView
+    "events",         # diff / drain events, event log
+    "order_flow",     # order-flow features (skipped when none requested)
+    "features",       # book features, feature vector; ends one-sided buckets
+    "price_context",  # Prophet price context
+    "labels",         # delayed labels for the feature store
+    "store",          # feature store record
+)
+
 
 class OrderBookProcessor:
     """
@@ -25,6 +50,61 @@ class OrderBookProcessor:
     Modes:
     - replay: snapshot-based datasets (order book RESET every snapshot)
     - live:   delta-based streams (continuous order book state)
+
+    Snapshot modes:
+    - interval: one snapshot per ``snapshot_interval_ms`` time bucket
+                (1000 ms default; 100 ms matches Binance's fast stream)
+    - message:  one snapshot per depth message, i.e. per run of rows with
+                the same ``update_id``, stamped with its event time
+
+    Rolling feature windows count snapshots, so their span in time scales
+    with the snapshot rate.
+
+    Event modes:
+    - diff:   infer events by diffing consecutive bucket views
+    - stream: the book emits events as each update is applied (live only);
+              they are drained from a bounded ring buffer per bucket
+
+    If ``event_log_path`` is given, each bucket's events are appended to a
+    Parquet / Arrow IPC event log (see EventLogWriter).
+
+    ``features`` restricts per-snapshot computation to the named features
+    (plus their dependencies), e.g. what the loaded model and the API need.
+    Order-flow features are skipped entirely when none are requested.
+    Default: every feature (replay / training datasets).
+
+    If ``feature_vector`` is given (e.g. ``Predictor.new_vector()``), it is
+    filled in place every snapshot for zero-copy inference; its columns are
+    added to ``features``.
+
+    Each bucket runs through ``stages`` (DEFAULT_STAGES; a StagePipeline
+    checks that every stage's inputs come from an earlier one). Names pick
+    built-in stages and Stage objects add custom ones, so a deployment can
+    drop what it does not need, e.g. ``events`` and ``price_context``
+    (no order-flow features) or ``labels`` and ``store`` (live inference
+    only). Calls per stage are always counted; ``stage_timing`` also times
+    them (``pipeline.summary()``, ``pipeline.hooks``).
+
+    ``coalesce`` (live, diff events) folds each bucket's rows into their
+    net level changes as they arrive (LevelCoalescer) instead of holding
+    them until the bucket closes; the book ends each bucket exactly as
+    before. It pays off with deep books (``max_depth`` rarely reached);
+    a shallow full book trims on most new levels and coalesces little.
+
+    Each emitted bucket is computed once into a SnapshotResult and
+    published on ``bus``; consumers such as the API's predictor and
+    WebSocket broadcaster subscribe instead of recomputing features.
+
+    A ``snapshot`` batch (live depth resync) replaces the book: the
+    bucket's earlier rows are dropped and the book is rebuilt from the
+    snapshot and the rows after it. Rolling features, labels and views
+    carry on. In message mode the snapshot stays pending until the next
+    batch, so it shares a row with a bridging diff of the same update ID.
+
+    Batches carrying a latency ``trace`` (live streams) are stamped at
+    dequeue, once applied and once features are done; subscribers add
+    their own stages, and ``run`` records the finished trace in
+    ``latency`` after they return.
     """
 
     def __init__(
@@ -32,171 +112,421 @@ class OrderBookProcessor:
         orderbook: OrderBook,
         mode: str = "live",              # 'live' | 'replay'
         snapshot_interval_ms: int = SNAPSHOT_INTERVAL_MS,
+        snapshot_mode: str = "interval",  # 'interval' | 'message'
         label_horizon_ms: int = 5000,
+        event_mode: str = "diff",        # 'diff' | 'stream'
+        event_buffer_size: int = 100_000,
+        event_log_path: Optional[Path] = None,
+        features: Optional[Iterable[str]] = None,
+        feature_vector: Optional[FeatureVector] = None,
+        stages: Iterable[Union[str, Stage]] = DEFAULT_STAGES,
+        stage_timing: bool = False,
+        coalesce: bool = False,
     ) -> None:
         self.orderbook = orderbook
         self.mode = mode.lower()
         self.snapshot_interval_ms = snapshot_interval_ms
+        self.snapshot_mode = snapshot_mode.lower()
+        self.event_mode = event_mode.lower()
 
         if self.mode not in {"live", "replay"}:
             raise ValueError("mode must be 'live' or 'replay'")
 
+        if self.snapshot_mode not in SNAPSHOT_MODES:
+            raise ValueError("snapshot_mode must be 'interval' or 'message'")
+
+        if self.snapshot_interval_ms <= 0:
+            raise ValueError("snapshot_interval_ms must be positive")
+
+        if self.event_mode not in {"diff", "stream"}:
+            raise ValueError("event_mode must be 'diff' or 'stream'")
+
+        if self.event_mode == "stream" and self.mode == "replay":
+            # Replay resets the book every bucket; there is no delta stream
+            raise ValueError("event_mode 'stream' requires mode 'live'")
+
+        if coalesce and (self.mode != "live" or self.event_mode != "diff"):
+            # Replay buckets are full reconstructions; stream events need every row
+            raise ValueError("coalesce requires mode 'live' and event_mode 'diff'")
+
         # --- Snapshot state ---
         self.current_bucket: Optional[int] = None
-        self.snapshot_rows: List[L2Update] = []
+        self.pending = UpdateBatch()      # rows of the current bucket
+        # Coalescing: rows go to the coalescer, pending keeps the newest
+        self.coalescer = LevelCoalescer(orderbook) if coalesce else None
+        self._reset_book = False          # a snapshot batch is pending
 
         # --- Phase 3 ---
-        self.prev_snapshot = None
+        # Immutable versioned views; prev is kept only for diffing
+        self.prev_view: Optional[BookView] = None
+        self.latest_view: Optional[BookView] = None
         self.event_engine = EventInferenceEngine()
 
+        # Events of the last emitted bucket (either event mode)
+        self.last_events = EventBatch(capacity=0)
+        self.event_buffer: Optional[EventRingBuffer] = None
+        if self.event_mode == "stream":
+            self.event_buffer = EventRingBuffer(capacity=event_buffer_size)
+            self.orderbook.event_buffer = self.event_buffer
+
+        self.event_log: Optional[EventLogWriter] = None
+        if event_log_path is not None:
+            self.event_log = EventLogWriter(event_log_path)
+
         # --- Phase 4 ---
-        self.feature_computer = FeatureComputer(depth=10)
+        self.feature_vector = feature_vector
+        if features is not None and feature_vector is not None:
+            features = set(features) | set(feature_vector.names)
+
+        order_flow = OrderFlowFeatures(depth=10)
+        book_features = None
+        self.order_flow: Optional[OrderFlowFeatures] = order_flow
+        if features is not None:
+            features = set(features)
+            flow_names = features.intersection(order_flow.names)
+            # Labels and price context always read the mid
+            book_features = (features - flow_names) | {"mid_price"}
+            if not flow_names:
+                self.order_flow = None
+        self.feature_computer = FeatureComputer(depth=10, features=book_features)
 
         # --- Phase 5 ---
         self.label_generator = LabelGenerator(horizon_ms=label_horizon_ms, flat_threshold_bps=0.3)
         self.feature_store = FeatureStore()
 
+        # --- Snapshot bus ---
+        self.bus = SnapshotBus()
+
         # --- Stats ---
         self.updates_processed = 0
         self.snapshots_emitted = 0
+        self.latency = LatencyRecorder()
 
         # --- Price context (Prophet) ---
         self.price_context = PriceContextEngine(
             model_path=Path("models/price_prediction/prophet_midprice_15m.pkl")
 )
 
+        self.pipeline = self._build_pipeline(stages, stage_timing)
 
         log.info(
             "processor_initialized",
             mode=self.mode,
             snapshot_interval_ms=snapshot_interval_ms,
+            snapshot_mode=self.snapshot_mode,
             label_horizon_ms=label_horizon_ms,
+            stages=self.pipeline.names,
         )
 
     async def run(self, queue: asyncio.Queue) -> None:
         """
         Main consumer loop.
-        Reads L2Update objects from queue and processes time-bucketed snapshots.
+        Reads UpdateBatch (or single L2Update) items from queue and processes
+        bucketed snapshots (time buckets or depth messages, see
+        ``snapshot_mode``). ``None`` marks the end of the stream.
         """
         while True:
-            update = await queue.get()
+            item = await queue.get()
 
             # End-of-stream signal
-            if update is None:
-                if self.snapshot_rows:
-                    self._apply_snapshot(self.snapshot_rows)
+            if item is None:
+                for result in self.drain():
+                    await self.publish(result)
                 queue.task_done()
                 break
 
-            self.updates_processed += 1
-
-            # --- Normalize timestamp to milliseconds ---
-            # Live WS timestamps: ms
-            # Dataset timestamps: often µs
-            # Binance timestamps are in milliseconds (~1e12)
-            # Dataset timestamps may be in microseconds (~1e15)
-            if update.timestamp > 10_000_000_000_000:
-                timestamp_ms = update.timestamp // 1_000   # µs → ms
+            # Results are published one at a time: the next bucket is
+            # only applied once subscribers are done with this one
+            if isinstance(item, UpdateBatch):
+                stamp(item.trace, "dequeue")
+                results = self.feed(item)
             else:
-                timestamp_ms = update.timestamp             # already ms
-
+                results = self.feed_update(item)
+            for result in results:
+                await self.publish(result)
+            queue.task_done()
 
-            # --- Time bucket ---
-            bucket = timestamp_ms // self.snapshot_interval_ms
+    async def publish(self, result: SnapshotResult) -> None:
+        """Publish on the bus, then record the result's latency trace."""
+        await self.bus.publish(result)
+        if result.trace is not None:
+            self.latency.record(result.trace)
+
+    def _bucket_of(self, timestamp: int, update_id: int) -> int:
+        """Bucket key: depth message, or time bucket of the ms timestamp."""
+        if self.snapshot_mode == "message":
+            return update_id
+        return to_ms(timestamp) // self.snapshot_interval_ms
+
+    def feed_update(self, update: L2Update) -> Iterator[SnapshotResult]:
+        """Add one row; yields the previous bucket's result if it closed."""
+        self.updates_processed += 1
+        bucket = self._bucket_of(update.timestamp, update.update_id)
+
+        if self.current_bucket is None:
+            self.current_bucket = bucket
+
+        # --- Emit snapshot when bucket changes ---
+        if bucket != self.current_bucket:
+            yield from self.drain()
+            self.current_bucket = bucket
+
+        if self.coalescer is not None:
+            self._hold(UpdateBatch.from_updates([update]), 0, 1)
+        else:
+            self.pending.append(update)
+
+    def feed(self, batch: UpdateBatch) -> Iterator[SnapshotResult]:
+        """
+        Add a batch; yields a result for each bucket it closes. Batches are
+        time ordered, so one whose first and last rows share a bucket is a
+        single run; otherwise it is split at bucket boundaries.
 
+        Synchronous (no event loop) and lazy: nothing is applied until the
+        generator is iterated. ``run`` publishes what it yields;
+        ReplayEngine drives it directly.
+        """
+        n = len(batch)
+        if not n:
+            return
+        self.updates_processed += n
+        ts, ids = batch.timestamps, batch.update_ids
+
+        first = self._bucket_of(ts[0], ids[0])
+        if first == self._bucket_of(ts[-1], ids[-1]):
+            runs = [(first, 0, n)]
+        else:
+            runs = []
+            start = 0
+            for i in range(1, n):
+                bucket = self._bucket_of(ts[i], ids[i])
+                if bucket != first:
+                    runs.append((first, start, i))
+                    first, start = bucket, i
+            runs.append((first, start, n))
+
+        for bucket, start, stop in runs:
             if self.current_bucket is None:
                 self.current_bucket = bucket
-
-            # --- Emit snapshot when bucket changes ---
             if bucket != self.current_bucket:
-                self._apply_snapshot(self.snapshot_rows)
-                self.snapshot_rows = []
+                yield from self.drain()
                 self.current_bucket = bucket
-
-            self.snapshot_rows.append(update)
-            queue.task_done()
-
-    def _apply_snapshot(self, rows: List[L2Update]) -> None:
-        """
-        Apply one snapshot worth of updates.
-        """
-        if not rows:
-            return
-
-        # --- Replay semantics ---
-        # Dataset snapshots are full reconstructions → reset book
-        if self.mode == "replay":
+            if batch.snapshot:
+                self._replace_book()
+            if self.coalescer is not None:
+                self._hold(batch, start, stop)
+            else:
+                self.pending.extend(batch, start, stop)
+
+        # Batches never split a message: the last one is already complete,
+        # except a snapshot, which its bridging diff (same update ID) completes
+        if self.snapshot_mode == "message" and not batch.snapshot:
+            yield from self.drain()
+
+    def _replace_book(self) -> None:
+        """A full book follows: this bucket's rows so far are superseded."""
+        self.pending.clear()
+        if self.coalescer is not None:
+            # Segments already reached the book
             self.orderbook.reset()
-
-        # --- Apply L2 updates (delta semantics) ---
-        for u in rows:
-            # quantity == 0 → cancel
-            self.orderbook.update_level(
-                side=u.side,
-                price=u.price,
-                quantity=u.quantity,
+            self.coalescer.discard()
+        else:
+            self._reset_book = True
+
+    def _hold(self, batch: UpdateBatch, start: int, stop: int) -> None:
+        """Coalesce rows ``start:stop``; pending keeps only the newest row."""
+        self.coalescer.add(batch.sides[start:stop], batch.prices[start:stop], batch.quantities[start:stop])
+        trace = self.pending.trace
+        self.pending.clear()
+        self.pending.extend(batch, stop - 1, stop)
+        if self.pending.trace is None:
+            self.pending.trace = trace
+
+    def drain(self) -> Iterator[SnapshotResult]:
+        """Apply the pending bucket, if any; yields its result if emitted."""
+        if len(self.pending):
+            result = self._apply_snapshot(self.pending)
+            self.pending.clear()
+            if result is not None:
+                yield result
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _builtin_stages(self) -> Dict[str, Stage]:
+        return {
+            stage.name: stage
+            for stage in (
+                Stage("book", self._stage_book, ("rows",), ("view",)),
+                Stage("events", self._stage_events, ("view", "timestamp"), ("events",)),
+                Stage("order_flow", self._stage_order_flow, ("view", "events"), ("flow_features",)),
+                Stage("features", self._stage_features, ("view",), ("features",)),
+                Stage("price_context", self._stage_price_context, ("features", "timestamp")),
+                Stage("labels", self._stage_labels, ("features", "timestamp"), ("labels",)),
+                Stage("store", self._stage_store, ("features", "timestamp")),
             )
+        }
+
+    def _build_pipeline(
+        self, stages: Iterable[Union[str, Stage]], timing: bool
+    ) -> StagePipeline:
+        builtin = self._builtin_stages()
+        selected: List[Stage] = []
+        for stage in stages:
+            if isinstance(stage, Stage):
+                selected.append(stage)
+            elif stage not in builtin:
+                raise ValueError(f"Unknown stage: {stage}")
+            elif stage == "order_flow" and self.order_flow is None:
+                continue  # no order-flow features requested
+            else:
+                selected.append(builtin[stage])
 
-        # --- Snapshot ---
-        snapshot = self.orderbook.snapshot()
+        names = {stage.name for stage in selected}
+        if self.order_flow is not None and "order_flow" not in names:
+            raise ValueError("order-flow features need the 'order_flow' stage")
+        if "events" not in names and (self.event_buffer is not None or self.event_log is not None):
+            raise ValueError("event_mode 'stream' and event_log_path need the 'events' stage")
 
-        # Snapshot timestamp = bucket boundary (ms)
-        snapshot_ts_ms = self.current_bucket * self.snapshot_interval_ms
+        return StagePipeline(selected, required=("view", "features"), timing=timing)
 
-        # --- Phase 3: Event inference (optional) ---
-        if self.prev_snapshot is not None:
-            self.event_engine.infer(
-                self.prev_snapshot,
-                snapshot,
-                snapshot_ts_ms,
+    def _stage_book(self, ctx: BucketContext) -> None:
+        rows = ctx.rows
+
+        # --- Replay semantics ---
+        # Dataset snapshots are full reconstructions → reset book, bulk
+        # loading the levels when that is equivalent to applying each row
+        load = getattr(self.orderbook, "load", None) if self.mode == "replay" else None
+        if self.coalescer is not None:
+            # Rows were folded as they arrived; write the last segment
+            self.coalescer.flush()
+        elif load is None or not load(rows.sides, rows.prices, rows.quantities):
+            # (live: a depth resync snapshot replaces the book likewise)
+            if self.mode == "replay" or self._reset_book:
+                self.orderbook.reset()
+                self._reset_book = False
+
+            # --- Apply L2 updates (delta semantics) ---
+            # quantity == 0 → cancel; whole bucket goes through one batch call
+            self.orderbook.apply_batch(
+                rows.sides,
+                rows.prices,
+                rows.quantities,
+                [to_ms(t) for t in rows.timestamps] if self.event_buffer is not None else None,
+            )
+        stamp(rows.trace, "applied")
+
+        # --- Snapshot (shared immutable view, no dict copies) ---
+        ctx.view = self.latest_view = self.orderbook.view()
+
+    def _stage_events(self, ctx: BucketContext) -> None:
+        # --- Phase 3: Event inference ---
+        if self.event_buffer is not None:
+            # Stream mode: events were emitted while applying the rows
+            self.last_events = self.event_buffer.drain()
+        elif self.prev_view is not None:
+            self.last_events = self.event_engine.infer_batch(
+                self.prev_view,
+                ctx.view,
+                ctx.timestamp,
             )
-        self.prev_snapshot = snapshot
+        if self.event_log is not None:
+            self.event_log.write(self.last_events)
+        self.prev_view = ctx.view
+        ctx.events = self.last_events
 
+    def _stage_order_flow(self, ctx: BucketContext) -> None:
+        # Order-flow state follows every bucket, even one-sided ones
+        ctx.flow_features = self.order_flow.update(ctx.events, ctx.view)
+
+    def _stage_features(self, ctx: BucketContext) -> Optional[bool]:
         # --- Phase 4: Feature computation ---
-        features = self.feature_computer.compute(snapshot)
+        features = self.feature_computer.compute(self.orderbook)
         if not features:
-            return
-
-        mid_price = features.get("mid_price")
-        if mid_price is None:
-            return
+            return False
+        flow_features = ctx.flow_features
+        if flow_features:
+            features.update(flow_features)
+
+        if self.feature_vector is not None:
+            self.feature_computer.fill(self.feature_vector)
+            if flow_features:
+                self.feature_vector.update(flow_features)
+        stamp(ctx.rows.trace, "features")
+        ctx.features = features
+        return None
+
+    def _stage_price_context(self, ctx: BucketContext) -> None:
         # --- Price context update (1-min rolling) ---
-        self.price_context.maybe_update(mid_price, snapshot_ts_ms)
+        self.price_context.maybe_update(ctx.features["mid_price"], ctx.timestamp)
 
+    def _stage_labels(self, ctx: BucketContext) -> None:
         # --- Phase 5: Labeling ---
-        self.label_generator.add_observation(snapshot_ts_ms, mid_price)
-        ready_labels = self.label_generator.pop_ready_labels(
-            snapshot_ts_ms, mid_price
-        )
+        mid_price = ctx.features["mid_price"]
+        self.label_generator.add_observation(ctx.timestamp, mid_price)
+        ctx.labels = self.label_generator.pop_ready_labels(ctx.timestamp, mid_price)
 
-        for ts, label in ready_labels:
+    def _stage_store(self, ctx: BucketContext) -> None:
+        for ts, label in ctx.labels or ():
             self.feature_store.set_label(ts, label)
 
         # Add features without label initially
         self.feature_store.add_record(
-            timestamp=snapshot_ts_ms,
-            features=features,
+            timestamp=ctx.timestamp,
+            features=dict(ctx.features),
             label=None,
         )
 
-
-        self.snapshots_emitted += 1
-
-        if self.snapshots_emitted % 100 == 0:
+        if len(self.feature_store) % 100 == 0:
             stats = self.feature_store.get_stats()
             log.info(
                 "snapshot_progress",
-                snapshots=self.snapshots_emitted,
+                snapshots=len(self.feature_store),
                 updates=self.updates_processed,
                 labeled=stats.get("labeled_records", 0),
             )
 
+    def _apply_snapshot(self, rows: UpdateBatch) -> Optional[SnapshotResult]:
+        """
+        Run one bucket through the stages; None if no snapshot is emitted.
+        """
+        if not len(rows):
+            return None
+
+        # Snapshot timestamp = bucket boundary / message event time (ms)
+        if self.snapshot_mode == "message":
+            snapshot_ts_ms = to_ms(rows.timestamps[-1])
+        else:
+            snapshot_ts_ms = self.current_bucket * self.snapshot_interval_ms
+
+        ctx = BucketContext(rows, snapshot_ts_ms)
+        if not self.pipeline.run(ctx):
+            return None
+
+        self.snapshots_emitted += 1
+        return SnapshotResult.build(
+            sequence=self.snapshots_emitted,
+            timestamp=snapshot_ts_ms,
+            view=ctx.view,
+            features=ctx.features,
+            events=self.last_events if ctx.events is None else ctx.events,
+            vector=self.feature_vector,
+            trace=rows.trace,
+        )
+
     async def finalize(self) -> None:
         """
         Flush remaining data at shutdown.
         """
-        if self.snapshot_rows:
-            self._apply_snapshot(self.snapshot_rows)
+        for result in self.drain():
+            await self.publish(result)
+        self.close()
+
+    def close(self) -> None:
+        """Close the event log (pending rows must already be drained)."""
+        if self.event_log is not None:
+            self.event_log.close()
 
         log.info(
             "processor_finalized",
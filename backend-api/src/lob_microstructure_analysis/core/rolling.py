@@ -0,0 +1,172 @@
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class MultiWindowStats:
+    """
+    Mean / variance over several trailing windows from one shared ring.
+
+    Each push appends one entry to ring-buffered prefix sums of
+    ``x - anchor`` and its square (``max(windows) + 1`` entries), so any
+    window's sums are a difference of two prefix entries: a push is O(1)
+    however many windows there are, and each read is O(1). Prefix sums are
+    rebuilt around the current mean every ``reanchor_every`` pushes
+    (amortised O(1)) to bound rounding error.
+
+    Min / max keep a pair of monotonic deques per window, built from the
+    ring the first time that window is asked for and then maintained on
+    every push (amortised O(1)). ``spans`` adds exponentially weighted
+    means (pandas ``span``, ``adjust=False``) over the whole history.
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int],
+        reanchor_every: Optional[int] = None,
+        spans: Sequence[float] = (),
+    ) -> None:
+        self.windows = tuple(sorted(set(windows)))
+        if not self.windows or self.windows[0] < 1:
+            raise ValueError("windows must be a non-empty list of sizes >= 1")
+        self.size = self.windows[-1]
+        self.count = 0
+
+        self._values = np.zeros(self.size, dtype=np.float64)
+        self._cells = memoryview(self._values)
+
+        # Prefix sums: entry t % (size + 1) covers the first t samples
+        self._s1 = memoryview(np.zeros(self.size + 1, dtype=np.float64))
+        self._s2 = memoryview(np.zeros(self.size + 1, dtype=np.float64))
+
+        self._anchor = 0.0
+        self._reanchor_every = reanchor_every or self.size
+        self._since_anchor = 0
+
+        # window -> (highs, lows): (sequence number, value), monotonic from the front
+        self._extrema: Dict[int, Tuple[Deque[Tuple[int, float]], Deque[Tuple[int, float]]]] = {}
+
+        self._alphas: Dict[float, float] = {}
+        for span in spans:
+            alpha = 2.0 / (span + 1.0)
+            if not 0.0 < alpha <= 1.0:
+                raise ValueError("span must be >= 1")
+            self._alphas[span] = alpha
+        self._ewma: Dict[float, Optional[float]] = dict.fromkeys(self._alphas)
+
+    def push(self, x: float) -> None:
+        t = self.count
+        if not t:
+            self._anchor = x
+        cap = self.size + 1
+        prev = t % cap
+        new = (t + 1) % cap
+        d = x - self._anchor
+        self._s1[new] = self._s1[prev] + d
+        self._s2[new] = self._s2[prev] + d * d
+        self._cells[t % self.size] = x
+        self.count = t + 1
+
+        for window, (highs, lows) in self._extrema.items():
+            _slide(highs, lows, t, x, t - window)
+        for span, alpha in self._alphas.items():
+            value = self._ewma[span]
+            self._ewma[span] = x if value is None else value + alpha * (x - value)
+
+        self._since_anchor += 1
+        if self._since_anchor >= self._reanchor_every:
+            self._reanchor()
+
+    def _reanchor(self) -> None:
+        t = self.count
+        m = min(t, self.size)
+        values = self.values(m)
+        anchor = float(values.mean())
+        d = values - anchor
+        cap = self.size + 1
+        s1 = np.concatenate(([0.0], np.cumsum(d)))
+        s2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        for k in range(m + 1):
+            i = (t - m + k) % cap
+            self._s1[i] = s1[k]
+            self._s2[i] = s2[k]
+        self._anchor = anchor
+        self._since_anchor = 0
+
+    def values(self, n: Optional[int] = None) -> np.ndarray:
+        """Last ``n`` samples (default: all kept), oldest first (a copy)."""
+        n = min(self.count, self.size) if n is None else min(n, self.count, self.size)
+        end = self.count % self.size
+        idx = (np.arange(end - n, end)) % self.size
+        return self._values[idx]
+
+    def lag(self, k: int) -> Optional[float]:
+        """Sample ``k`` pushes ago (0 = latest), if still kept."""
+        if k >= min(self.count, self.size):
+            return None
+        return self._cells[(self.count - 1 - k) % self.size]
+
+    def _sums(self, window: int) -> Tuple[int, float, float]:
+        if not 0 < window <= self.size:
+            raise ValueError(f"window must be in 1..{self.size}, got {window}")
+        n = min(window, self.count)
+        cap = self.size + 1
+        end = self.count % cap
+        start = (self.count - n) % cap
+        return n, self._s1[end] - self._s1[start], self._s2[end] - self._s2[start]
+
+    def mean(self, window: int) -> float:
+        n, s1, _ = self._sums(window)
+        return self._anchor + s1 / n if n else 0.0
+
+    def var(self, window: int) -> float:
+        """Sample variance (ddof=1) over the last ``window`` samples."""
+        n, s1, s2 = self._sums(window)
+        if n < 2:
+            return 0.0
+        return max((s2 - s1 * s1 / n) / (n - 1), 0.0)
+
+    def std(self, window: int) -> float:
+        return self.var(window) ** 0.5
+
+    def min(self, window: int) -> Optional[float]:
+        """Smallest of the last ``window`` samples; None before any push."""
+        lows = self._tracked(window)[1]
+        return lows[0][1] if lows else None
+
+    def max(self, window: int) -> Optional[float]:
+        """Largest of the last ``window`` samples; None before any push."""
+        highs = self._tracked(window)[0]
+        return highs[0][1] if highs else None
+
+    def ewma(self, span: float) -> Optional[float]:
+        """Exponentially weighted mean for one of ``spans``; None before any push."""
+        if span not in self._ewma:
+            raise ValueError(f"span {span} not tracked (spans: {tuple(self._ewma)})")
+        return self._ewma[span]
+
+    def _tracked(self, window: int) -> Tuple[Deque[Tuple[int, float]], Deque[Tuple[int, float]]]:
+        extrema = self._extrema.get(window)
+        if extrema is None:
+            n = self._sums(window)[0]  # validates the window
+            highs: Deque[Tuple[int, float]] = deque()
+            lows: Deque[Tuple[int, float]] = deque()
+            for k, x in enumerate(self.values(n).tolist(), start=self.count - n):
+                _slide(highs, lows, k, x, k - window)
+            extrema = self._extrema[window] = (highs, lows)
+        return extrema
+
+
+def _slide(highs: Deque, lows: Deque, seq: int, x: float, expired: int) -> None:
+    """Add sample ``seq`` to a window's deques; drop samples up to ``expired``."""
+    while highs and highs[-1][1] <= x:
+        highs.pop()
+    highs.append((seq, x))
+    if highs[0][0] <= expired:
+        highs.popleft()
+    while lows and lows[-1][1] >= x:
+        lows.pop()
+    lows.append((seq, x))
+    if lows[0][0] <= expired:
+        lows.popleft()
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import structlog
+
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.events import EventBatch
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+
+log = structlog.get_logger()
+
+Level = Tuple[float, float]
+
+
+@dataclass(frozen=True)
+class SnapshotResult:
+    """
+    Everything computed for one emitted bucket, computed once.
+
+    ``view`` and ``features`` are read-only; ``bids`` / ``asks`` are the
+    top-N levels, best first. ``vector`` is the processor's in-place model
+    input buffer: it holds this bucket's values only while subscribers are
+    being called, and is overwritten by the next bucket.
+
+    ``trace`` (live streams only) holds the stage stamps of the newest
+    message in the bucket; subscribers stamp their own stages on it and the
+    processor records it once they are done (see utils.latency).
+    """
+
+    sequence: int
+    timestamp: int                      # bucket boundary (ms)
+    view: BookView
+    bids: Tuple[Level, ...]
+    asks: Tuple[Level, ...]
+    features: Mapping[str, float]
+    events: EventBatch
+    vector: Optional[FeatureVector] = None
+    trace: Optional[Dict[str, int]] = None
+
+    @classmethod
+    def build(
+        cls,
+        sequence: int,
+        timestamp: int,
+        view: BookView,
+        features: dict,
+        events: EventBatch,
+        vector: Optional[FeatureVector] = None,
+        trace: Optional[Dict[str, int]] = None,
+        top_n: int = 10,
+    ) -> "SnapshotResult":
+        return cls(
+            sequence=sequence,
+            timestamp=timestamp,
+            view=view,
+            bids=tuple(view.top("bid", top_n)),
+            asks=tuple(view.top("ask", top_n)),
+            features=MappingProxyType(features),
+            events=events,
+            vector=vector,
+            trace=trace,
+        )
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        return self.features.get("mid_price")
+
+
+Subscriber = Callable[[SnapshotResult], Awaitable[None]]
+
+
+class SnapshotBus:
+    """
+    Publishes one SnapshotResult per bucket to async subscribers.
+
+    Subscribers are awaited in registration order before the processor
+    moves on to the next bucket, so each sees a consistent result (and
+    ``vector``) and a slow subscriber applies back-pressure instead of
+    letting results pile up. A failing subscriber is logged and skipped;
+    the others still receive the result.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: List[Subscriber] = []
+        self.published = 0
+
+    def subscribe(self, callback: Subscriber) -> Subscriber:
+        """Register ``async def callback(result)``; returns it (decorator-friendly)."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        self._subscribers.remove(callback)
+
+    async def publish(self, result: SnapshotResult) -> None:
+        self.published += 1
+        for callback in self._subscribers:
+            try:
+                await callback(result)
+            except Exception as exc:
+                log.error(
+                    "snapshot_subscriber_failed",
+                    subscriber=getattr(callback, "__qualname__", repr(callback)),
+                    sequence=result.sequence,
+                    error=str(exc),
+                )
@@ -0,0 +1,377 @@
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.depth import DepthAggregates
+from lob_microstructure_analysis.core.event_buffer import EventRingBuffer
+from lob_microstructure_analysis.core.events import ADD, ASK, CANCEL, MODIFY, SIDE_CODES
+from lob_microstructure_analysis.core.orderbook import (
+    Price,
+    Quantity,
+    Side,
+    _as_lists,
+)
+
+
+class _Ladder:
+    """
+    One side of the book as a dense quantity array over integer ticks.
+
+    Index ``i`` holds the quantity resting at tick ``anchor + i`` (0.0 = empty).
+    ``lo``/``hi`` bracket the occupied indices, so best and worst levels are
+    O(1) reads and writes inside the window are a single array store.
+    """
+
+    def __init__(self, capacity: int, descending: bool) -> None:
+        self.qty = np.zeros(capacity, dtype=np.float64)
+        # Scalar access through a memoryview returns Python floats and skips
+        # NumPy scalar boxing; vectorised reads still go through ``qty``.
+        self.cells = memoryview(self.qty)
+        self.anchor = 0
+        self.lo = 0
+        self.hi = -1
+        self.count = 0
+        self.descending = descending
+
+    def get(self, tick: int) -> float:
+        i = tick - self.anchor
+        if self.count == 0 or i < self.lo or i > self.hi:
+            return 0.0
+        return self.cells[i]
+
+    def set(self, tick: int, quantity: float) -> float:
+        """Write one level and return the quantity it replaced."""
+        i = tick - self.anchor
+
+        if i < 0 or i >= len(self.cells) or self.count == 0:
+            if quantity <= 0:
+                return 0.0
+            i = self._make_room(tick)
+
+        cells = self.cells
+        prev = cells[i]
+
+        if quantity <= 0:
+            if prev > 0:
+                cells[i] = 0.0
+                self._on_remove(i)
+            return prev
+
+        cells[i] = quantity
+        if prev == 0.0:
+            self.count += 1
+            if self.count == 1:
+                self.lo = self.hi = i
+            elif i < self.lo:
+                self.lo = i
+            elif i > self.hi:
+                self.hi = i
+        return prev
+
+    def best_tick(self) -> Optional[int]:
+        if self.count == 0:
+            return None
+        return self.anchor + (self.hi if self.descending else self.lo)
+
+    def worst_tick(self) -> Optional[int]:
+        if self.count == 0:
+            return None
+        return self.anchor + (self.lo if self.descending else self.hi)
+
+    def pop_best(self) -> Tuple[int, float]:
+        tick = self.best_tick()
+        return tick, self.set(tick, 0.0)
+
+    def pop_worst(self) -> Tuple[int, float]:
+        tick = self.worst_tick()
+        return tick, self.set(tick, 0.0)
+
+    def levels(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Occupied (ticks, quantities), best first, optionally the top ``n``."""
+        if self.count == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return empty.astype(np.int64), empty
+
+        idx = np.flatnonzero(self.qty[self.lo:self.hi + 1]) + self.lo
+        if self.descending:
+            idx = idx[::-1]
+        if n is not None:
+            idx = idx[:n]
+        return idx + self.anchor, self.qty[idx]
+
+    def clear(self) -> None:
+        if self.count:
+            self.qty[self.lo:self.hi + 1] = 0.0
+        self.lo = 0
+        self.hi = -1
+        self.count = 0
+
+    def _on_remove(self, i: int) -> None:
+        self.count -= 1
+        if self.count == 0:
+            self.lo = 0
+            self.hi = -1
+            return
+
+        # Levels cluster near the touch, so the next occupied cell is usually
+        # a few ticks away: a scalar scan beats a vectorised search here.
+        cells = self.cells
+        if i == self.lo:
+            j = i + 1
+            while cells[j] == 0.0:
+                j += 1
+            self.lo = j
+        elif i == self.hi:
+            j = i - 1
+            while cells[j] == 0.0:
+                j -= 1
+            self.hi = j
+
+    def _make_room(self, tick: int) -> int:
+        """
+        Move the anchor (growing the array if needed) so ``tick`` fits,
+        keeping occupied levels centred. Returns the new index of ``tick``.
+        """
+        capacity = self.qty.shape[0]
+
+        if self.count == 0:
+            self.anchor = tick - capacity // 2
+            return tick - self.anchor
+
+        lo_tick = min(self.anchor + self.lo, tick)
+        hi_tick = max(self.anchor + self.hi, tick)
+        span = hi_tick - lo_tick + 1
+
+        while span > capacity // 2:
+            capacity *= 2
+
+        new_anchor = lo_tick - (capacity - span) // 2
+        shift = self.anchor - new_anchor
+
+        qty = np.zeros(capacity, dtype=np.float64)
+        qty[self.lo + shift:self.hi + shift + 1] = self.qty[self.lo:self.hi + 1]
+
+        self.qty = qty
+        self.cells = memoryview(qty)
+        self.anchor = new_anchor
+        self.lo += shift
+        self.hi += shift
+        return tick - new_anchor
+
+
+class TickOrderBook:
+    """
+    Array-backed Level-2 order book on a fixed tick grid.
+
+    Drop-in alternative to ``OrderBook``: each side is a NumPy quantity
+    ladder indexed by integer tick offset from a movable anchor, so level
+    writes are O(1) and the best price is a cached pointer. Prices are
+    snapped to the nearest multiple of ``tick_size``.
+
+    ``top_depth`` is refreshed with one vectorised ladder scan per side
+    after any change, rather than per touched rank as in ``OrderBook``.
+    """
+
+    def __init__(
+        self,
+        max_depth: int = 50,
+        tick_size: float = 0.01,
+        capacity: int = 1024,
+        top_n: int = 10,
+    ) -> None:
+        self.max_depth = max_depth
+        self.tick_size = tick_size
+        self._decimals = max(0, -int(np.floor(np.log10(tick_size) + 1e-9)))
+
+        self._bids = _Ladder(capacity, descending=True)
+        self._asks = _Ladder(capacity, descending=False)
+
+        self.top_depth = DepthAggregates(top_n, self._levels_slice)
+
+        self.version = 0
+        self._view: Optional[BookView] = None
+
+        self.event_buffer: Optional[EventRingBuffer] = None
+
+    def _ladder(self, side: Side) -> _Ladder:
+        if side == "bid":
+            return self._bids
+        if side == "ask":
+            return self._asks
+        raise ValueError(f"Invalid side: {side}")
+
+    def _price(self, tick: Optional[int]) -> Optional[Price]:
+        if tick is None:
+            return None
+        return round(tick * self.tick_size, self._decimals)
+
+    def update_level(
+        self,
+        side: Side,
+        price: Price,
+        quantity: Quantity,
+        timestamp: int = 0,
+    ) -> None:
+        """
+        Add, update, or remove a price level.
+        quantity <= 0 implies removal.
+        ``timestamp`` (ms) only stamps emitted events.
+        """
+        ladder = self._ladder(side)
+        tick = round(price / self.tick_size)
+        self.version += 1
+        events = self.event_buffer
+
+        if quantity > 0 and ladder.count >= self.max_depth:
+            # A new level behind a full side would be trimmed straight away.
+            worst = ladder.worst_tick()
+            if tick < worst if ladder.descending else tick > worst:
+                if events is not None:
+                    # OrderBook inserts then trims: keep the same event trail
+                    price = self._price(tick)
+                    events.append(timestamp, SIDE_CODES[side], price, 0.0, quantity, ADD)
+                    events.append(timestamp, SIDE_CODES[side], price, quantity, 0.0, CANCEL)
+                self._sanitize_crossed_book(timestamp)
+                return
+
+        prev = ladder.set(tick, quantity)
+        self.top_depth.dirty[side] = 0
+
+        if events is not None:
+            if quantity <= 0:
+                if prev > 0:
+                    events.append(
+                        timestamp, SIDE_CODES[side], self._price(tick), prev, 0.0, CANCEL
+                    )
+            elif prev == 0.0:
+                events.append(
+                    timestamp, SIDE_CODES[side], self._price(tick), 0.0, quantity, ADD
+                )
+            elif prev != quantity:
+                events.append(
+                    timestamp, SIDE_CODES[side], self._price(tick), prev, quantity, MODIFY
+                )
+
+        if ladder.count > self.max_depth:
+            self._enforce_depth(ladder, side, timestamp)
+        self._sanitize_crossed_book(timestamp)
+
+    def apply_batch(
+        self,
+        sides: Sequence[Side],
+        prices: Sequence[Price],
+        quantities: Sequence[Quantity],
+        timestamps: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Apply a whole message (or bucket) of level updates in order.
+        Same result as calling update_level once per level.
+        """
+        sides, prices, quantities = _as_lists(sides, prices, quantities)
+        timestamps = repeat(0) if timestamps is None else _as_lists(timestamps)[0]
+
+        update_level = self.update_level
+        for side, price, quantity, ts in zip(sides, prices, quantities, timestamps):
+            update_level(side, price, quantity, ts)
+
+    def _enforce_depth(self, ladder: _Ladder, side: Side, timestamp: int = 0) -> None:
+        while ladder.count > self.max_depth:
+            tick, prev = ladder.pop_worst()
+            if self.event_buffer is not None:
+                self.event_buffer.append(
+                    timestamp, SIDE_CODES[side], self._price(tick), prev, 0.0, CANCEL
+                )
+
+    def _sanitize_crossed_book(self, timestamp: int = 0) -> None:
+        bids = self._bids
+        asks = self._asks
+        if not bids.count or not asks.count:
+            return
+
+        if bids.anchor + bids.hi >= asks.anchor + asks.lo:
+            # Data corruption safeguard: drop best ask (mirrors OrderBook)
+            tick, prev = asks.pop_best()
+            self.top_depth.dirty["ask"] = 0
+            if self.event_buffer is not None:
+                self.event_buffer.append(
+                    timestamp, ASK, self._price(tick), prev, 0.0, CANCEL
+                )
+
+    def best_bid(self) -> Optional[Price]:
+        return self._price(self._bids.best_tick())
+
+    def best_ask(self) -> Optional[Price]:
+        return self._price(self._asks.best_tick())
+
+    def mid_price(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return (bid + ask) / 2.0
+
+    def spread(self) -> Optional[float]:
+        bid = self.best_bid()
+        ask = self.best_ask()
+        if bid is None or ask is None:
+            return None
+        return ask - bid
+
+    def midprice(self) -> Optional[float]:
+        return self.mid_price()
+
+    def _side_items(
+        self, ladder: _Ladder, n: Optional[int] = None
+    ) -> List[Tuple[Price, Quantity]]:
+        ticks, qtys = ladder.levels(n)
+        prices = np.round(ticks * self.tick_size, self._decimals)
+        return list(zip(prices.tolist(), qtys.tolist()))
+
+    @property
+    def bids(self) -> Dict[Price, Quantity]:
+        """Bid levels best first (a copy, for read-only callers)."""
+        return dict(self._side_items(self._bids))
+
+    @property
+    def asks(self) -> Dict[Price, Quantity]:
+        """Ask levels best first (a copy, for read-only callers)."""
+        return dict(self._side_items(self._asks))
+
+    def depth(self, n: int = 5) -> Dict[str, List[Tuple[Price, Quantity]]]:
+        return {
+            "bids": self._side_items(self._bids, n),
+            "asks": self._side_items(self._asks, n),
+        }
+
+    def snapshot(self) -> Dict[str, Dict[Price, Quantity]]:
+        return {
+            "bid": self.bids,
+            "ask": self.asks,
+        }
+
+    def _levels_slice(self, side: Side, start: int, stop: int) -> List[Tuple[Price, Quantity]]:
+        return self._side_items(self._ladder(side), stop)[start:]
+
+    def view(self) -> BookView:
+        """Immutable view of the current book, cached per version."""
+        view = self._view
+        if view is None or view.version != self.version:
+            bid_ticks, bid_qty = self._bids.levels()
+            ask_ticks, ask_qty = self._asks.levels()
+            view = BookView.from_arrays(
+                self.version,
+                np.round(bid_ticks * self.tick_size, self._decimals),
+                bid_qty,
+                np.round(ask_ticks * self.tick_size, self._decimals),
+                ask_qty,
+            )
+            self._view = view
+        return view
+
+    def reset(self) -> None:
+        self._bids.clear()
+        self._asks.clear()
+        self.top_depth.invalidate()
+        self.version += 1
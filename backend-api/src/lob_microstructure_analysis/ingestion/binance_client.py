@@ -3,27 +3,121 @@
 import asyncio
 import json
 import time
-from typing import AsyncIterator, Optional
+from itertools import chain
+from typing import AsyncIterator, Dict, NamedTuple, Optional, Union
+import numpy as np
 import websockets
 from websockets.exceptions import ConnectionClosed, WebSocketException
 import structlog
 
-# Assuming your L2Update model looks like this
-# Adjust import based on your actual structure
-from dataclasses import dataclass
+from lob_microstructure_analysis.ingestion.types import UpdateBatch
 
-@dataclass
-class L2Update:
-    """Level-2 order book update."""
-    timestamp: int      # Unix milliseconds
-    price: float
-    quantity: float
-    side: str          # 'bid' or 'ask'
-    level: int         # Depth level (0 = best)
-    update_id: int     # Monotonic sequence ID
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # optional: the stdlib decoder is the fallback
+    _loads = json.loads
 
 log = structlog.get_logger()
 
+SIDES = ("bid", "ask")  # side codes of DepthMessage.sides
+
+
+class DepthMessage(NamedTuple):
+    """One ``depthUpdate`` as arrays: bids first, then asks (stream order)."""
+    event_time: int            # E (ms)
+    first_update_id: int       # U
+    last_update_id: int        # u
+    sides: np.ndarray          # int8: 0 bid, 1 ask
+    prices: np.ndarray         # float64
+    quantities: np.ndarray     # float64
+    n_bids: int
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def to_batch(self, event_time: Optional[int] = None, update_id: Optional[int] = None) -> UpdateBatch:
+        """
+        Rows as an UpdateBatch: bids then asks, level = index within side.
+        ``event_time`` / ``update_id`` override the message's own (snapshot
+        restamping).
+        """
+        n, n_bids = len(self.prices), self.n_bids
+        if event_time is None:
+            event_time = self.event_time
+        if update_id is None:
+            update_id = self.last_update_id
+        return UpdateBatch(
+            timestamps=[event_time] * n,
+            sides=["bid"] * n_bids + ["ask"] * (n - n_bids),
+            prices=self.prices.tolist(),
+            quantities=self.quantities.tolist(),
+            levels=list(range(n_bids)) + list(range(n - n_bids)),
+            update_ids=[update_id] * n,
+        )
+
+
+def parse_depth_message(raw: Union[str, bytes]) -> DepthMessage:
+    """
+    Decode a raw depth message straight into arrays, without a Python
+    object per level. Uses orjson when installed, else ``json``.
+
+    Message format:
+    {
+        "e": "depthUpdate",
+        "E": 1234567890,     // Event time (ms)
+        "s": "BTCUSDT",
+        "U": 157,            // First update ID
+        "u": 160,            // Last update ID
+        "b": [               // Bids
+            ["0.0024", "10"],
+            ...
+        ],
+        "a": [               // Asks
+            ["0.0026", "100"],
+            ...
+        ]
+    }
+    """
+    message = _loads(raw)
+    return _depth_arrays(
+        message['E'], message['U'], message['u'], message.get('b', []), message.get('a', [])
+    )
+
+
+def parse_depth_snapshot(raw: Union[str, bytes], received_ms: Optional[int] = None) -> DepthMessage:
+    """
+    REST depth snapshot (``{"lastUpdateId", "bids", "asks"}``) as a
+    DepthMessage covering update IDs up to ``lastUpdateId``. It carries no
+    event time; ``received_ms`` (default: now) stands in until
+    DepthSynchronizer restamps it with the bridging diff's.
+    """
+    message = _loads(raw)
+    last_update_id = message['lastUpdateId']
+    if received_ms is None:
+        received_ms = time.time_ns() // 1_000_000
+    return _depth_arrays(
+        received_ms, last_update_id, last_update_id, message['bids'], message['asks']
+    )
+
+
+def _depth_arrays(event_time: int, first_update_id: int, last_update_id: int, bids, asks) -> DepthMessage:
+    n = len(bids) + len(asks)
+
+    # [[price, qty], ...] strings → one flat float array, then split
+    values = np.fromiter(map(float, chain.from_iterable(chain(bids, asks))), np.float64, 2 * n)
+    sides = np.zeros(n, dtype=np.int8)
+    sides[len(bids):] = 1
+    return DepthMessage(
+        event_time=event_time,
+        first_update_id=first_update_id,
+        last_update_id=last_update_id,
+        sides=sides,
+        prices=values[0::2],
+        quantities=values[1::2],
+        n_bids=len(bids),
+    )
+
 
 class BinanceWebSocketClient:
     """
@@ -39,8 +133,8 @@ class BinanceWebSocketClient:
     
     Example usage:
         client = BinanceWebSocketClient(symbol="btcusdt")
-        async for updates in client.stream_updates():
-            for update in updates:
+        async for batch in client.stream_batches():
+            for update in batch:
                 print(f"{update.side} @ {update.price}: {update.quantity}")
     """
     
@@ -70,8 +164,11 @@ class BinanceWebSocketClient:
             f"wss://stream.binance.com:9443/ws/"
             f"{self.symbol}@depth@{self.update_speed}"
         )
+        # REST depth snapshots (DepthSynchronizer)
+        self.rest_url = "https://api.binance.com/api/v3/depth"
         
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
+        self._session = None  # aiohttp session, kept warm for resyncs
         self.is_connected = False
         self.reconnect_count = 0
         
@@ -79,6 +176,8 @@ class BinanceWebSocketClient:
         self.messages_received = 0
         self.last_update_id = None
         self.connection_start_time = None
+        # Latency stamps of the last yielded message (utils.latency.STAGES)
+        self.last_trace: Optional[Dict[str, int]] = None
         
     async def connect(self) -> bool:
         """
@@ -142,76 +241,33 @@ class BinanceWebSocketClient:
         await asyncio.sleep(delay)
         return await self.connect()
     
-    def _parse_message(self, message: dict) -> list[L2Update]:
+    async def stream_batches(self) -> AsyncIterator[UpdateBatch]:
         """
-        Parse Binance depth update message into L2Update objects.
-        
-        Message format:
-        {
-            "e": "depthUpdate",
-            "E": 1234567890,     // Event time (ms)
-            "s": "BTCUSDT",
-            "U": 157,            // First update ID
-            "u": 160,            // Last update ID
-            "b": [               // Bids
-                ["0.0024", "10"],
-                ...
-            ],
-            "a": [               // Asks
-                ["0.0026", "100"],
-                ...
-            ]
-        }
-        
-        Args:
-            message: Parsed JSON message from Binance
-            
-        Returns:
-            List of L2Update objects
-        """
-        timestamp = message['E']  # Event time in milliseconds
-        update_id = message['u']  # Last update ID
-        
-        self.last_update_id = update_id
-        
-        updates = []
-        
-        # Parse bids
-        bids = message.get('b', [])
-        for level, (price_str, qty_str) in enumerate(bids):
-            updates.append(L2Update(
-                timestamp=timestamp,
-                price=float(price_str),
-                quantity=float(qty_str),
-                side='bid',
-                level=level,
-                update_id=update_id,
-            ))
-        
-        # Parse asks
-        asks = message.get('a', [])
-        for level, (price_str, qty_str) in enumerate(asks):
-            updates.append(L2Update(
-                timestamp=timestamp,
-                price=float(price_str),
-                quantity=float(qty_str),
-                side='ask',
-                level=level,
-                update_id=update_id,
-            ))
-        
-        return updates
-    
-    async def stream_updates(self) -> AsyncIterator[list[L2Update]]:
-        """
-        Stream L2 updates from Binance WebSocket.
-        
-        Yields:
-            List of L2Update objects (one message may contain multiple levels)
+        Stream one UpdateBatch per depth message (timestamps: event time,
+        ms), decoded through ``parse_depth_message``. Each batch carries
+        its latency ``trace``.
+
+        Update IDs are not checked; DepthSynchronizer adds sequence
+        validation and snapshot resync on top of ``stream_depth``.
             
         Raises:
             ConnectionError: If unable to connect after max attempts
         """
+        async for depth in self.stream_depth():
+            if len(depth):  # Only yield if there are updates
+                batch = depth.to_batch()
+                batch.trace = self.last_trace
+                yield batch
+
+    # Rows are iterable / indexable as L2Update, e.g. ``batch[0].price``
+    stream_updates = stream_batches
+
+    async def stream_depth(self) -> AsyncIterator[DepthMessage]:
+        """
+        Stream every depth message as a DepthMessage (empty ones too: their
+        update IDs still count), with ``last_trace`` set for each.
+        Reconnects on socket errors.
+        """
         # Initial connection
         if not self.is_connected:
             connected = await self.connect()
@@ -222,7 +278,9 @@ class BinanceWebSocketClient:
             try:
                 # Receive message
                 message_raw = await self.websocket.recv()
-                message = json.loads(message_raw)
+                received_ns = time.time_ns()
+                depth = parse_depth_message(message_raw)
+                self.last_update_id = depth.last_update_id
                 
                 self.messages_received += 1
                 
@@ -236,11 +294,12 @@ class BinanceWebSocketClient:
                         last_update_id=self.last_update_id,
                     )
                 
-                # Parse and yield updates
-                updates = self._parse_message(message)
-                
-                if updates:  # Only yield if there are updates
-                    yield updates
+                self.last_trace = {
+                    "exchange": depth.event_time * 1_000_000,
+                    "receive": received_ns,
+                    "parse": time.time_ns(),
+                }
+                yield depth
                 
             except ConnectionClosed as e:
                 log.warning(
@@ -263,6 +322,7 @@ class BinanceWebSocketClient:
                     raise ConnectionError("WebSocket error, reconnection failed")
                 
             except json.JSONDecodeError as e:
+                # orjson's decode error subclasses this one
                 log.error("json_decode_error", error=str(e), raw_message=message_raw[:100])
                 # Skip malformed message, continue streaming
                 continue
@@ -272,8 +332,30 @@ class BinanceWebSocketClient:
                 # Re-raise unexpected errors
                 raise
     
+    async def fetch_depth_snapshot(self, limit: int = 1000) -> DepthMessage:
+        """
+        Order book snapshot from the REST API (``limit`` levels per side),
+        for DepthSynchronizer. The HTTP session is reused so a resync does
+        not pay for a new TLS handshake.
+        """
+        if self._session is None:
+            try:
+                import aiohttp
+            except ImportError as exc:
+                raise ImportError("fetch_depth_snapshot requires aiohttp") from exc
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+
+        params = {"symbol": self.symbol.upper(), "limit": limit}
+        async with self._session.get(self.rest_url, params=params) as response:
+            response.raise_for_status()
+            raw = await response.read()
+        return parse_depth_snapshot(raw)
+
     async def close(self):
         """Close WebSocket connection gracefully."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
         if self.websocket and self.is_connected:
             await self.websocket.close()
             self.is_connected = False
@@ -301,12 +383,12 @@ async def test_stream():
     
     try:
         count = 0
-        async for updates in client.stream_updates():
+        async for batch in client.stream_batches():
             print(f"\n=== Message {count + 1} ===")
-            print(f"Received {len(updates)} level updates")
+            print(f"Received {len(batch)} level updates")
             
             # Show first 3 updates
-            for update in updates[:3]:
+            for update in list(batch)[:3]:
                 print(f"  {update.side.upper():4} @ ${update.price:>10.2f} = {update.quantity:>8.5f}")
             
             count += 1
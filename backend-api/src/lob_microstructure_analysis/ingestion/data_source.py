@@ -19,15 +19,16 @@ class DataSource(ABC):
     """
     
     @abstractmethod
-    async def stream_updates(self) -> AsyncIterator:
+    async def stream_batches(self) -> AsyncIterator:
         """
         Stream L2 updates asynchronously.
         
         Yields:
-            L2Update objects
+            UpdateBatch objects (one per depth message / snapshot, ms
+            timestamps)
         """
         pass
-    
+
     @abstractmethod
     async def close(self):
         """Clean up resources."""
@@ -40,8 +41,8 @@ class ReplayDataSource(DataSource):
     
     Usage:
         source = ReplayDataSource("data/BTCUSDT_2024-01-15.csv")
-        async for update in source.stream_updates():
-            process(update)
+        async for batch in source.stream_batches():
+            process(batch)
     """
     
     def __init__(self, file_path: str | Path, speed_multiplier: float = 1.0):
@@ -64,15 +65,15 @@ class ReplayDataSource(DataSource):
             speed=f"{speed_multiplier}x",
         )
     
-    async def stream_updates(self) -> AsyncIterator:
-        """Stream updates from file."""
+    async def stream_batches(self) -> AsyncIterator:
+        """Stream one UpdateBatch per snapshot timestamp from file."""
         # Import here to avoid circular dependencies
         from lob_microstructure_analysis.ingestion.loader import LOBDataLoader
-        
-        loader = LOBDataLoader(str(self.file_path))
-        
-        async for update in loader.stream():
-            yield update
+
+        loader = LOBDataLoader(str(self.file_path), replay_speed=self.speed_multiplier)
+
+        async for batch in loader.stream_batches():
+            yield batch
     
     async def close(self):
         """No resources to clean up for file replay."""
@@ -85,8 +86,8 @@ class LiveDataSource(DataSource):
     
     Usage:
         source = LiveDataSource(symbol="btcusdt")
-        async for update in source.stream_updates():
-            process(update)
+        async for batch in source.stream_batches():
+            process(batch)
     """
     
     def __init__(
@@ -116,17 +117,15 @@ class LiveDataSource(DataSource):
             update_speed=update_speed,
         )
     
-    async def stream_updates(self) -> AsyncIterator:
+    async def stream_batches(self) -> AsyncIterator:
         """
-        Stream live updates from Binance.
-        
-        Note: Binance returns batches of updates (multiple levels per message).
-        We flatten this to individual L2Update objects for consistency.
+        Stream one UpdateBatch per Binance depth message, starting from a
+        depth snapshot and resyncing on sequence gaps (DepthSynchronizer).
         """
-        async for update_batch in self.client.stream_updates():
-            # Yield each update individually
-            for update in update_batch:
-                yield update
+        from lob_microstructure_analysis.ingestion.depth_sync import DepthSynchronizer
+
+        async for batch in DepthSynchronizer.for_client(self.client).stream():
+            yield batch
     
     async def close(self):
         """Close WebSocket connection."""
@@ -0,0 +1,190 @@
+# src/lob_microstructure_analysis/ingestion/depth_sync.py
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+import structlog
+
+from lob_microstructure_analysis.ingestion.binance_client import BinanceWebSocketClient, DepthMessage
+from lob_microstructure_analysis.ingestion.types import UpdateBatch
+from lob_microstructure_analysis.utils.latency import LatencyHistogram, Trace
+
+log = structlog.get_logger()
+
+
+class DepthSynchronizer:
+    """
+    Sequence-checked depth stream: a full book, then diffs strictly in
+    update-ID order (Binance's local order book procedure).
+
+    - diffs are buffered while a REST snapshot is fetched
+    - diffs with ``u`` <= the snapshot's ``lastUpdateId`` are dropped
+    - the first diff applied must bridge it: ``U <= lastUpdateId + 1 <= u``
+    - every later diff must follow the previous one: ``U == u + 1``
+
+    Anything else is a gap (a lost message, a reconnect). The stream then
+    fetches a new snapshot while diffs keep buffering, yields it as an
+    UpdateBatch with ``snapshot=True`` and resumes from the buffer, so only
+    the book is rebuilt: OrderBookProcessor swaps its book and keeps its
+    rolling state. ``recovery`` records each gap's recovery time (gap seen
+    → first diff bridging the new snapshot) in µs.
+
+    Back-to-back resyncs (a gap before the last snapshot was bridged) wait
+    ``resync_delay`` seconds, doubling up to ``max_resync_delay``, so a run
+    of gaps does not hammer the REST endpoint's rate limits; the first
+    resync after a bridged snapshot is immediate.
+
+    A snapshot is held back until a diff bridges it and is yielded just
+    before that diff, stamped with its event time and update ID: REST
+    snapshots carry no exchange time, and the local receive time could
+    land in a bucket after the diffs that follow. Sharing the update ID
+    keeps snapshot and bridging diff one message in ``snapshot_mode
+    "message"``, so they make a single feature row.
+
+    ``source`` yields every DepthMessage (``client.stream_depth()``, empty
+    ones too); ``fetch`` returns a snapshot DepthMessage; ``trace`` returns
+    the latency trace of the message the source just yielded.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterator[DepthMessage],
+        fetch: Callable[[], Awaitable[DepthMessage]],
+        trace: Callable[[], Optional[Trace]] = lambda: None,
+        buffer_size: int = 10_000,
+        max_attempts: int = 5,
+        retry_delay: float = 0.1,
+        resync_delay: float = 0.5,
+        max_resync_delay: float = 30.0,
+    ) -> None:
+        self.source = source
+        self.fetch = fetch
+        self.trace = trace
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.resync_delay = resync_delay
+        self.max_resync_delay = max_resync_delay
+        # (depth, trace); (None, error or None) once the source ends
+        self._buffer: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+
+        self.last_update_id: Optional[int] = None  # None: not in sync
+        self._snapshot_held: Optional[DepthMessage] = None  # until bridged
+        self._gap_ns: Optional[int] = None
+        self._backoff = 0.0      # wait before the next fetch; 0 once bridged
+
+        # Stats
+        self.gaps = 0
+        self.snapshots = 0
+        self.stale = 0           # diffs already covered by a snapshot
+        self.recovery = LatencyHistogram(max_us=60_000_000)
+
+    @classmethod
+    def for_client(cls, client: BinanceWebSocketClient, limit: int = 1000, **options) -> "DepthSynchronizer":
+        """Live Binance depth stream with REST snapshots of ``limit`` levels."""
+        return cls(
+            client.stream_depth(),
+            lambda: client.fetch_depth_snapshot(limit),
+            trace=lambda: client.last_trace,
+            **options,
+        )
+
+    async def stream(self) -> AsyncIterator[UpdateBatch]:
+        """Snapshot batches and in-sequence diffs (non-empty), in order."""
+        reader = asyncio.create_task(self._read())
+        try:
+            item = None
+            while True:
+                if self.last_update_id is None:
+                    await self._snapshot()
+
+                if item is None:
+                    item = await self._buffer.get()
+                depth, trace = item
+                if depth is None:
+                    if trace is not None:
+                        raise trace  # the source failed
+                    return
+                item = None
+
+                if depth.last_update_id <= self.last_update_id:
+                    self.stale += 1
+                    continue
+
+                expected = self.last_update_id + 1
+                snapshot = self._snapshot_held
+                if snapshot is not None:
+                    in_sequence = depth.first_update_id <= expected
+                else:
+                    in_sequence = depth.first_update_id == expected
+                if not in_sequence:
+                    self._gap(depth, expected)
+                    item = (depth, trace)  # re-checked against the new snapshot
+                    continue
+
+                self.last_update_id = depth.last_update_id
+                if snapshot is not None:
+                    self._snapshot_held = None
+                    self._backoff = 0.0
+                    self._recovered()
+                    batch = snapshot.to_batch(event_time=depth.event_time, update_id=depth.last_update_id)
+                    batch.snapshot = True
+                    yield batch
+                if len(depth):
+                    batch = depth.to_batch()
+                    batch.trace = trace
+                    yield batch
+        finally:
+            reader.cancel()
+
+    async def _read(self) -> None:
+        """Buffer the source, also while a snapshot is being fetched."""
+        try:
+            async for depth in self.source:
+                await self._buffer.put((depth, self.trace()))
+        except Exception as e:
+            await self._buffer.put((None, e))
+        else:
+            await self._buffer.put((None, None))
+
+    async def _snapshot(self) -> None:
+        if self._backoff:
+            log.info("depth_resync_backoff", delay=self._backoff)
+            await asyncio.sleep(self._backoff)
+        self._backoff = min(max(2 * self._backoff, self.resync_delay), self.max_resync_delay)
+
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                snapshot = await self.fetch()
+                break
+            except Exception as e:
+                log.warning("depth_snapshot_failed", attempt=attempt, error=str(e))
+                if attempt == self.max_attempts:
+                    raise ConnectionError("Failed to fetch a depth snapshot") from e
+                await asyncio.sleep(self.retry_delay * attempt)
+
+        self.snapshots += 1
+        self.last_update_id = snapshot.last_update_id
+        self._snapshot_held = snapshot
+
+    def _gap(self, depth: DepthMessage, expected: int) -> None:
+        self.gaps += 1
+        if self._gap_ns is None:
+            self._gap_ns = time.perf_counter_ns()
+        log.warning(
+            "depth_sequence_gap",
+            expected=expected,
+            first_update_id=depth.first_update_id,
+            last_update_id=depth.last_update_id,
+            stale_snapshot=self._snapshot_held is not None,
+        )
+        self.last_update_id = None
+        self._snapshot_held = None
+
+    def _recovered(self) -> None:
+        if self._gap_ns is None:
+            return  # initial sync
+        elapsed_us = (time.perf_counter_ns() - self._gap_ns) // 1000
+        self._gap_ns = None
+        self.recovery.record(elapsed_us)
+        log.info("depth_resynced", recovery_ms=elapsed_us / 1000, gaps=self.gaps)
@@ -1,8 +1,11 @@
 import asyncio
+from pathlib import Path
+from typing import AsyncIterator, Iterator
+
+import numpy as np
 import polars as pl
-from typing import AsyncIterator
 
-from lob_microstructure_analysis.ingestion.types import L2Update
+from lob_microstructure_analysis.ingestion.types import MAX_MS_TIMESTAMP, UpdateBatch
 
 
 class LOBDataLoader:
@@ -12,28 +15,64 @@ class LOBDataLoader:
         self.df = self._load()
 
     def _load(self) -> pl.DataFrame:
-        df = pl.read_csv(self.path)
-        return df.sort("timestamp")
+        return read_updates(self.path)
 
-    async def stream(self) -> AsyncIterator[L2Update]:
+    async def stream_batches(self) -> AsyncIterator[UpdateBatch]:
+        """
+        One UpdateBatch per distinct timestamp (a replay snapshot / depth
+        message), paced by the file's timestamps over ``replay_speed``
+        (0: as fast as possible).
+        """
         prev_ts = None
-
-        for row in self.df.iter_rows(named=True):
-            ts = int(row["timestamp"]) * 1_000_000  # ms → ns
-
+        for batch in iter_batches(self.df):
+            batch_ts = batch.timestamps[0]
             if prev_ts is not None and self.replay_speed > 0:
-                delta_ns = ts - prev_ts
-                sleep_s = (delta_ns / 1e9) / self.replay_speed
+                sleep_s = ((batch_ts - prev_ts) / 1e3) / self.replay_speed
                 if sleep_s > 0:
                     await asyncio.sleep(sleep_s)
+            prev_ts = batch_ts
+            yield batch
+
+
+def read_updates(path: str | Path) -> pl.DataFrame:
+    """Recorded L2 file (CSV or Parquet), sorted by timestamp (stable)."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        df = pl.read_parquet(path)
+    else:
+        df = pl.read_csv(path)
+    return df.sort("timestamp", maintain_order=True)
+
+
+def timestamps_ms(df: pl.DataFrame) -> np.ndarray:
+    """The frame's timestamps in ms (vectorized ``to_ms``)."""
+    ts = df["timestamp"].cast(pl.Int64).to_numpy()
+    return np.where(ts > MAX_MS_TIMESTAMP, ts // 1_000, ts)
+
+
+def iter_batches(df: pl.DataFrame) -> Iterator[UpdateBatch]:
+    """
+    One UpdateBatch per distinct timestamp of a sorted L2 frame, with
+    timestamps in ms (µs files are normalized as ``to_ms`` does).
+    """
+    if not df.height:
+        return
+    ts = timestamps_ms(df)
+    bounds = np.r_[0, np.flatnonzero(ts[1:] != ts[:-1]) + 1, len(ts)].tolist()
 
-            prev_ts = ts
+    ts = ts.tolist()
+    sides = df["side"].to_list()
+    prices = df["price"].cast(pl.Float64).to_list()
+    quantities = df["quantity"].cast(pl.Float64).to_list()
+    levels = df["level"].to_list()
+    update_ids = df["update_id"].to_list()
 
-            yield L2Update(
-                timestamp=ts,
-                side=row["side"],
-                price=row["price"],
-                quantity=row["quantity"],
-                level=row["level"],
-                update_id=row["update_id"],
-            )
+    for start, stop in zip(bounds, bounds[1:]):
+        yield UpdateBatch(
+            timestamps=ts[start:stop],
+            sides=sides[start:stop],
+            prices=prices[start:stop],
+            quantities=quantities[start:stop],
+            levels=levels[start:stop],
+            update_ids=update_ids[start:stop],
+        )
@@ -0,0 +1,317 @@
+# src/lob_microstructure_analysis/ingestion/shm_ring.py
+
+import asyncio
+import platform
+import signal
+import time
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import structlog
+
+from lob_microstructure_analysis.ingestion.types import UpdateBatch
+
+log = structlog.get_logger()
+
+SIDES = ("bid", "ask")
+SIDE_CODES = {"bid": 0, "ask": 1}
+
+# One L2 row per 64-byte record (one cache line). The trace columns repeat
+# the message's latency stamps on each of its rows (0: no trace), as does
+# ``snapshot`` (UpdateBatch.snapshot).
+RECORD_DTYPE = np.dtype(
+    {
+        "names": [
+            "timestamp", "update_id", "price", "quantity",
+            "exchange_ns", "receive_ns", "parse_ns", "level", "side", "last", "snapshot",
+        ],
+        "formats": ["<i8", "<i8", "<f8", "<f8", "<i8", "<i8", "<i8", "<i4", "i1", "i1", "i1"],
+        "offsets": [0, 8, 16, 24, 32, 40, 48, 56, 60, 61, 62],
+        "itemsize": 64,
+    }
+)
+
+# Header: uint64 slots, each counter on its own cache line
+_HEADER_BYTES = 256
+_WRITE = 0        # rows published (producer only)
+_CAPACITY = 1     # ring size in rows (set at creation)
+_READ = 8         # rows consumed (consumer only)
+_CLOSED = 16      # producer finished (producer only)
+_STOP = 24        # stop requested (consumer only)
+
+# Counter publication needs stores to become visible in program order
+ORDERED_STORES = platform.machine().lower() in ("x86_64", "amd64", "i386", "i686")
+
+
+class SharedUpdateRing:
+    """
+    Single-producer / single-consumer ring of L2 rows in shared memory.
+
+    Connects an ingestion process (socket reads, JSON parsing) to the
+    process running OrderBookProcessor. Rows are fixed-width records
+    (RECORD_DTYPE) in a ``multiprocessing.shared_memory`` block; the
+    producer owns the write counter and the consumer the read counter, so
+    neither side takes a lock. A message is written whole before the write
+    counter moves past it, and the last row of each message is flagged, so
+    the consumer only ever sees complete messages.
+
+    Counters only grow (row ``i`` lives in slot ``i % capacity``) and are
+    plain aligned 8-byte stores, published after the rows they cover; this
+    relies on stores becoming visible in program order (x86), so on other
+    architectures (``ORDERED_STORES`` false) the ring refuses to open.
+
+    The default capacity (64k rows, 4 MB) fits well under Docker's default
+    64 MB ``/dev/shm`` and holds dozens of 1000-level snapshots.
+
+    The creating side (``create=True``) owns the block and must ``unlink``
+    it; the other side attaches with ``SharedUpdateRing(name)``.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        capacity: int = 1 << 16,
+        create: Optional[bool] = None,
+    ) -> None:
+        if not ORDERED_STORES:
+            raise RuntimeError(
+                f"SharedUpdateRing needs x86 store ordering; not supported on {platform.machine()}"
+            )
+        if create is None:
+            create = name is None
+        if create:
+            if capacity <= 0:
+                raise ValueError("capacity must be positive")
+            size = _HEADER_BYTES + capacity * RECORD_DTYPE.itemsize
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+
+        self._header = np.ndarray((_HEADER_BYTES // 8,), dtype=np.uint64, buffer=self._shm.buf)
+        if create:
+            self._header[:] = 0
+            self._header[_CAPACITY] = capacity
+        self.capacity = int(self._header[_CAPACITY])
+        self.records = np.ndarray(
+            (self.capacity,), dtype=RECORD_DTYPE, buffer=self._shm.buf, offset=_HEADER_BYTES
+        )
+
+        # Producer side: times ``put`` found the ring full
+        self.full = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __len__(self) -> int:
+        """Rows written but not yet read."""
+        return int(self._header[_WRITE]) - int(self._header[_READ])
+
+    # ------------------------------------------------------------------
+    # Producer
+    # ------------------------------------------------------------------
+
+    def put(self, batch: UpdateBatch) -> bool:
+        """
+        Write one message (all rows of ``batch``); False if it does not fit
+        yet. ``batch.trace`` (receive / parse stamps) travels with it.
+        """
+        n = len(batch)
+        if not n:
+            return True
+        if n > self.capacity:
+            raise ValueError(f"message of {n} rows exceeds ring capacity {self.capacity}")
+
+        write = int(self._header[_WRITE])
+        if write + n - int(self._header[_READ]) > self.capacity:
+            self.full += 1
+            return False
+
+        rows = np.zeros(n, dtype=RECORD_DTYPE)
+        rows["timestamp"] = batch.timestamps
+        rows["update_id"] = batch.update_ids
+        rows["price"] = batch.prices
+        rows["quantity"] = batch.quantities
+        rows["level"] = batch.levels
+        rows["side"] = [SIDE_CODES[side] for side in batch.sides]
+        rows["last"][-1] = 1
+        rows["snapshot"] = batch.snapshot
+        trace = batch.trace
+        if trace is not None:
+            rows["exchange_ns"] = trace.get("exchange", 0)
+            rows["receive_ns"] = trace.get("receive", 0)
+            rows["parse_ns"] = trace.get("parse", 0)
+
+        start = write % self.capacity
+        first = min(n, self.capacity - start)
+        self.records[start:start + first] = rows[:first]
+        if first < n:
+            self.records[:n - first] = rows[first:]
+
+        self._header[_WRITE] = write + n  # publish
+        return True
+
+    def close(self) -> None:
+        """Mark the stream finished (producer), e.g. on shutdown."""
+        self._header[_CLOSED] = 1
+
+    @property
+    def stop_requested(self) -> bool:
+        return bool(self._header[_STOP])
+
+    # ------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------
+
+    def get(self, max_rows: int = 65_536) -> Optional[UpdateBatch]:
+        """
+        Whole messages written since the last call, as one UpdateBatch of at
+        most ``max_rows`` rows (more only if a single message is larger);
+        None if there is nothing to read. A snapshot message is returned on
+        its own.
+        """
+        read = int(self._header[_READ])
+        available = int(self._header[_WRITE]) - read
+        if not available:
+            return None
+
+        start = read % self.capacity
+        stop = start + available
+        if stop <= self.capacity:
+            rows = self.records[start:stop]
+        else:
+            rows = np.concatenate((self.records[start:], self.records[:stop - self.capacity]))
+
+        if available > max_rows:
+            ends = np.flatnonzero(rows["last"][:max_rows])
+            n = int(ends[-1]) + 1 if len(ends) else int(np.flatnonzero(rows["last"])[0]) + 1
+            rows = rows[:n]
+
+        # A snapshot message travels alone (UpdateBatch.snapshot is per batch)
+        snapshot = bool(rows["snapshot"][0])
+        if snapshot:
+            rows = rows[:int(np.flatnonzero(rows["last"])[0]) + 1]
+        else:
+            starts = np.flatnonzero(rows["snapshot"])
+            if len(starts):
+                rows = rows[:int(starts[0])]
+
+        batch = UpdateBatch(
+            timestamps=rows["timestamp"].tolist(),
+            sides=[SIDES[code] for code in rows["side"].tolist()],
+            prices=rows["price"].tolist(),
+            quantities=rows["quantity"].tolist(),
+            levels=rows["level"].tolist(),
+            update_ids=rows["update_id"].tolist(),
+            snapshot=snapshot,
+        )
+        newest = rows[-1]
+        if newest["receive_ns"]:
+            batch.trace = {
+                "exchange": int(newest["exchange_ns"]),
+                "receive": int(newest["receive_ns"]),
+                "parse": int(newest["parse_ns"]),
+            }
+
+        self._header[_READ] = read + len(rows)  # release the slots
+        return batch
+
+    @property
+    def closed(self) -> bool:
+        """Producer finished and every row has been read."""
+        return bool(self._header[_CLOSED]) and not len(self)
+
+    def request_stop(self) -> None:
+        """Ask the producer to finish (consumer)."""
+        self._header[_STOP] = 1
+
+    # ------------------------------------------------------------------
+
+    def release(self) -> None:
+        """Detach from the block (both sides); the owner then ``unlink``s."""
+        self._header = None
+        self.records = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        self._shm.unlink()
+
+
+async def pump(
+    ring: SharedUpdateRing,
+    queue: asyncio.Queue,
+    producer_alive: Callable[[], bool] = lambda: True,
+    poll_s: float = 0.0005,
+) -> None:
+    """
+    Move batches from ``ring`` into ``queue`` (for OrderBookProcessor.run)
+    until the producer closes the ring or dies. Polls ``poll_s`` when idle.
+    """
+    while True:
+        batch = ring.get()
+        if batch is not None:
+            await queue.put(batch)
+            continue
+        if ring.closed or not producer_alive():
+            if not len(ring):
+                return
+            continue
+        await asyncio.sleep(poll_s)
+
+
+async def _put(ring: SharedUpdateRing, batch: UpdateBatch) -> None:
+    """Write ``batch``, waiting while the consumer frees slots."""
+    while not ring.put(batch):
+        await asyncio.sleep(0.001)
+
+
+# ----------------------------------------------------------------------
+# Producer processes (spawn targets)
+# ----------------------------------------------------------------------
+
+def ingest_live(ring_name: str, symbol: str = "btcusdt", update_speed: str = "100ms") -> None:
+    """Stream Binance depth messages into the ring until stopped."""
+    from lob_microstructure_analysis.ingestion.binance_client import BinanceWebSocketClient
+    from lob_microstructure_analysis.ingestion.depth_sync import DepthSynchronizer
+
+    # The consumer process handles Ctrl-C and asks us to stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ring = SharedUpdateRing(ring_name)
+
+    async def run() -> None:
+        client = BinanceWebSocketClient(symbol=symbol, update_speed=update_speed)
+        try:
+            async for batch in DepthSynchronizer.for_client(client).stream():
+                await _put(ring, batch)
+                if ring.stop_requested:
+                    break
+        finally:
+            await client.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        log.info("ingestion_stopped", full_waits=ring.full)
+        ring.close()
+        ring.release()
+
+
+def ingest_file(ring_name: str, path: str | Path) -> None:
+    """Write a recorded L2 file into the ring, one message per timestamp."""
+    from lob_microstructure_analysis.ingestion.loader import iter_batches, read_updates
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    ring = SharedUpdateRing(ring_name)
+    try:
+        for batch in iter_batches(read_updates(path)):
+            while not ring.put(batch):
+                if ring.stop_requested:
+                    return
+                time.sleep(0.0005)
+            if ring.stop_requested:
+                return
+    finally:
+        ring.close()
+        ring.release()
@@ -1,11 +1,108 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+# Timestamps above this are microseconds (ms is ~1.7e12 in 2024)
+MAX_MS_TIMESTAMP = 10_000_000_000_000
+
+
+def to_ms(timestamp: int) -> int:
+    """
+    Normalize timestamp to milliseconds.
+
+    Binance timestamps are in milliseconds (~1e12);
+    dataset timestamps may be in microseconds (~1e15).
+    """
+    if timestamp > MAX_MS_TIMESTAMP:
+        return timestamp // 1_000   # µs → ms
+    return timestamp                # already ms
 
 
 @dataclass(frozen=True)
 class L2Update:
-    timestamp: int      # nanoseconds
+    """One row of an UpdateBatch (row access, tests, single-row feeds)."""
+    timestamp: int      # milliseconds
     side: str           # "bid" | "ask"
     price: float
     quantity: float
     level: int
     update_id: int
+
+
+@dataclass
+class UpdateBatch:
+    """
+    Columnar batch of L2 updates in stream order (same fields as L2Update).
+
+    The one representation on the ingest → book path: LOBDataLoader, the
+    Binance client and DataSources produce it and OrderBookProcessor
+    consumes it, one item per depth message (or replay snapshot) instead
+    of one object per level. Producers never split a message across
+    batches; a batch may hold several. Timestamps are milliseconds.
+
+    ``trace`` (live streams) holds the pipeline stage stamps of the newest
+    message in the batch (see utils.latency).
+
+    ``snapshot`` marks a full book (a depth resync, see DepthSynchronizer)
+    that replaces the current one instead of updating it; such a batch
+    holds nothing else.
+    """
+
+    timestamps: List[int] = field(default_factory=list)
+    sides: List[str] = field(default_factory=list)
+    prices: List[float] = field(default_factory=list)
+    quantities: List[float] = field(default_factory=list)
+    levels: List[int] = field(default_factory=list)
+    update_ids: List[int] = field(default_factory=list)
+    trace: Optional[Dict[str, int]] = None
+    snapshot: bool = False
+
+    @classmethod
+    def from_updates(cls, updates: Iterable[L2Update]) -> "UpdateBatch":
+        batch = cls()
+        for update in updates:
+            batch.append(update)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __iter__(self) -> Iterator[L2Update]:
+        for row in zip(
+            self.timestamps, self.sides, self.prices,
+            self.quantities, self.levels, self.update_ids,
+        ):
+            yield L2Update(*row)
+
+    def __getitem__(self, index: int) -> L2Update:
+        return L2Update(
+            self.timestamps[index], self.sides[index], self.prices[index],
+            self.quantities[index], self.levels[index], self.update_ids[index],
+        )
+
+    def append(self, update: L2Update) -> None:
+        self.timestamps.append(update.timestamp)
+        self.sides.append(update.side)
+        self.prices.append(update.price)
+        self.quantities.append(update.quantity)
+        self.levels.append(update.level)
+        self.update_ids.append(update.update_id)
+
+    def extend(self, other: "UpdateBatch", start: int = 0, stop: int | None = None) -> None:
+        """Append rows ``start:stop`` of ``other`` (and its trace, with its last row)."""
+        self.timestamps += other.timestamps[start:stop]
+        self.sides += other.sides[start:stop]
+        self.prices += other.prices[start:stop]
+        self.quantities += other.quantities[start:stop]
+        self.levels += other.levels[start:stop]
+        self.update_ids += other.update_ids[start:stop]
+        if other.trace is not None and (stop is None or stop >= len(other)):
+            self.trace = other.trace
+
+    def clear(self) -> None:
+        for column in (
+            self.timestamps, self.sides, self.prices,
+            self.quantities, self.levels, self.update_ids,
+        ):
+            column.clear()
+        self.trace = None
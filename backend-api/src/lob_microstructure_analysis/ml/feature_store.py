@@ -24,6 +24,9 @@ class FeatureStore:
         self._records: List[Dict] = []
         self._index_by_timestamp: Dict[int, int] = {}
 
+    def __len__(self) -> int:
+        return len(self._records)
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
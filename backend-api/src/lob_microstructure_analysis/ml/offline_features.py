@@ -0,0 +1,288 @@
+# src/lob_microstructure_analysis/ml/offline_features.py
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import polars as pl
+
+from lob_microstructure_analysis.core.event_inference import link_levels
+from lob_microstructure_analysis.core.events import ADD, BID, CANCEL, EVENT_TYPES, MODIFY, SIDES
+from lob_microstructure_analysis.core.features import DEFAULT_WINDOWS
+from lob_microstructure_analysis.ingestion.types import MAX_MS_TIMESTAMP
+
+
+class _Levels(NamedTuple):
+    """One side's levels for all buckets, sorted by (bucket index k, rank)."""
+
+    k: np.ndarray
+    price: np.ndarray
+    qty: np.ndarray
+    rank: np.ndarray
+
+
+class OfflineFeatureBuilder:
+    """
+    Batch equivalent of a replay run (``main.py replay``).
+
+    Builds the same records ``OrderBookProcessor`` writes to its
+    FeatureStore in replay mode (timestamp, label, FeatureComputer columns,
+    OrderFlowFeatures columns), with Polars / NumPy expressions over the
+    whole file instead of one queued row at a time.
+
+    Replay semantics: every time bucket is a full book reconstruction, so a
+    bucket's book is the last quantity written per (side, price) in that
+    bucket, trimmed to ``max_depth`` levels per side. Online, trimming and
+    the crossed-book guard run after every row; the two agree on snapshot
+    datasets (uncrossed, at most ``max_depth`` levels per side), which is
+    what replay files contain.
+    """
+
+    def __init__(
+        self,
+        snapshot_interval_ms: int = 1000,
+        label_horizon_ms: int = 5000,
+        flat_threshold_bps: float = 0.3,
+        max_depth: int = 50,
+        depth: int = 10,
+        window: int = 50,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        flow_depth: int = 10,
+        flow_windows: Sequence[int] = (10, 60),
+    ) -> None:
+        self.snapshot_interval_ms = snapshot_interval_ms
+        self.label_horizon_ms = label_horizon_ms
+        self.flat_threshold = flat_threshold_bps / 10_000
+        self.max_depth = max_depth
+        self.depth = depth
+        self.window = window
+        self.windows = tuple(sorted(set(windows)))
+        self.flow_depth = flow_depth
+        self.flow_windows = tuple(flow_windows)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def build_csv(self, path: str | Path) -> pl.DataFrame:
+        """Build features from a replay CSV (same schema as LOBDataLoader)."""
+        df = pl.read_csv(path).sort("timestamp", maintain_order=True)
+        return self.build(df.with_columns(_loader_timestamp_ms(pl.col("timestamp"))))
+
+    def build(self, updates: pl.DataFrame) -> pl.DataFrame:
+        """
+        Build feature records from L2 rows in stream order.
+
+        Args:
+            updates: columns timestamp (ms), side, price, quantity
+
+        Returns:
+            One row per emitted snapshot, columns in FeatureStore order
+        """
+        bucket_ids, books = self._books(updates)
+        n = len(bucket_ids)
+        snapshots = self._book_features(books, n)
+        flow = self._order_flow(books, n)
+
+        emitted = np.flatnonzero(
+            ~(np.isnan(snapshots["best_bid"]) | np.isnan(snapshots["best_ask"]))
+        )
+        timestamps = bucket_ids[emitted] * self.snapshot_interval_ms
+        features = self._rolling({k: v[emitted] for k, v in snapshots.items()})
+        labels = self._labels(timestamps, features["mid_price"])
+
+        return pl.DataFrame(
+            {
+                "timestamp": timestamps,
+                "label": pl.Series("label", labels, dtype=pl.Int64),
+                **features,
+                **{k: v[emitted] for k, v in flow.items()},
+            }
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _books(self, updates: pl.DataFrame) -> Tuple[np.ndarray, List[_Levels]]:
+        """Bucket ids and, per side, every bucket's end-of-bucket levels."""
+        df = updates.select(
+            (pl.col("timestamp") // self.snapshot_interval_ms).alias("bucket"),
+            (pl.col("side") == "ask").cast(pl.Int8).alias("side"),  # BID / ASK
+            pl.col("price").cast(pl.Float64),
+            pl.col("quantity").cast(pl.Float64).alias("qty"),
+        )
+        bucket_ids = np.unique(df["bucket"].to_numpy())
+
+        # Best first within each bucket; the stable sort keeps stream order
+        # among rewrites of a level, so the last row of each run wins
+        levels = df.with_columns(
+            pl.when(pl.col("side") == BID)
+            .then(-pl.col("price"))
+            .otherwise(pl.col("price"))
+            .alias("key")
+        ).sort(["side", "bucket", "key"], maintain_order=True)
+
+        side = levels["side"].to_numpy()
+        bucket = levels["bucket"].to_numpy()
+        price = levels["price"].to_numpy()
+        qty = levels["qty"].to_numpy()
+        last = np.r_[
+            (side[1:] != side[:-1]) | (bucket[1:] != bucket[:-1]) | (price[1:] != price[:-1]),
+            True,
+        ]
+        keep = last & (qty > 0)
+        side, bucket, price, qty = side[keep], bucket[keep], price[keep], qty[keep]
+        k = np.searchsorted(bucket_ids, bucket)
+
+        books = []
+        for code in range(len(SIDES)):
+            rows = side == code
+            k_side = k[rows]
+            # 0-based rank: position within the bucket's run of rows
+            starts = np.flatnonzero(np.r_[True, k_side[1:] != k_side[:-1]])
+            rank = np.arange(len(k_side)) - np.repeat(starts, np.diff(np.r_[starts, len(k_side)]))
+            depth = rank < self.max_depth
+            books.append(_Levels(
+                k_side[depth], price[rows][depth], qty[rows][depth], rank[depth],
+            ))
+        return bucket_ids, books
+
+    def _book_features(self, books: List[_Levels], n: int) -> Dict[str, np.ndarray]:
+        out = {}
+        for side, levels in zip(SIDES, books):
+            best = np.full(n, np.nan)
+            top = levels.rank == 0
+            best[levels.k[top]] = levels.price[top]
+            in_depth = levels.rank < self.depth
+            out[f"best_{side}"] = best
+            out[f"{side}_volume"] = np.bincount(
+                levels.k[in_depth], weights=levels.qty[in_depth], minlength=n
+            )
+        return out
+
+    def _rolling(self, s: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """FeatureComputer columns for the emitted snapshots, in its order."""
+        best_bid, best_ask = s["best_bid"], s["best_ask"]
+        bid_vol, ask_vol = s["bid_volume"], s["ask_volume"]
+        total = bid_vol + ask_vol
+        imbalance = np.divide(
+            bid_vol - ask_vol, total, out=np.zeros_like(total), where=total > 0
+        )
+        mid = (best_bid + best_ask) / 2
+
+        frame = pl.DataFrame({"mid": mid, "imb": imbalance})
+
+        def stats(w: int):
+            return frame.select(
+                pl.col("mid").rolling_std(w, min_periods=1).fill_null(0.0).fill_nan(0.0),
+                pl.col("imb").rolling_mean(w, min_periods=1),
+                (pl.col("mid") - pl.col("mid").shift(w - 1).fill_null(pl.col("mid").first())).alias("ret"),
+            )
+
+        legacy = stats(self.window)
+        features = {
+            "best_bid": best_bid,
+            "best_ask": best_ask,
+            "spread": best_ask - best_bid,
+            "mid_price": mid,
+            "bid_volume_top_n": bid_vol,
+            "ask_volume_top_n": ask_vol,
+            "orderbook_imbalance": imbalance,
+            "rolling_volatility": legacy["mid"].to_numpy(),
+            "rolling_mid_return": np.diff(mid, prepend=mid[:1]),
+            "rolling_imbalance_mean": legacy["imb"].to_numpy(),
+        }
+        for w in self.windows:
+            vol, imb, ret = stats(w).get_columns()
+            features[f"rolling_volatility_{w}"] = vol.to_numpy()
+            features[f"rolling_imbalance_mean_{w}"] = imb.to_numpy()
+            features[f"rolling_mid_return_{w}"] = ret.to_numpy()
+        return features
+
+    def _order_flow(self, books: List[_Levels], n: int) -> Dict[str, np.ndarray]:
+        """OrderFlowFeatures columns for every bucket (events vs bucket k - 1)."""
+        counts = np.zeros(n * 6, dtype=np.int64)
+        volumes = np.zeros(n * 6)
+        ofi_best = np.zeros(n)
+        ofi_top = np.zeros(n)
+
+        for code, levels in enumerate(books):
+            k, price, qty = levels.k, levels.price, levels.qty
+            prev_row, has_next = link_levels(k, price)
+
+            # Adds & modifies against bucket k - 1, then cancels into k + 1
+            has_prev = prev_row >= 0
+            old_qty = np.where(has_prev, qty[prev_row], 0.0)
+            changed = (k > 0) & (~has_prev | (old_qty != qty))
+            gone = (k < n - 1) & ~has_next
+
+            pair = np.concatenate((k[changed], k[gone] + 1))
+            event_price = np.concatenate((price[changed], price[gone]))
+            delta = np.concatenate((qty[changed] - old_qty[changed], -qty[gone]))
+            event_type = np.concatenate((
+                np.where(has_prev[changed], MODIFY, ADD),
+                np.full(int(gone.sum()), CANCEL),
+            ))
+
+            key = pair * 6 + code * 3 + event_type
+            counts += np.bincount(key, minlength=n * 6)
+            volumes += np.bincount(key, weights=np.abs(delta), minlength=n * 6)
+
+            # OFI bounds: previous bucket's best and depth-th level
+            fill = -np.inf if code == BID else np.inf
+            best = np.full(n, fill)
+            nth = np.full(n, fill)
+            top = levels.rank == 0
+            best[k[top]] = price[top]
+            in_depth = np.flatnonzero(levels.rank < self.flow_depth)
+            last = in_depth[np.r_[k[in_depth][1:] != k[in_depth][:-1], True]]
+            nth[k[last]] = price[last]
+
+            sign = 1.0 if code == BID else -1.0
+            prev_best = best[pair - 1]
+            prev_nth = nth[pair - 1]
+            if code == BID:
+                at_best, in_top = event_price >= prev_best, event_price >= prev_nth
+            else:
+                at_best, in_top = event_price <= prev_best, event_price <= prev_nth
+            ofi_best += np.bincount(pair[at_best], weights=sign * delta[at_best], minlength=n)
+            ofi_top += np.bincount(pair[in_top], weights=sign * delta[in_top], minlength=n)
+
+        counts = counts.reshape(n, 6)
+        volumes = volumes.reshape(n, 6)
+        out = {"ofi_best": ofi_best, "ofi_top_n": ofi_top}
+        for c, (side, etype) in enumerate((s, e.value) for s in SIDES for e in EVENT_TYPES):
+            out[f"{side}_{etype}_count"] = counts[:, c].astype(np.float64)
+            out[f"{side}_{etype}_volume"] = volumes[:, c]
+
+        # Cancel / add ratios over the last w buckets (integer prefix sums)
+        prefix = np.vstack((np.zeros((1, 6), dtype=np.int64), np.cumsum(counts, axis=0)))
+        idx = np.arange(1, n + 1)
+        for w in self.flow_windows:
+            window = prefix[idx] - prefix[np.maximum(idx - w, 0)]
+            for side, add, cancel in (("bid", 0, 1), ("ask", 3, 4)):
+                out[f"cancel_add_ratio_{side}_{w}"] = np.divide(
+                    window[:, cancel], window[:, add],
+                    out=np.zeros(n), where=window[:, add] > 0,
+                )
+        return out
+
+    def _labels(self, ts: np.ndarray, mid: np.ndarray) -> list:
+        """LabelGenerator semantics: first snapshot at least a horizon later."""
+        j = np.searchsorted(ts, ts + self.label_horizon_ms, side="left")
+        ready = j < len(ts)
+        ret = np.zeros(len(ts))
+        ret[ready] = (mid[j[ready]] - mid[ready]) / mid[ready]
+        label = np.where(np.abs(ret) < self.flat_threshold, 0, np.sign(ret)).astype(int)
+        return [int(v) if ok else None for v, ok in zip(label, ready)]
+
+
+def _loader_timestamp_ms(ts: pl.Expr) -> pl.Expr:
+    """Bucket timestamp the online path derives (LOBDataLoader's ``to_ms``)."""
+    return (
+        pl.when(ts > MAX_MS_TIMESTAMP)
+        .then(ts // 1_000)
+        .otherwise(ts)
+        .alias("timestamp")
+    )
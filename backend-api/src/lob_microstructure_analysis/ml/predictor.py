@@ -5,11 +5,66 @@ Real-time prediction engine for LOB microstructure.
 Loads trained model and performs sub-millisecond inference.
 """
 
+import ctypes
 from pathlib import Path
 from typing import Dict, Optional
 import numpy as np
 import joblib
 import lightgbm as lgb
+import structlog
+
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+
+log = structlog.get_logger()
+
+
+class _SingleRowPredictor:
+    """
+    LightGBM's single-row fast path (LGBM_BoosterPredictForMatSingleRowFast).
+
+    Prediction parameters are resolved once; each call passes the address
+    of a float64 row and gets probabilities written into a reused output
+    buffer, skipping Booster.predict's per-call setup and copies. Not
+    thread-safe (one shared config and output buffer).
+
+    Built on LightGBM's private ctypes helpers (``lightgbm.basic``), which
+    may change between releases; Predictor logs and falls back to
+    Booster.predict when they are missing.
+    """
+
+    def __init__(self, booster: lgb.Booster, num_features: int) -> None:
+        from lightgbm.basic import _LIB, _c_str, _safe_call
+
+        self._lib = _LIB
+        self._check = _safe_call
+        self._config = ctypes.c_void_p()
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            booster._handle,
+            ctypes.c_int(0),                # C_API_PREDICT_NORMAL
+            ctypes.c_int(0),                # start_iteration
+            ctypes.c_int(-1),               # all iterations
+            ctypes.c_int(1),                # C_API_DTYPE_FLOAT64
+            ctypes.c_int32(num_features),
+            _c_str(""),
+            ctypes.byref(self._config),
+        ))
+        self.out = np.zeros(booster.num_model_per_iteration(), dtype=np.float64)
+        self._out_ptr = self.out.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        self._out_len = ctypes.c_int64()
+
+    def __call__(self, address: int) -> np.ndarray:
+        self._check(self._lib.LGBM_BoosterPredictForMatSingleRowFast(
+            self._config,
+            ctypes.c_void_p(address),
+            ctypes.byref(self._out_len),
+            self._out_ptr,
+        ))
+        return self.out
+
+    def __del__(self) -> None:
+        if getattr(self, "_config", None):
+            self._lib.LGBM_FastConfigFree(self._config)
+            self._config = None
 
 
 class Predictor:
@@ -71,6 +126,16 @@ class Predictor:
             # Fall back to model's feature names
             self.feature_names = self.model.feature_name()
         
+        self.feature_names = list(self.feature_names)
+        self.schema = tuple(self.feature_names)
+
+        # Single-row fast path for predict_vector (falls back to Booster.predict)
+        try:
+            self._predict_row = _SingleRowPredictor(self.model, len(self.schema))
+        except (ImportError, AttributeError, lgb.basic.LightGBMError) as e:
+            log.warning("lightgbm_fast_path_unavailable", lightgbm=lgb.__version__, error=repr(e))
+            self._predict_row = None
+
         print(f"✅ Model loaded: {self.model_path.name}")
         print(f"   Features: {len(self.feature_names)}")
     
@@ -103,11 +168,42 @@ class Predictor:
         
         # Predict (returns probabilities for [class 0, class 1, class 2])
         proba = self.model.predict(feature_vector)[0]
-        
+        return self._result(proba)
+
+    def new_vector(self) -> FeatureVector:
+        """Preallocated feature buffer laid out in this model's feature order."""
+        return FeatureVector(self.schema)
+
+    def predict_vector(self, vector: FeatureVector) -> Dict:
+        """
+        Make prediction from a FeatureVector filled in place.
+
+        The booster reads the vector's buffer directly (LightGBM's
+        single-row fast path): no name lookups, validation or copies per
+        call.
+
+        Args:
+            vector: FeatureVector from ``new_vector`` (same schema)
+
+        Returns:
+            Same dictionary as ``predict``
+
+        Raises:
+            ValueError: If the vector's schema is not the model's
+        """
+        if vector.names is not self.schema and vector.names != self.schema:
+            raise ValueError("FeatureVector schema does not match model features")
+        if self._predict_row is not None:
+            proba = self._predict_row(vector.address)
+        else:
+            proba = self.model.predict(vector.array)[0]
+        return self._result(proba)
+
+    def _result(self, proba: np.ndarray) -> Dict:
         # Map back to labels: 0->-1, 1->0, 2->1
         prediction = np.argmax(proba) - 1
         confidence = np.max(proba)
-        
+
         return {
             'prediction': int(prediction),
             'confidence': float(confidence),
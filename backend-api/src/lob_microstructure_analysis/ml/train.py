@@ -57,7 +57,11 @@ class ModelTrainer:
 
         # Handle wildcard / directory paths properly
         if "*" in str(self.data_path) or self.data_path.is_dir():
-            files = sorted(self.data_path.parent.glob(self.data_path.name))
+            if self.data_path.is_dir():
+                # Partitioned dataset, e.g. main.py backfill-parallel output
+                files = sorted(self.data_path.rglob("*.parquet"))
+            else:
+                files = sorted(self.data_path.parent.glob(self.data_path.name))
             if not files:
                 raise FileNotFoundError(f"No parquet files found for {self.data_path}")
             print(f"Found {len(files)} parquet files")
@@ -0,0 +1,176 @@
+# src/lob_microstructure_analysis/utils/latency.py
+
+import math
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+# Pipeline stages of one depth message, in order. Each is stamped with
+# time.time_ns() (wall clock, so the first hop is comparable with the
+# exchange's event time ``E``).
+STAGES = (
+    "exchange",     # exchange event time
+    "receive",      # socket recv returned
+    "parse",        # JSON parsed into updates
+    "dequeue",      # processor took the batch off its queue
+    "applied",      # bucket applied to the order book
+    "features",     # features computed for the snapshot
+    "prediction",   # model prediction done
+    "broadcast",    # WebSocket broadcast sent
+)
+
+# stage -> time.time_ns(); stages that did not happen are absent
+Trace = Dict[str, int]
+
+
+def stamp(trace: Optional[Trace], stage: str) -> None:
+    """Record ``stage`` as now on ``trace`` (no-op without a trace)."""
+    if trace is not None:
+        trace[stage] = time.time_ns()
+
+
+class LatencyHistogram:
+    """
+    HDR-style histogram of latencies in integer microseconds.
+
+    Values below ``2 ** (precision_bits + 1)`` are counted exactly; above
+    that every power of two is split into ``2 ** precision_bits`` linear
+    sub-buckets, so percentiles are within ``2 ** -precision_bits`` (0.8%
+    at 7 bits) of the true value. Counters are preallocated (about 2.5k up
+    to 60 s) and ``record`` is a few integer operations. Values above
+    ``max_us`` are counted as ``max_us``; negative ones (clock skew) as 0.
+    """
+
+    def __init__(self, max_us: int = 60_000_000, precision_bits: int = 7) -> None:
+        self.max_us = max_us
+        self._bits = precision_bits
+        self._sub = 1 << precision_bits
+        self.counts: List[int] = [0] * (self._index(max_us) + 1)
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        shift = value.bit_length() - self._bits - 1
+        if shift <= 0:
+            return value
+        return (shift << self._bits) + (value >> shift)
+
+    def _highest(self, index: int) -> int:
+        """Largest value counted in ``index``."""
+        if index < 2 * self._sub:
+            return index
+        shift = index // self._sub - 1
+        return ((index - shift * self._sub + 1) << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        if value_us < 0:
+            value_us = 0
+        elif value_us > self.max_us:
+            value_us = self.max_us
+        self.counts[self._index(value_us)] += 1
+        self.count += 1
+        self.total += value_us
+        if value_us > self.max:
+            self.max = value_us
+        if self.min is None or value_us < self.min:
+            self.min = value_us
+
+    def percentiles(self, qs: Iterable[float]) -> List[int]:
+        """Values (µs) at percentiles ``qs`` (0-100); 0 when empty."""
+        qs = list(qs)
+        if not self.count:
+            return [0] * len(qs)
+        cumulative = np.cumsum(self.counts)
+        out = []
+        for q in qs:
+            rank = max(1, math.ceil(q / 100 * self.count))
+            index = int(np.searchsorted(cumulative, rank))
+            out.append(min(self._highest(index), self.max))
+        return out
+
+    def percentile(self, q: float) -> int:
+        return self.percentiles([q])[0]
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean and tail percentiles in milliseconds."""
+        p50, p90, p99, p999 = self.percentiles((50, 90, 99, 99.9))
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count / 1000 if self.count else 0.0,
+            "p50_ms": p50 / 1000,
+            "p90_ms": p90 / 1000,
+            "p99_ms": p99 / 1000,
+            "p999_ms": p999 / 1000,
+            "max_ms": self.max / 1000,
+        }
+
+    def reset(self) -> None:
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+
+class LatencyRecorder:
+    """
+    Latency histograms for traces of ``stages``.
+
+    Each trace adds one sample per hop between consecutive stages it
+    reached (``receive_to_parse``, ...) and one per ``end_to_end`` stage
+    measured from the first stage (``exchange_to_prediction``: how stale a
+    prediction is when it is made).
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[str] = STAGES,
+        end_to_end: Iterable[str] = ("features", "prediction", "broadcast"),
+        **histogram_options,
+    ) -> None:
+        self.stages = tuple(stages)
+        self.end_to_end = tuple(end_to_end)
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._options = histogram_options
+
+        origin = self.stages[0]
+        # Fixed order in summaries: hops, then end to end
+        self._hops = [f"{a}_to_{b}" for a in self.stages for b in self.stages]
+        self._totals = {stage: f"{origin}_to_{stage}" for stage in self.end_to_end}
+
+    def _histogram(self, name: str) -> LatencyHistogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(**self._options)
+        return histogram
+
+    def record(self, trace: Trace) -> None:
+        previous = None
+        for stage in self.stages:
+            t = trace.get(stage)
+            if t is None:
+                continue
+            if previous is not None:
+                self._histogram(f"{previous[0]}_to_{stage}").record((t - previous[1]) // 1000)
+            previous = (stage, t)
+
+        origin = trace.get(self.stages[0])
+        if origin is None:
+            return
+        for stage, name in self._totals.items():
+            t = trace.get(stage)
+            if t is not None:
+                self._histogram(name).record((t - origin) // 1000)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-histogram summaries, hops in stage order then end to end."""
+        order = {name: i for i, name in enumerate(self._hops + list(self._totals.values()))}
+        names = sorted(self.histograms, key=lambda name: order.get(name, len(order)))
+        return {name: self.histograms[name].summary() for name in names}
+
+    def reset(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.reset()
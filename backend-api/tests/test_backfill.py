@@ -0,0 +1,72 @@
+import random
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.backfill import ParallelBackfill
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import iter_batches, read_updates
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _snapshot_file(path, n_snapshots, seed):
+    """Replay file with gaps, one-sided, crossed and over-deep snapshots."""
+    rng = random.Random(seed)
+    rows = []
+    mid = 100.0
+    t = 1_700_000_000_000
+    for s in range(n_snapshots):
+        t += rng.choice((1, 1, 1, 2, 7)) * 1000
+        mid += rng.choice((-0.5, 0.0, 0.5))
+        sides = ("bid",) if rng.random() < 0.02 else ("bid", "ask")
+        for side, sign in (("bid", -1), ("ask", 1)):
+            if side not in sides:
+                continue
+            for level in range(rng.randint(2, 7)):
+                price = mid + sign * (0.25 + 0.5 * level)
+                rows.append((t, side, price, rng.randint(1, 9) * 0.5, level, s))
+        if rng.random() < 0.02:
+            rows.append((t, "bid", mid + 5.0, 1.0, 0, s))
+    pl.DataFrame(
+        rows, schema=["timestamp", "side", "price", "quantity", "level", "update_id"], orient="row"
+    ).write_csv(path)
+
+
+def _serial(path):
+    processor = OrderBookProcessor(OrderBook(max_depth=6), mode="replay", label_horizon_ms=1000)
+    ReplayEngine(processor).run(iter_batches(read_updates(path)))
+    return processor.feature_store.to_dataframe().with_columns(pl.col("label").cast(pl.Int64))
+
+
+def test_time_shards_match_serial_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    path = tmp_path / "day.csv"
+    _snapshot_file(path, n_snapshots=1300, seed=11)
+
+    backfill = ParallelBackfill(
+        tmp_path / "out", workers=1, shard_ms=400_000, max_depth=6, label_horizon_ms=1000
+    )
+    shards = backfill.plan([path])
+    assert len(shards) > 3 and any(s.first_row > 0 for s in shards)
+
+    parts = backfill.run([path])
+    got = pl.concat([pl.read_parquet(p) for p in parts])
+    assert_frame_equal(got, _serial(path))
+
+
+def test_file_shards_run_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)
+    paths = [tmp_path / f"day{i}.csv" for i in range(2)]
+    for i, path in enumerate(paths):
+        _snapshot_file(path, n_snapshots=60, seed=i)
+
+    backfill = ParallelBackfill(tmp_path / "out", workers=2, max_depth=6, label_horizon_ms=1000)
+    parts = backfill.run(paths)
+
+    assert [p.parent.name for p in parts] == ["day0", "day1"]
+    for path, part in zip(paths, parts):
+        assert_frame_equal(pl.read_parquet(part), _serial(path))
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from lob_microstructure_analysis.core.event_inference import EventInferenceEngine
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.tick_orderbook import TickOrderBook
+
+
+@pytest.mark.parametrize("book_cls", [OrderBook, TickOrderBook])
+def test_view_is_cached_per_version_and_immutable(book_cls):
+    ob = book_cls()
+    ob.update_level("bid", 100.0, 2.0)
+    ob.update_level("ask", 101.0, 1.0)
+
+    view = ob.view()
+    assert ob.view() is view
+    assert view.as_dict() == ob.snapshot()
+
+    with pytest.raises(ValueError):
+        view.bid_qty[0] = 5.0
+
+    ob.update_level("bid", 100.0, 3.0)
+    assert ob.view() is not view
+    assert view.bid_qty[0] == 2.0
+
+
+def test_infer_views_matches_dict_diff():
+    rng = random.Random(5)
+    engine = EventInferenceEngine()
+    ob = OrderBook(max_depth=20)
+
+    prev_view = ob.view()
+    prev_snap = ob.snapshot()
+
+    for ts in range(200):
+        for _ in range(30):
+            side = rng.choice(("bid", "ask"))
+            price = float(rng.randint(80, 99) if side == "bid" else rng.randint(101, 120))
+            qty = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 5))
+            ob.update_level(side, price, qty)
+
+        view = ob.view()
+        snap = ob.snapshot()
+        assert engine.infer_views(prev_view, view, ts) == engine.infer(prev_snap, snap, ts)
+        prev_view, prev_snap = view, snap
@@ -0,0 +1,84 @@
+import random
+from pathlib import Path
+
+import pytest
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.coalesce import LevelCoalescer
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _levels(book):
+    return list(book.bids.items()), list(book.asks.items())
+
+
+def test_coalesced_book_matches_rows_applied_in_order():
+    # Tiny depths and a narrow price range: trims and crossed books everywhere
+    rng = random.Random(3)
+
+    def rows(n, quantities):
+        return [(rng.choice(("bid", "ask")), float(rng.randint(95, 105)), rng.choice(quantities))
+                for _ in range(n)]
+
+    for _ in range(3000):
+        max_depth = rng.choice((1, 2, 3, 5))
+        expected, book = OrderBook(max_depth=max_depth), OrderBook(max_depth=max_depth)
+        initial = rows(rng.randint(0, 8), (1.0, 2.0))
+        if initial:
+            expected.apply_batch(*zip(*initial))
+            book.apply_batch(*zip(*initial))
+
+        bucket = rows(rng.randint(1, 12), (0.0, 1.0, 2.0))
+        expected.apply_batch(*zip(*bucket))
+        coalescer = LevelCoalescer(book)
+        for i in range(0, len(bucket), 3):  # messages of up to 3 rows
+            coalescer.add(*zip(*bucket[i:i + 3]))
+        coalescer.flush()
+
+        assert _levels(book) == _levels(expected), (max_depth, initial, bucket)
+        assert coalescer.applied <= coalescer.rows == len(bucket)
+
+
+def _diff_stream(n_messages, seed=11):
+    # 100 ms diffs around a drifting mid; most rows touch a few levels again and again
+    rng = random.Random(seed)
+    mid = 100.0
+    for m in range(n_messages):
+        mid += rng.choice((-0.5, 0.0, 0.5))
+        ts = 1_700_000_000_000 + m * 100
+        updates = []
+        for _ in range(rng.randint(2, 10)):
+            side, sign = rng.choice((("bid", -1), ("ask", 1)))
+            price = mid + sign * (0.5 + 0.5 * rng.randint(0, 8))
+            quantity = rng.choice((0.0, 1.0, 2.0, 3.5))
+            updates.append(L2Update(ts, side, price, quantity, 0, m))
+        batch = UpdateBatch.from_updates(updates)
+        if m % 5 == 0:
+            batch.trace = {"exchange": m, "receive": m, "parse": m}
+        yield batch
+
+
+def test_processor_coalesce_keeps_features(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+
+    def run(**options):
+        processor = OrderBookProcessor(OrderBook(max_depth=1000), mode="live", label_horizon_ms=2000, **options)
+        ReplayEngine(processor).run(_diff_stream(600))
+        return processor
+
+    expected = run()
+    coalesced = run(coalesce=True)
+
+    assert coalesced.updates_processed == expected.updates_processed
+    assert coalesced.snapshots_emitted == expected.snapshots_emitted > 0
+    assert _levels(coalesced.orderbook) == _levels(expected.orderbook)
+    assert_frame_equal(coalesced.feature_store.to_dataframe(), expected.feature_store.to_dataframe())
+    assert coalesced.coalescer.applied < coalesced.coalescer.rows
+
+    with pytest.raises(ValueError, match="coalesce"):
+        OrderBookProcessor(OrderBook(), mode="replay", coalesce=True)
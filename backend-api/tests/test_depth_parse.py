@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+import lob_microstructure_analysis.ingestion.binance_client as binance_client
+from lob_microstructure_analysis.ingestion.binance_client import parse_depth_message
+from lob_microstructure_analysis.ingestion.types import L2Update
+
+MESSAGES = [
+    '{"e":"depthUpdate","E":1700000000123,"s":"BTCUSDT","U":157,"u":160,'
+    '"b":[["37000.01","0.50000000"],["36999.99","0.00000000"]],'
+    '"a":[["37000.02","1.25000000"],["37000.10","0.00100000"],["37001.00","0.00000000"]]}',
+    '{"e":"depthUpdate","E":1700000000223,"s":"BTCUSDT","U":161,"u":161,"b":[],'
+    '"a":[["37000.03","2.00000000"]]}',
+    '{"e":"depthUpdate","E":1700000000323,"s":"BTCUSDT","U":162,"u":162,"b":[],"a":[]}',
+]
+
+EXPECTED = [
+    [
+        L2Update(1700000000123, "bid", 37000.01, 0.5, 0, 160),
+        L2Update(1700000000123, "bid", 36999.99, 0.0, 1, 160),
+        L2Update(1700000000123, "ask", 37000.02, 1.25, 0, 160),
+        L2Update(1700000000123, "ask", 37000.10, 0.001, 1, 160),
+        L2Update(1700000000123, "ask", 37001.00, 0.0, 2, 160),
+    ],
+    [L2Update(1700000000223, "ask", 37000.03, 2.0, 0, 161)],
+    [],
+]
+
+
+@pytest.mark.parametrize("loads", ["default", "json"])
+def test_depth_message_arrays(monkeypatch, loads):
+    if loads == "json":
+        monkeypatch.setattr(binance_client, "_loads", json.loads)
+
+    for raw, expected in zip(MESSAGES, EXPECTED):
+        depth = parse_depth_message(raw.encode())
+        message = json.loads(raw)
+
+        assert (depth.event_time, depth.first_update_id, depth.last_update_id) == (
+            message["E"], message["U"], message["u"])
+        assert [binance_client.SIDES[code] for code in depth.sides] == [u.side for u in expected]
+        assert list(depth.to_batch()) == expected
+
+    with pytest.raises(json.JSONDecodeError):
+        parse_depth_message('{"e":"depthUpdate",')
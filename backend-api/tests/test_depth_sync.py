@@ -0,0 +1,209 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.binance_client import parse_depth_message, parse_depth_snapshot
+from lob_microstructure_analysis.ingestion.depth_sync import DepthSynchronizer
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+class _Exchange:
+    """Local stand-in: a true book, numbered diffs and REST snapshots of it."""
+
+    def __init__(self, seed=7, clock_skew_ms=0):
+        self.rng = random.Random(seed)
+        self.clock_skew_ms = clock_skew_ms  # local clock vs exchange time
+        self.book = {"b": {}, "a": {}}
+        self.update_id = 1000
+        self.ts = 1_700_000_000_000
+
+    def diff(self, empty=False, far=None):
+        changes = {"b": [], "a": []}
+        for i in range(0 if empty else self.rng.randint(1, 4) + (far is not None)):
+            key = self.rng.choice("ba")
+            price = (99.5 - self.rng.randint(0, 15) * 0.5) if key == "b" else (100.5 + self.rng.randint(0, 15) * 0.5)
+            quantity = self.rng.choice((0.0, 1.0, 2.5))
+            if far is not None and i == 0:
+                key, price, quantity = far  # a level no other diff touches
+            if quantity:
+                self.book[key][price] = quantity
+            else:
+                self.book[key].pop(price, None)
+            changes[key].append([str(price), str(quantity)])
+        first = self.update_id + 1
+        self.update_id += self.rng.randint(1, 3)
+        self.ts += 10
+        return json.dumps({"e": "depthUpdate", "E": self.ts, "s": "BTCUSDT",
+                           "U": first, "u": self.update_id, **changes})
+
+    def snapshot(self):
+        raw = json.dumps({
+            "lastUpdateId": self.update_id,
+            "bids": [[str(p), str(q)] for p, q in sorted(self.book["b"].items(), reverse=True)],
+            "asks": [[str(p), str(q)] for p, q in sorted(self.book["a"].items())],
+        })
+        return parse_depth_snapshot(raw, received_ms=self.ts + self.clock_skew_ms)
+
+
+def _sync(exchange, n_messages=300, lost=(60,), reconnect_at=150):
+    async def source():
+        for m in range(n_messages):
+            if m in lost:
+                exchange.diff(far=("b", 90.0, 3.0))  # dropped on the wire
+                continue
+            if m == reconnect_at:
+                for i in range(5):
+                    exchange.diff(far=("a", 115.0 + i, 4.0))  # missed while reconnecting
+            raw = exchange.diff(empty=(m % 50 == 7))
+            await asyncio.sleep(0.001)
+            yield parse_depth_message(raw)
+
+    async def fetch():
+        await asyncio.sleep(0.02)  # REST round trip; diffs keep arriving
+        return exchange.snapshot()
+
+    return DepthSynchronizer(source(), fetch)
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+def test_gaps_resync_book_only(monkeypatch, coalesce):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    exchange = _Exchange()
+    sync = _sync(exchange)
+    processor = OrderBookProcessor(
+        OrderBook(max_depth=100), mode="live", snapshot_interval_ms=100,
+        features=["mid_price", "rolling_volatility_5"], coalesce=coalesce,
+    )
+
+    async def run():
+        queue = asyncio.Queue()
+        consumer = asyncio.create_task(processor.run(queue))
+        async for batch in sync.stream():
+            await queue.put(batch)
+        await queue.put(None)
+        await consumer
+
+    asyncio.run(run())
+
+    assert sync.gaps == 2 and sync.snapshots == 3  # initial + one per gap
+    assert sync.stale > 0 and sync.recovery.count == 2
+    assert sync.recovery.max < 1_000_000  # µs
+
+    # Book rebuilt exactly (the lost diffs added levels no later diff
+    # touches); rolling state carried on through both resyncs
+    assert exchange.book["b"][90.0] == 3.0 and exchange.book["a"][119.0] == 4.0
+    assert dict(processor.orderbook.bids) == exchange.book["b"]
+    assert dict(processor.orderbook.asks) == exchange.book["a"]
+    assert processor.feature_computer.mid_prices.count == processor.snapshots_emitted
+    assert processor.feature_store.to_dataframe().height == processor.snapshots_emitted
+
+
+def test_snapshot_takes_the_bridging_diffs_time(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)
+    exchange = _Exchange(clock_skew_ms=5_000)  # snapshots received "after" later diffs
+    sync = _sync(exchange)
+    processor = OrderBookProcessor(
+        OrderBook(max_depth=100), mode="live", snapshot_interval_ms=100, features=["mid_price"],
+    )
+
+    async def run():
+        batches = []
+        async for batch in sync.stream():
+            batches.append(batch)
+            for _ in processor.feed(batch):
+                pass
+        return batches
+
+    batches = asyncio.run(run())
+    list(processor.drain())
+
+    snapshots = [i for i, batch in enumerate(batches) if batch.snapshot]
+    assert len(snapshots) == 3 and snapshots[0] == 0
+    for i in snapshots:
+        assert set(batches[i].timestamps) == {batches[i + 1].timestamps[0]}
+    timestamps = [ts for batch in batches for ts in batch.timestamps]
+    assert timestamps == sorted(timestamps)
+
+    stored = processor.feature_store.to_dataframe()["timestamp"].to_list()
+    assert len(stored) == processor.snapshots_emitted and stored == sorted(set(stored))
+    assert dict(processor.orderbook.bids) == exchange.book["b"]
+
+
+def test_message_mode_resync_is_one_row_per_message(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)
+    exchange = _Exchange()
+    sync = _sync(exchange)
+    processor = OrderBookProcessor(
+        OrderBook(max_depth=100), mode="live", snapshot_mode="message",
+        label_horizon_ms=50, features=["mid_price"],
+    )
+
+    async def run():
+        update_ids = []
+        async for batch in sync.stream():
+            update_ids.append(batch.update_ids[0])
+            for _ in processor.feed(batch):
+                pass
+        return update_ids
+
+    update_ids = asyncio.run(run())
+    list(processor.drain())
+
+    # Each snapshot shares its bridging diff's update ID: one message, one row
+    assert sync.snapshots == 3 and len(update_ids) == len(set(update_ids)) + 3
+    stored = processor.feature_store.to_dataframe()
+    assert stored.height == processor.snapshots_emitted == len(set(update_ids))
+    assert stored["timestamp"].is_unique().all()
+    # Every row but the last horizon's got its label
+    unlabeled = stored.filter(stored["label"].is_null())["timestamp"]
+    assert unlabeled.min() > stored["timestamp"].max() - 50
+    assert dict(processor.orderbook.bids) == exchange.book["b"]
+
+
+def test_back_to_back_resyncs_back_off():
+    async def source():
+        for update_id in (10, 20):  # neither follows on from the one before
+            yield parse_depth_message(f'{{"E":{update_id},"U":{update_id},"u":{update_id},"b":[],"a":[]}}')
+
+    # Four stale snapshots before one bridges 10, then one that bridges 20
+    last_update_ids = iter((5, 5, 5, 5, 9, 19))
+    fetched = []
+
+    async def fetch():
+        fetched.append(asyncio.get_running_loop().time())
+        return parse_depth_snapshot(f'{{"lastUpdateId":{next(last_update_ids)},"bids":[],"asks":[]}}', 1)
+
+    async def run():
+        sync = DepthSynchronizer(source(), fetch, resync_delay=0.02, max_resync_delay=0.05)
+        async for _ in sync.stream():
+            pass
+        return sync
+
+    sync = asyncio.run(run())
+
+    assert sync.gaps == 5 and sync.snapshots == 6
+    waits = [b - a for a, b in zip(fetched, fetched[1:])]
+    for wait, expected in zip(waits, (0.02, 0.04, 0.05, 0.05)):
+        assert expected * 0.9 <= wait < expected + 0.05
+    assert waits[4] < 0.02  # bridged in between: no wait
+
+
+def test_source_errors_propagate():
+    async def source():
+        yield parse_depth_message('{"E":1,"U":5,"u":5,"b":[],"a":[]}')
+        raise ConnectionError("socket gone")
+
+    async def fetch():
+        return parse_depth_snapshot('{"lastUpdateId":4,"bids":[["1.0","1.0"]],"asks":[]}', 1)
+
+    async def run():
+        return [batch async for batch in DepthSynchronizer(source(), fetch).stream()]
+
+    with pytest.raises(ConnectionError, match="socket gone"):
+        asyncio.run(run())
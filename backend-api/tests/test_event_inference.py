@@ -0,0 +1,41 @@
+import random
+
+from lob_microstructure_analysis.core.event_inference import EventInferenceEngine
+from lob_microstructure_analysis.core.orderbook import OrderBook
+
+
+def _replay_snapshots(n, seed=3):
+    """Snapshot-per-bucket books (reset each time), including empty sides."""
+    rng = random.Random(seed)
+    ob = OrderBook(max_depth=50)
+    views, snaps = [], []
+    for i in range(n):
+        ob.reset()
+        if i % 17 != 0:
+            for _ in range(rng.randint(0, 120)):
+                side = rng.choice(("bid", "ask"))
+                if side == "ask" and i % 11 == 0:
+                    continue
+                price = float(rng.randint(60, 99) if side == "bid" else rng.randint(101, 140))
+                ob.update_level(side, price, float(rng.randint(1, 4)))
+        views.append(ob.view())
+        snaps.append(ob.snapshot())
+    return views, snaps
+
+
+def test_vectorised_diff_matches_dict_diff():
+    engine = EventInferenceEngine()
+    views, snaps = _replay_snapshots(300)
+
+    for ts in range(1, len(views)):
+        events = engine.infer(snaps[ts - 1], snaps[ts], ts)
+        assert engine.infer_batch(views[ts - 1], views[ts], ts).to_events() == events
+
+
+def test_same_version_has_no_events():
+    engine = EventInferenceEngine()
+    ob = OrderBook()
+    ob.update_level("bid", 100.0, 1.0)
+    view = ob.view()
+
+    assert len(engine.infer_batch(view, view, 0)) == 0
@@ -0,0 +1,76 @@
+import polars as pl
+import pytest
+
+from lob_microstructure_analysis.core.event_buffer import EventRingBuffer
+from lob_microstructure_analysis.core.event_log import EventLogWriter, scan_events
+from lob_microstructure_analysis.core.events import (
+    ASK,
+    BID,
+    CANCEL,
+    BookEvent,
+    EventBatch,
+    EventType,
+)
+
+
+def _events(n):
+    return [
+        BookEvent(
+            i,
+            "bid" if i % 2 else "ask",
+            100.0 + i,
+            float(i),
+            0.0 if i % 3 == 0 else float(i + 1),
+            EventType.CANCEL if i % 3 == 0 else EventType.MODIFY,
+        )
+        for i in range(n)
+    ]
+
+
+def test_batch_round_trips_book_events():
+    events = _events(10)
+    batch = EventBatch.from_events(events)
+
+    assert len(batch) == 10
+    assert batch.to_events() == events
+
+    grown = EventBatch(capacity=1)
+    grown.extend(batch)
+    grown.extend(batch)
+    assert grown.to_events() == events + events
+
+    # Zero-row batches (a bucket with no events) still grow
+    for empty in (EventBatch.from_columns(EventBatch(0).columns()), EventBatch.from_events([])):
+        empty.extend(batch)
+        empty.append(10, ASK, 110.0, 0.0, 1.0, 0)
+        assert empty.to_events() == events + [BookEvent(10, "ask", 110.0, 0.0, 1.0, EventType.ADD)]
+
+
+def test_ring_buffer_drains_in_order_after_wrapping():
+    buf = EventRingBuffer(capacity=4)
+    for i in range(3):
+        buf.append(i, BID, 100.0, 0.0, 1.0, CANCEL)
+    buf.drain()
+    for i in range(3, 7):
+        buf.append(i, ASK, 101.0, 1.0, 0.0, CANCEL)
+
+    assert buf.drain().timestamp.tolist() == [3, 4, 5, 6]
+
+
+@pytest.mark.parametrize("suffix", [".parquet", ".arrow"])
+def test_event_log_round_trip(tmp_path, suffix):
+    pytest.importorskip("pyarrow")
+    batch = EventBatch.from_events(_events(25))
+    path = tmp_path / f"events{suffix}"
+
+    with EventLogWriter(path, row_group_size=10) as writer:
+        writer.write(batch)
+        writer.write(batch)
+
+    df = scan_events(path).collect()
+    assert writer.rows_written == 50
+    assert df["timestamp"].to_list() == batch.timestamp.tolist() * 2
+
+    cancels = scan_events(path).filter(pl.col("event_type") == CANCEL).collect()
+    assert cancels.height == 2 * sum(e.event_type == EventType.CANCEL for e in _events(25))
+
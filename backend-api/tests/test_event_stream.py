@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from lob_microstructure_analysis.core.event_buffer import EventRingBuffer
+from lob_microstructure_analysis.core.events import ADD, BID, EventType
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.tick_orderbook import TickOrderBook
+
+
+def _replay(levels, events):
+    """Apply emitted events to a dict snapshot."""
+    for e in events:
+        side = levels[e.side]
+        assert side.get(e.price, 0.0) == e.prev_qty
+        if e.event_type == EventType.CANCEL:
+            del side[e.price]
+        else:
+            side[e.price] = e.new_qty
+    return levels
+
+
+@pytest.mark.parametrize("book_cls", [OrderBook, TickOrderBook])
+def test_streamed_events_reconstruct_each_bucket(book_cls):
+    rng = random.Random(9)
+    ob = book_cls(max_depth=10)
+    ob.event_buffer = EventRingBuffer()
+
+    for bucket in range(100):
+        before = ob.snapshot()
+        rows = []
+        for _ in range(40):
+            side = rng.choice(("bid", "ask"))
+            price = float(rng.randint(90, 110))
+            qty = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 5))
+            rows.append((side, price, qty, bucket))
+        ob.apply_batch(*zip(*rows))
+
+        events = ob.event_buffer.drain().to_events()
+        assert all(e.timestamp == bucket for e in events)
+        assert _replay(before, events) == ob.snapshot()
+
+
+def test_ring_buffer_is_bounded():
+    buf = EventRingBuffer(capacity=3)
+    for i in range(5):
+        buf.append(i, BID, 100.0, 0.0, 1.0, ADD)
+
+    assert buf.dropped == 2
+    assert buf.drain().timestamp.tolist() == [2, 3, 4]
+    assert len(buf) == 0
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from lob_microstructure_analysis.core.feature_registry import FeatureRegistry
+from lob_microstructure_analysis.core.features import FeatureComputer
+from lob_microstructure_analysis.core.orderbook import OrderBook
+
+
+def test_resolve_returns_dependency_closure_in_registration_order():
+    reg = FeatureRegistry()
+    reg.register("a", lambda book, v: 1.0)
+    reg.register("b", lambda book, v: v["a"] + 1, ("a",))
+    reg.register("c", lambda book, v: 0.0)
+    reg.register("_hidden", lambda book, v: None, ("b",), public=False)
+    reg.register("d", lambda book, v: v["b"] * 2, ("_hidden", "b"))
+
+    assert reg.names == ["a", "b", "c", "d"]
+    assert [f.name for f in reg.resolve(["d"])] == ["a", "b", "_hidden", "d"]
+
+    with pytest.raises(KeyError):
+        reg.resolve(["missing"])
+    with pytest.raises(ValueError):
+        reg.register("e", lambda book, v: 0.0, ("missing",))
+
+
+def test_subset_matches_full_computation_and_skips_unused_windows():
+    rng = random.Random(3)
+    book = OrderBook()
+    full = FeatureComputer(depth=5)
+    lean = FeatureComputer(depth=5, features=["orderbook_imbalance", "rolling_volatility_30"])
+
+    for _ in range(200):
+        side = rng.choice(("bid", "ask"))
+        offset = rng.randint(0, 5) * 0.5
+        price = 100.0 - offset if side == "bid" else 101.0 + offset
+        book.update_level(side, price, rng.choice((0.0, 1.0, 2.5)))
+        expected = full.compute(book)
+        got = lean.compute(book)
+        if not expected:
+            assert got == {}
+            continue
+        assert list(got) == ["orderbook_imbalance", "rolling_volatility_30"]
+        assert got == {k: expected[k] for k in got}
+
+    # Mid history feeds the volatility; imbalance history is never read
+    assert lean.mid_prices.count == full.mid_prices.count > 0
+    assert lean.imbalances.count == 0
+
+    with pytest.raises(KeyError):
+        FeatureComputer(features=["not_a_feature"])
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+from lob_microstructure_analysis.core.features import FeatureComputer
+from lob_microstructure_analysis.core.orderbook import OrderBook
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _book(step):
+    book = OrderBook()
+    for i in range(5):
+        book.update_level("bid", 100.0 - i - step * 0.5, 1.0 + i)
+        book.update_level("ask", 101.0 + i - step * 0.5, 2.0)
+    return book
+
+
+def test_compute_into_writes_schema_columns_in_place():
+    names = ["rolling_volatility_5", "orderbook_imbalance", "ofi_best"]
+    vector = FeatureVector(names)
+    buffer = vector.array
+    by_dict = FeatureComputer(depth=3)
+    in_place = FeatureComputer(depth=3, features=names[:2])
+
+    for step in range(8):
+        book = _book(step)
+        expected = by_dict.compute(book)
+        assert in_place.compute_into(book, vector)
+        assert vector.array is buffer and buffer.shape == (1, 3)
+        assert vector["rolling_volatility_5"] == expected["rolling_volatility_5"]
+        assert vector["orderbook_imbalance"] == expected["orderbook_imbalance"]
+
+    vector.update({"ofi_best": 2.5, "unknown": 1.0})
+    assert vector.as_dict()["ofi_best"] == 2.5
+    assert not in_place.compute_into(OrderBook(), vector)
+
+    with pytest.raises(ValueError):
+        FeatureVector(["a", "a"])
+
+
+def test_predict_vector_matches_predict():
+    pytest.importorskip("lightgbm")
+    from lob_microstructure_analysis.ml.predictor import load_latest_model
+
+    predictor = load_latest_model(str(BACKEND_ROOT / "models"))
+    vector = predictor.new_vector()
+    computer = FeatureComputer(features=predictor.feature_names)
+
+    for step in range(5):
+        assert computer.compute_into(_book(step), vector)
+        fast = predictor.predict_vector(vector)
+        slow = predictor.predict(vector.as_dict())
+        assert fast["prediction"] == slow["prediction"]
+        np.testing.assert_allclose(fast["raw_probabilities"], slow["raw_probabilities"])
+
+    with pytest.raises(ValueError):
+        predictor.predict_vector(FeatureVector(["best_bid"]))
+
+
+@pytest.mark.parametrize("fast_path", [True, False])
+def test_predict_vector_matches_booster(monkeypatch, fast_path):
+    pytest.importorskip("lightgbm")
+    from lob_microstructure_analysis.ml import predictor as predictor_module
+
+    if not fast_path:
+        def unavailable(*args):
+            raise AttributeError("module 'lightgbm.basic' has no attribute '_LIB'")
+        monkeypatch.setattr(predictor_module, "_SingleRowPredictor", unavailable)
+
+    predictor = predictor_module.load_latest_model(str(BACKEND_ROOT / "models"))
+    assert (predictor._predict_row is not None) == fast_path
+    vector = predictor.new_vector()
+    computer = FeatureComputer(features=predictor.feature_names)
+
+    for step in range(5):
+        assert computer.compute_into(_book(step), vector)
+        expected = predictor.model.predict(vector.array.copy())[0]
+        np.testing.assert_allclose(
+            predictor.predict_vector(vector)["raw_probabilities"], expected, rtol=1e-12
+        )
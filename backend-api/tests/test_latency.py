@@ -0,0 +1,67 @@
+import asyncio
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+from lob_microstructure_analysis.utils.latency import LatencyHistogram, stamp
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_histogram_percentiles_within_precision():
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(mean=7.0, sigma=1.5, size=20_000).astype(np.int64)
+
+    hist = LatencyHistogram(max_us=10_000_000)
+    for v in values.tolist():
+        hist.record(v)
+    hist.record(-5)  # clock skew counts as 0
+
+    assert hist.count == len(values) + 1 and hist.min == 0
+    assert hist.max == values.max()
+    ordered = np.sort(np.r_[values, 0])
+    for q in (1, 50, 90, 99, 99.9, 100):
+        exact = ordered[max(1, math.ceil(q / 100 * hist.count)) - 1]
+        got = hist.percentile(q)
+        # Highest value of the bucket holding the exact order statistic
+        assert exact <= got <= exact * (1 + 2 ** -7) + 1
+
+
+def test_processor_records_stage_latencies(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    processor = OrderBookProcessor(OrderBook(), mode="live", snapshot_mode="message")
+
+    async def predict(result):
+        stamp(result.trace, "prediction")
+
+    processor.bus.subscribe(predict)
+
+    async def run():
+        queue = asyncio.Queue()
+        for m in range(5):
+            now = time.time_ns()
+            batch = UpdateBatch.from_updates([
+                L2Update(1_700_000_000_000 + m, "bid", 99.0, 1.0, 0, m),
+                L2Update(1_700_000_000_000 + m, "ask", 101.0, 1.0 + m, 0, m),
+            ])
+            batch.trace = {"exchange": now - 2_000_000, "receive": now, "parse": now}
+            queue.put_nowait(batch)
+        queue.put_nowait(None)
+        await processor.run(queue)
+
+    asyncio.run(run())
+
+    summary = processor.latency.summary()
+    assert list(summary) == [
+        "exchange_to_receive", "receive_to_parse", "parse_to_dequeue",
+        "dequeue_to_applied", "applied_to_features", "features_to_prediction",
+        "exchange_to_features", "exchange_to_prediction",
+    ]
+    assert all(s["count"] == 5 for s in summary.values())
+    assert summary["exchange_to_receive"]["p50_ms"] == 2.0
+    assert summary["exchange_to_prediction"]["max_ms"] >= 2.0
@@ -0,0 +1,73 @@
+import asyncio
+import random
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader
+from lob_microstructure_analysis.ml.offline_features import OfflineFeatureBuilder
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _write_snapshot_csv(path, n_snapshots=400, seed=11):
+    """Replay-style file: one full book per snapshot timestamp."""
+    rng = random.Random(seed)
+    mid = 5_000_000
+    rows = []
+    for i in range(n_snapshots):
+        ts = 1_700_000_000_000 + i * (1 if i % 7 else 2) * 1000
+        mid += rng.choice((-400, -1, 0, 1, 400))
+        for side in ("bid", "ask"):
+            if i % 37 == 5 and side == "ask":
+                continue  # one-sided snapshot: not emitted online
+            ticks = rng.sample(range(1, 80), rng.randint(3, 45))
+            for level, t in enumerate(sorted(ticks)):
+                price = (mid - t if side == "bid" else mid + t) / 100
+                qty = 0.0 if rng.random() < 0.05 else round(rng.uniform(0.001, 5.0), 3)
+                rows.append((ts, side, price, qty, level, i))
+            if rng.random() < 0.2:
+                # Rewritten level: last write in the bucket wins
+                t = ticks[0]
+                price = (mid - t if side == "bid" else mid + t) / 100
+                rows.append((ts, side, price, round(rng.uniform(0.001, 5.0), 3), 0, i))
+    pl.DataFrame(
+        rows, schema=["timestamp", "side", "price", "quantity", "level", "update_id"]
+    ).write_csv(path)
+
+
+def _online(path):
+    async def run():
+        processor = OrderBookProcessor(OrderBook(max_depth=50), mode="replay")
+        queue = asyncio.Queue()
+        async for batch in LOBDataLoader(str(path), replay_speed=0.0).stream_batches():
+            queue.put_nowait(batch)
+        queue.put_nowait(None)
+        await processor.run(queue)
+        return processor.feature_store.to_dataframe()
+
+    return asyncio.run(run())
+
+
+def test_offline_features_match_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    path = tmp_path / "snapshots.csv"
+    _write_snapshot_csv(path)
+
+    online = _online(path)
+    offline = OfflineFeatureBuilder().build_csv(path)
+
+    assert offline.columns == online.columns
+    assert offline.height == online.height
+    assert offline["timestamp"].to_list() == online["timestamp"].to_list()
+    assert offline["label"].to_list() == online["label"].to_list()
+    assert set(online["label"].drop_nulls().to_list()) == {-1, 0, 1}
+    for name in online.columns[2:]:
+        np.testing.assert_allclose(
+            offline[name].to_numpy(), online[name].to_numpy(),
+            rtol=1e-9, atol=1e-9, err_msg=name,
+        )
@@ -0,0 +1,55 @@
+import pytest
+
+from lob_microstructure_analysis.core.book_view import BookView
+from lob_microstructure_analysis.core.events import BookEvent, EventBatch, EventType
+from lob_microstructure_analysis.core.order_flow import OrderFlowFeatures
+
+
+def _view(bids, asks):
+    return BookView.from_levels(
+        0,
+        ([p for p, _ in bids], [q for _, q in bids], len(bids)),
+        ([p for p, _ in asks], [q for _, q in asks], len(asks)),
+    )
+
+
+def _batch(*events):
+    return EventBatch.from_events(BookEvent(0, *e) for e in events)
+
+
+def test_ofi_uses_previous_bucket_boundaries():
+    flow = OrderFlowFeatures(depth=2, windows=(2,))
+    book = _view([(100.0, 5.0), (99.0, 5.0), (98.0, 5.0)], [(101.0, 5.0), (102.0, 5.0)])
+    first = flow.update(_batch(), book)
+    assert first["ofi_best"] == 0.0
+
+    f = flow.update(
+        _batch(
+            ("bid", 100.0, 5.0, 7.0, EventType.MODIFY),   # +2 at best
+            ("bid", 99.0, 5.0, 0.0, EventType.CANCEL),    # -5 inside top 2
+            ("bid", 98.0, 5.0, 9.0, EventType.MODIFY),    # outside top 2
+            ("ask", 100.5, 0.0, 3.0, EventType.ADD),      # -3, improves ask
+            ("ask", 102.0, 5.0, 4.0, EventType.MODIFY),   # +1 inside top 2
+        ),
+        book,
+    )
+
+    assert f["ofi_best"] == pytest.approx(2.0 - 3.0)
+    assert f["ofi_top_n"] == pytest.approx(2.0 - 5.0 - 3.0 + 1.0)
+    assert f["bid_modify_count"] == 2.0
+    assert f["bid_modify_volume"] == pytest.approx(6.0)
+    assert f["bid_cancel_volume"] == 5.0
+    assert f["ask_add_count"] == 1.0
+
+
+def test_cancel_add_ratio_rolls_over_window():
+    flow = OrderFlowFeatures(depth=1, windows=(2,))
+    view = _view([(100.0, 1.0)], [(101.0, 1.0)])
+    add = ("bid", 99.0, 0.0, 1.0, EventType.ADD)
+    cancel = ("bid", 99.0, 1.0, 0.0, EventType.CANCEL)
+
+    assert flow.update(_batch(add, add), view)["cancel_add_ratio_bid_2"] == 0.0
+    assert flow.update(_batch(cancel), view)["cancel_add_ratio_bid_2"] == 0.5
+    # First bucket leaves the window
+    assert flow.update(_batch(cancel, add), view)["cancel_add_ratio_bid_2"] == 2.0
+    assert flow.update(_batch(), view)["cancel_add_ratio_ask_2"] == 0.0
@@ -43,3 +43,52 @@ def test_crossed_book_cleanup():
     ob.update_level("ask", 100, 1)
 
     assert ob.best_ask() is None
+
+
+def test_apply_batch_matches_sequential_updates():
+    import random
+
+    rng = random.Random(3)
+    rows = []
+    for _ in range(5_000):
+        side = rng.choice(("bid", "ask"))
+        price = float(rng.randint(95, 105))
+        qty = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 5))
+        rows.append((side, price, qty))
+
+    seq = OrderBook(max_depth=4)
+    for side, price, qty in rows:
+        seq.update_level(side, price, qty)
+
+    batched = OrderBook(max_depth=4)
+    for start in range(0, len(rows), 100):
+        chunk = rows[start:start + 100]
+        batched.apply_batch(*zip(*chunk))
+
+    assert batched.depth(10) == seq.depth(10)
+
+
+def test_top_depth_aggregates_track_changes():
+    import random
+
+    rng = random.Random(11)
+    ob = OrderBook(max_depth=15, top_n=5)
+
+    for step in range(3_000):
+        side = rng.choice(("bid", "ask"))
+        price = float(rng.randint(90, 110))
+        qty = 0.0 if rng.random() < 0.3 else float(rng.randint(1, 9))
+        if step % 2:
+            ob.update_level(side, price, qty)
+        else:
+            ob.apply_batch([side], [price], [qty])
+
+        if step % 7 == 0:
+            top_bids = list(ob.bids.items())[:3]
+            top_asks = list(ob.asks.items())[:3]
+            assert ob.top_depth.volume("bid", 3) == sum(q for _, q in top_bids)
+            assert ob.top_depth.volume("ask", 3) == sum(q for _, q in top_asks)
+
+    bids = list(ob.bids.items())[:5]
+    vwap = sum(p * q for p, q in bids) / sum(q for _, q in bids)
+    assert abs(ob.top_depth.weighted_price("bid", 5) - vwap) < 1e-9
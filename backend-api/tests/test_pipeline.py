@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.pipeline import BucketContext, Stage, StagePipeline
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _batches():
+    for m in range(40):
+        ts = 1_700_000_000_000 + m * 250
+        updates = [
+            L2Update(ts, "bid", 99.0 - 0.5 * (m % 3), 1.0 + m % 4, 0, m),
+            L2Update(ts, "ask", 101.0 + 0.5 * (m % 2), 2.0, 0, m),
+        ]
+        if m % 7 == 3:
+            updates += [L2Update(ts, "ask", p, 0.0, 0, m) for p in (101.0, 101.5)]  # one-sided
+        yield UpdateBatch.from_updates(updates)
+
+
+def _run(**options):
+    processor = OrderBookProcessor(
+        OrderBook(), mode="live", snapshot_mode="message", label_horizon_ms=1000, **options
+    )
+    ReplayEngine(processor).run(_batches())
+    return processor
+
+
+def test_disabled_stages_keep_features_and_count_calls(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    features = ["mid_price", "spread", "orderbook_imbalance", "rolling_volatility_5"]
+    full = _run(features=features)
+    lean = _run(features=features, stages=["book", "features", "labels", "store"], stage_timing=True)
+
+    assert lean.order_flow is None and lean.pipeline.names == ["book", "features", "labels", "store"]
+    assert_frame_equal(lean.feature_store.to_dataframe(), full.feature_store.to_dataframe())
+
+    summary = lean.pipeline.summary()
+    buckets = summary["book"]["calls"]
+    assert buckets == summary["features"]["calls"] > summary["store"]["calls"] == lean.snapshots_emitted
+    assert summary["features"]["total_ms"] > 0
+    assert full.pipeline.stats["events"].calls == buckets
+
+
+def test_stage_order_is_validated(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)
+    with pytest.raises(ValueError, match="labels"):
+        OrderBookProcessor(OrderBook(), features=["spread"], stages=["book", "labels", "features"])
+    with pytest.raises(ValueError, match="order_flow"):
+        OrderBookProcessor(OrderBook(), stages=["book", "features"])  # flow features requested
+    with pytest.raises(ValueError, match="Unknown"):
+        OrderBookProcessor(OrderBook(), stages=["book", "features", "nope"])
+
+    seen = []
+    pipeline = StagePipeline(
+        [Stage("a", lambda ctx: setattr(ctx, "view", 1), (), ("view",)),
+         Stage("b", lambda ctx: False, ("view",)),
+         Stage("c", lambda ctx: None, ("view",))],
+        timing=True,
+    )
+    pipeline.hooks.append(lambda name, ns: seen.append(name))
+    assert pipeline.run(BucketContext(rows=None, timestamp=0)) is False
+    assert seen == ["a", "b"] and pipeline.stats["c"].calls == 0
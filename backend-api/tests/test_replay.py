@@ -0,0 +1,79 @@
+import asyncio
+import random
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader, iter_batches, read_updates
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _snapshot_file(path, n_snapshots=40, seed=3):
+    """Replay-format file: every timestamp is a full top-of-book snapshot."""
+    rng = random.Random(seed)
+    rows = []
+    mid = 100.0
+    for t in range(n_snapshots):
+        mid += rng.choice((-0.5, 0.0, 0.5))
+        for side, sign in (("bid", -1), ("ask", 1)):
+            for level in range(rng.randint(3, 12)):
+                price = mid + sign * (0.25 + 0.5 * level)
+                rows.append((1_700_000_000_000 + t // 2 * 1000, side, price, rng.randint(1, 9) * 0.5, level, t))
+    # One crossed snapshot takes the reset + apply_batch path
+    rows.append((1_700_000_000_000 + n_snapshots * 1000, "bid", 200.0, 1.0, 0, n_snapshots))
+    rows.append((1_700_000_000_000 + n_snapshots * 1000, "ask", 150.0, 1.0, 0, n_snapshots))
+    pl.DataFrame(
+        rows, schema=["timestamp", "side", "price", "quantity", "level", "update_id"], orient="row"
+    ).write_csv(path)
+
+
+def test_replay_engine_matches_async_replay(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    path = tmp_path / "l2.csv"
+    _snapshot_file(path)
+
+    async def run_async():
+        processor = OrderBookProcessor(OrderBook(max_depth=8), mode="replay")
+        queue = asyncio.Queue()
+        async for batch in LOBDataLoader(str(path), replay_speed=0.0).stream_batches():
+            queue.put_nowait(batch)
+        queue.put_nowait(None)
+        await processor.run(queue)
+        return processor
+
+    expected = asyncio.run(run_async())
+
+    seen = []
+    processor = OrderBookProcessor(OrderBook(max_depth=8), mode="replay")
+    engine = ReplayEngine(processor, callbacks=[lambda result: seen.append(result.sequence)])
+    engine.run(iter_batches(read_updates(path)))
+
+    assert processor.updates_processed == expected.updates_processed
+    assert seen == list(range(1, expected.snapshots_emitted + 1))
+    assert engine.updates_per_second > 0
+    assert_frame_equal(
+        processor.feature_store.to_dataframe(), expected.feature_store.to_dataframe()
+    )
+
+
+def test_load_matches_reset_and_apply_batch():
+    sides = ["bid", "ask", "bid", "bid", "ask"]
+    prices = [99.0, 101.0, 98.0, 99.0, 101.5]
+    quantities = [1.0, 2.0, 3.0, 0.0, 4.0]
+
+    loaded, applied = OrderBook(), OrderBook()
+    loaded.update_level("bid", 50.0, 1.0)
+    assert loaded.load(sides, prices, quantities)
+    applied.apply_batch(sides, prices, quantities)
+    assert loaded.snapshot() == applied.snapshot()
+    assert loaded.view().top("bid", 10) == applied.view().top("bid", 10)
+
+    # Would trigger the depth trim or crossed-book guard: not loaded
+    assert not OrderBook(max_depth=1).load(sides, prices, quantities)
+    assert not loaded.load(["bid", "ask"], [101.0, 100.0], [1.0, 1.0])
+    assert loaded.snapshot() == applied.snapshot()
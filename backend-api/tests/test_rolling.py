@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from lob_microstructure_analysis.core.rolling import MultiWindowStats
+
+
+def test_multi_window_stats_match_numpy():
+    rng = np.random.default_rng(2)
+    xs = 50_000.0 + np.cumsum(rng.normal(0.0, 0.01, 3_000))
+    stats = MultiWindowStats([1, 5, 30, 300])
+
+    for i, x in enumerate(xs):
+        stats.push(x)
+        for w in stats.windows:
+            ref = xs[max(0, i - w + 1):i + 1]
+            assert stats.mean(w) == pytest.approx(ref.mean(), rel=1e-12)
+            if len(ref) > 1:
+                assert stats.var(w) == pytest.approx(ref.var(ddof=1), rel=1e-6, abs=1e-12)
+            else:
+                assert stats.var(w) == 0.0
+        assert stats.lag(min(i, 4)) == xs[i - min(i, 4)]
+        if i >= 1000:  # extrema built from the ring mid-stream, then slid
+            assert stats.min(30) == xs[max(0, i - 29):i + 1].min()
+            assert stats.max(300) == xs[max(0, i - 299):i + 1].max()
+
+    np.testing.assert_array_equal(stats.values(), xs[-300:])
+    with pytest.raises(ValueError):
+        stats.mean(301)
+    with pytest.raises(ValueError):
+        MultiWindowStats([0])
+
+
+def test_small_windows_and_empty_stats():
+    stats = MultiWindowStats([1, 3])
+    assert stats.var(3) == 0.0 and stats.min(3) is None and stats.lag(0) is None
+
+    for x in (1.0, 5.0, 2.0, 4.0):
+        stats.push(x)
+    assert stats.mean(3) == pytest.approx(11 / 3)
+    assert (stats.min(3), stats.max(3)) == (2.0, 5.0)
+    assert (stats.min(1), stats.max(1)) == (4.0, 4.0)
+    assert stats.lag(0) == 4.0 and stats.lag(3) is None
+
+    with pytest.raises(ValueError):
+        stats.max(4)
+
+
+def test_ewma_matches_pandas():
+    xs = np.random.default_rng(1).normal(size=200)
+    stats = MultiWindowStats([5], spans=(20,))
+    assert stats.ewma(20) is None
+
+    out = []
+    for x in xs:
+        stats.push(x)
+        out.append(stats.ewma(20))
+
+    expected = pd.Series(xs).ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(out, expected, rtol=1e-12)
+    with pytest.raises(ValueError):
+        stats.ewma(10)
@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+import random
+from pathlib import Path
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.core.replay import ReplayEngine
+from lob_microstructure_analysis.ingestion.loader import iter_batches, read_updates
+import lob_microstructure_analysis.ingestion.shm_ring as shm_ring
+from lob_microstructure_analysis.ingestion.shm_ring import SharedUpdateRing, ingest_file, pump
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _snapshot_file(path, n_snapshots, seed=5):
+    rng = random.Random(seed)
+    rows = []
+    mid = 100.0
+    for t in range(n_snapshots):
+        mid += rng.choice((-0.5, 0.0, 0.5))
+        for side, sign in (("bid", -1), ("ask", 1)):
+            for level in range(rng.randint(3, 12)):
+                rows.append((1_700_000_000_000 + t * 1000, side, mid + sign * (0.25 + 0.5 * level),
+                             rng.randint(1, 9) * 0.5, level, t))
+    pl.DataFrame(
+        rows, schema=["timestamp", "side", "price", "quantity", "level", "update_id"], orient="row"
+    ).write_csv(path)
+
+
+def _message(m, rows=3):
+    return UpdateBatch.from_updates(
+        L2Update(1_700_000_000_000 + m, ("bid", "ask")[i % 2], 100.0 + i + m / 8, float(m), i, m)
+        for i in range(rows)
+    )
+
+
+def test_ring_wraps_and_keeps_messages_whole():
+    ring = SharedUpdateRing(capacity=8)
+    try:
+        sent = []
+        for m in range(12):
+            message = _message(m)
+            if m == 4:
+                message.trace = {"exchange": 1, "receive": 2, "parse": 3}
+            if not ring.put(message):
+                assert len(ring) + 3 > 8  # full: nothing written
+                got = ring.get(max_rows=4)
+                assert got is not None and len(got) == 3  # one whole message
+                sent.append(got)
+                assert ring.put(message)
+        while (got := ring.get()) is not None:
+            sent.append(got)
+        assert ring.full > 0
+
+        rows = [u for batch in sent for u in batch]
+        assert rows == [u for m in range(12) for u in _message(m)]
+        assert [b.trace for b in sent if b.trace] == [{"exchange": 1, "receive": 2, "parse": 3}]
+
+        with pytest.raises(ValueError):
+            ring.put(_message(0, rows=9))
+    finally:
+        ring.release()
+        ring.unlink()
+
+
+def test_ring_refuses_without_ordered_stores(monkeypatch):
+    monkeypatch.setattr(shm_ring, "ORDERED_STORES", False)
+    with pytest.raises(RuntimeError, match="store ordering"):
+        SharedUpdateRing(capacity=8)
+
+
+def test_snapshot_messages_are_read_alone():
+    ring = SharedUpdateRing(capacity=64)
+    try:
+        snapshot = _message(1, rows=4)
+        snapshot.snapshot = True
+        for message in (_message(0), snapshot, _message(2), _message(3)):
+            assert ring.put(message)
+
+        got = [ring.get(), ring.get(), ring.get(), ring.get()]
+        assert [(len(b), b.snapshot) for b in got[:3]] == [(3, False), (4, True), (6, False)]
+        assert got[3] is None
+    finally:
+        ring.release()
+        ring.unlink()
+
+
+def test_processor_fed_from_ingestion_process(tmp_path, monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    path = tmp_path / "l2.csv"
+    _snapshot_file(path, n_snapshots=200)
+
+    expected = OrderBookProcessor(OrderBook(max_depth=50), mode="replay", label_horizon_ms=1000)
+    ReplayEngine(expected).run(iter_batches(read_updates(path)))
+
+    ring = SharedUpdateRing(capacity=64)  # smaller than the file: wraps
+    producer = multiprocessing.get_context("spawn").Process(target=ingest_file, args=(ring.name, path))
+    processor = OrderBookProcessor(OrderBook(max_depth=50), mode="replay", label_horizon_ms=1000)
+
+    async def run():
+        queue = asyncio.Queue(maxsize=16)
+        consumer = asyncio.create_task(processor.run(queue))
+        await pump(ring, queue, producer_alive=producer.is_alive)
+        await queue.put(None)
+        await consumer
+
+    try:
+        producer.start()
+        asyncio.run(run())
+        producer.join()
+    finally:
+        ring.release()
+        ring.unlink()
+
+    assert producer.exitcode == 0
+    assert processor.updates_processed == expected.updates_processed
+    assert_frame_equal(processor.feature_store.to_dataframe(), expected.feature_store.to_dataframe())
@@ -0,0 +1,64 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from lob_microstructure_analysis.core.feature_vector import FeatureVector
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.types import L2Update
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _updates(n_buckets=6):
+    out = []
+    for b in range(n_buckets):
+        ts = 1_700_000_000_000 + b * 1000
+        for i in range(3):
+            out.append(L2Update(ts + i, "bid", 100.0 - i - b * 0.1, 1.0 + i, i, 0))
+            out.append(L2Update(ts + i, "ask", 101.0 + i - b * 0.1, 2.0, i, 0))
+    return out
+
+
+def test_each_bucket_is_computed_once_and_shared(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+
+    async def run():
+        vector = FeatureVector(["mid_price", "rolling_volatility"])
+        processor = OrderBookProcessor(
+            OrderBook(), features=["spread"], feature_vector=vector,
+        )
+        seen = []
+
+        async def consumer(result):
+            # The shared vector holds this bucket's values during delivery
+            seen.append((result, result.vector["mid_price"]))
+
+        async def failing(result):
+            raise RuntimeError("boom")
+
+        processor.bus.subscribe(failing)
+        processor.bus.subscribe(consumer)
+
+        queue = asyncio.Queue()
+        for update in _updates():
+            queue.put_nowait(update)
+        queue.put_nowait(None)
+        await processor.run(queue)
+        await processor.finalize()  # nothing left to flush: no duplicate bucket
+        return processor, seen
+
+    processor, seen = asyncio.run(run())
+
+    assert [r.sequence for r, _ in seen] == list(range(1, 7))
+    assert processor.bus.published == 6
+    assert processor.feature_computer.mid_prices.count == 6  # one push per bucket
+    assert len(processor.feature_store.to_dataframe()) == 6
+
+    result, vector_mid = seen[-1]
+    assert set(result.features) >= {"spread", "mid_price", "rolling_volatility"}
+    assert vector_mid == result.features["mid_price"]
+    assert result.bids == tuple(result.view.top("bid", 10)) and len(result.bids) == 10
+    with pytest.raises(TypeError):
+        result.features["spread"] = 0.0
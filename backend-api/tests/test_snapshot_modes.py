@@ -0,0 +1,55 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.types import L2Update
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _messages(n=20, start=1_700_000_000_000, every_ms=100):
+    """Depth messages 100 ms apart, three levels each, sharing an update_id."""
+    out = []
+    for m in range(n):
+        ts = start + m * every_ms
+        for i in range(3):
+            out.append(L2Update(ts, "bid", 100.0 - i - (m % 3), 1.0 + m, i, 1000 + m))
+            out.append(L2Update(ts, "ask", 101.0 + i + (m % 2), 2.0, i, 1000 + m))
+    return out
+
+
+def _run(**options):
+    async def run():
+        processor = OrderBookProcessor(OrderBook(), mode="live", **options)
+        timestamps = []
+
+        async def collect(result):
+            timestamps.append(result.timestamp)
+
+        processor.bus.subscribe(collect)
+        queue = asyncio.Queue()
+        for update in _messages():
+            queue.put_nowait(update)
+        queue.put_nowait(None)
+        await processor.run(queue)
+        return timestamps
+
+    return asyncio.run(run())
+
+
+def test_sub_second_and_per_message_snapshots(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    start = 1_700_000_000_000
+
+    assert _run() == [start, start + 1000]
+    assert _run(snapshot_interval_ms=100) == [start + 100 * m for m in range(20)]
+    assert _run(snapshot_interval_ms=500) == [start + 500 * m for m in range(4)]
+
+    per_message = _run(snapshot_mode="message", event_mode="stream")
+    assert per_message == [start + 100 * m for m in range(20)]
+
+    with pytest.raises(ValueError):
+        OrderBookProcessor(OrderBook(), snapshot_mode="tick")
@@ -0,0 +1,64 @@
+import random
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.tick_orderbook import TickOrderBook
+
+
+def test_basic_insert():
+    ob = TickOrderBook()
+    ob.update_level("bid", 100.0, 5.0)
+    ob.update_level("ask", 101.0, 3.0)
+
+    assert ob.best_bid() == 100.0
+    assert ob.best_ask() == 101.0
+    assert ob.mid_price() == 100.5
+
+
+def test_cancel_level_moves_best_pointer():
+    ob = TickOrderBook()
+    ob.update_level("bid", 100.0, 5.0)
+    ob.update_level("bid", 99.5, 1.0)
+    ob.update_level("bid", 100.0, 0.0)
+
+    assert ob.best_bid() == 99.5
+
+
+def test_depth_limit_and_crossed_book():
+    ob = TickOrderBook(max_depth=2)
+    ob.update_level("bid", 101, 1)
+    ob.update_level("bid", 100, 1)
+    ob.update_level("bid", 99, 1)
+
+    assert list(ob.bids) == [101.0, 100.0]
+
+    ob.update_level("ask", 100.5, 1)
+    assert ob.best_ask() is None
+
+
+def test_reanchors_far_from_initial_window():
+    ob = TickOrderBook(capacity=64)
+    ob.update_level("ask", 100.00, 1.0)
+    ob.update_level("ask", 250.00, 2.0)
+    ob.update_level("ask", 90.00, 3.0)
+
+    assert ob.depth(3)["asks"] == [(90.0, 3.0), (100.0, 1.0), (250.0, 2.0)]
+
+
+def test_matches_sorted_dict_book():
+    rng = random.Random(7)
+    ref = OrderBook(max_depth=20)
+    ob = TickOrderBook(max_depth=20, capacity=128)
+
+    mid = 50_000.0
+    for _ in range(20_000):
+        mid += rng.choice((-0.01, 0.0, 0.01))
+        side = rng.choice(("bid", "ask"))
+        offset = rng.randint(0, 300) * 0.01
+        price = round(mid - offset if side == "bid" else mid + offset, 2)
+        qty = 0.0 if rng.random() < 0.3 else round(rng.uniform(0.001, 3.0), 3)
+
+        ref.update_level(side, price, qty)
+        ob.update_level(side, price, qty)
+
+    assert ob.snapshot() == ref.snapshot()
+    assert ob.depth(10) == ref.depth(10)
@@ -0,0 +1,95 @@
+import asyncio
+import random
+from pathlib import Path
+
+import polars as pl
+from polars.testing import assert_frame_equal
+
+from lob_microstructure_analysis.core.orderbook import OrderBook
+from lob_microstructure_analysis.core.processor import OrderBookProcessor
+from lob_microstructure_analysis.ingestion.loader import LOBDataLoader
+from lob_microstructure_analysis.ingestion.types import L2Update, UpdateBatch
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _updates(n_messages=120, seed=5):
+    rng = random.Random(seed)
+    out = []
+    for m in range(n_messages):
+        ts = 1_700_000_000_000 + m * 130  # messages straddle 1 s buckets
+        for level in range(rng.randint(1, 8)):
+            side = rng.choice(("bid", "ask"))
+            offset = rng.randint(0, 15) * 0.5
+            price = 100.0 - offset if side == "bid" else 100.5 + offset
+            out.append(L2Update(ts, side, price, rng.choice((0.0, 1.0, 2.0)), level, m))
+    return out
+
+
+def _run(items, **options):
+    async def run():
+        processor = OrderBookProcessor(OrderBook(), mode="live", **options)
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+        queue.put_nowait(None)
+        await processor.run(queue)
+        return processor
+
+    return asyncio.run(run())
+
+
+def test_batched_queue_matches_per_item_queue(monkeypatch):
+    monkeypatch.chdir(BACKEND_ROOT)  # processor loads its model by relative path
+    updates = _updates()
+
+    # Chunks of ~3 messages: batches cross bucket boundaries
+    chunks = [UpdateBatch()]
+    for u in updates:
+        if u.update_id % 3 == 0 and len(chunks[-1]) and chunks[-1].update_ids[-1] != u.update_id:
+            chunks.append(UpdateBatch())
+        chunks[-1].append(u)
+
+    for options in ({}, {"snapshot_interval_ms": 100}, {"snapshot_mode": "message"}):
+        expected = _run(updates, **options)
+        got = _run(chunks, **options)
+        assert got.updates_processed == expected.updates_processed == len(updates)
+        assert got.snapshots_emitted == expected.snapshots_emitted > 0
+        assert_frame_equal(
+            got.feature_store.to_dataframe(), expected.feature_store.to_dataframe()
+        )
+
+
+def test_loader_batches_match_rows(tmp_path):
+    path = tmp_path / "l2.csv"
+    pl.DataFrame({
+        "timestamp": [3, 1, 1, 2, 3],
+        "side": ["ask", "bid", "ask", "bid", "bid"],
+        "price": [101.0, 100.0, 101.0, 99.5, 100.0],
+        "quantity": [1.0, 2.0, 3.0, 0.0, 4.0],
+        "level": [0, 0, 0, 1, 0],
+        "update_id": [7, 5, 5, 6, 7],
+    }).write_csv(path)
+
+    async def collect():
+        loader = LOBDataLoader(str(path), replay_speed=0.0)
+        return [b async for b in loader.stream_batches()]
+
+    batches = asyncio.run(collect())
+    assert [len(b) for b in batches] == [2, 1, 2]
+    assert [u for b in batches for u in b] == [  # stable sort, ms as recorded
+        L2Update(1, "bid", 100.0, 2.0, 0, 5),
+        L2Update(1, "ask", 101.0, 3.0, 0, 5),
+        L2Update(2, "bid", 99.5, 0.0, 1, 6),
+        L2Update(3, "ask", 101.0, 1.0, 0, 7),
+        L2Update(3, "bid", 100.0, 4.0, 0, 7),
+    ]
+    assert batches[2][1] == L2Update(3, "bid", 100.0, 4.0, 0, 7)
+
+    # Microsecond files are normalized to ms
+    pl.DataFrame({
+        "timestamp": [1_700_000_000_123_456, 1_700_000_000_999_000],
+        "side": ["bid", "ask"], "price": [100.0, 101.0], "quantity": [1.0, 1.0],
+        "level": [0, 0], "update_id": [1, 2],
+    }).write_csv(path)
+    assert [b.timestamps for b in asyncio.run(collect())] == [[1_700_000_000_123], [1_700_000_000_999]]